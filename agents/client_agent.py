@@ -322,8 +322,7 @@ Abdul Wahid Chohan
             timeline_update="Project remains on track for completion by the agreed deadline",
             deliverables="All requested features have been implemented and tested",
             project_summary="Successfully delivered a high-quality solution that meets all requirements",
-            previous_discussion="We discussed the project requirements and timeline",
-            current_status="Ready to move forward with the project"
+            previous_discussion="We discussed the project requirements and timeline"
         )
         
         return {
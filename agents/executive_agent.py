@@ -5,23 +5,58 @@ Central coordinator that analyzes tasks and manages agent interactions
 
 import asyncio
 import logging
-from typing import Dict, Any, List, Optional
+import time
+from typing import Dict, Any, List, Optional, AsyncIterator
 from datetime import datetime
-import json
 import re
 
 from core.agent_manager import BaseAgent
-from memory.sqlite_memory import MemoryManager
+from core.dispatcher import TaskDispatcher
+from core.intent_classifier import get_configured_intent_classifier
+from core.keyword_matcher import KeywordMatcher
+from core.workflow import WorkflowExecutor, WorkflowStep, critical_path_time
+from memory.sqlite_memory import MemoryManager, compact_task_analysis
 
 logger = logging.getLogger(__name__)
 
+# Keyword signals used alongside the task-type keywords; all are matched in one pass
+SIGNAL_KEYWORDS = {
+    'priority_urgent': ['urgent', 'asap', 'immediately', 'now', 'quick', 'fast'],
+    'priority_important': ['important', 'critical', 'essential', 'must', 'need'],
+    'urgency_urgent': ['urgent', 'asap', 'immediately', 'now', 'emergency'],
+    'urgency_high': ['important', 'critical', 'priority', 'deadline'],
+    'needs_research': ['research', 'analysis'],
+    'needs_content_creation': ['writing', 'content'],
+    'needs_financial_analysis': ['money', 'financial'],
+    'multi_step': ['and then', 'after that', 'next', 'also', 'additionally',
+                   'first', 'second', 'finally', 'step', 'phase'],
+    'step_planning': ['first', 'step 1'],
+    'step_research': ['research', 'find'],
+    'step_rates': ['rate', 'pricing', 'price', 'quote', 'cost'],
+    'step_writing': ['write', 'create', 'draft'],
+    'step_review': ['review', 'check']
+}
+
+# Workflow step per step keyword group: (step id, task type, description, estimated minutes)
+WORKFLOW_STEPS = {
+    'step_planning': ('planning', 'project_planning', 'Initial analysis and planning', 5),
+    'step_research': ('research', 'market_research', 'Research and data collection', 10),
+    'step_rates': ('rates', 'financial_analysis', 'Rate and cost calculation', 5),
+    'step_writing': ('writing', 'proposal_writing', 'Content creation and writing', 15),
+    'step_review': ('review', 'review', 'Review and quality check', 3)
+}
+
 class ExecutiveAgent(BaseAgent):
     """
     Executive Agent - The brain of FreelanceX.AI
     Analyzes user input, determines task types, and coordinates other agents
     """
     
-    def __init__(self, agent_manager, memory_manager: MemoryManager, config):
+    # Seconds a cached agent health snapshot is served before it is refreshed
+    health_refresh_interval = 10.0
+    
+    def __init__(self, agent_manager, memory_manager: MemoryManager, config,
+                 dispatcher: Optional[TaskDispatcher] = None):
         super().__init__(
             agent_id="executive_agent",
             name="ExecutiveAgent",
@@ -31,8 +66,32 @@ class ExecutiveAgent(BaseAgent):
         self.memory_manager = memory_manager
         self.config = config
         self.task_patterns = self._initialize_task_patterns()
+        self.keyword_matcher = KeywordMatcher({
+            **{task_type: pattern['keywords'] for task_type, pattern in self.task_patterns.items()},
+            **SIGNAL_KEYWORDS
+        })
         self.context_window = []
         
+        # Optional trained intent model; keyword patterns remain the fallback
+        self.intent_classifier = get_configured_intent_classifier(config)
+        
+        # Multi-step tasks run as workflows through the task dispatcher
+        self.dispatcher = dispatcher or getattr(agent_manager, 'dispatcher', None)
+        if self.dispatcher is None:
+            self.dispatcher = TaskDispatcher()
+            self.dispatcher.set_agent_manager(agent_manager)
+        if getattr(self.dispatcher, 'intent_classifier', None) is None:
+            self.dispatcher.intent_classifier = self.intent_classifier
+        self.workflow_executor = WorkflowExecutor(self.dispatcher, handlers={'review': self._review_step})
+        
+        # Health snapshot shared by all tasks, refreshed in the background
+        self._health_snapshot: Optional[Dict[str, Any]] = None
+        self._health_checked_at = 0.0
+        self._health_refresh: Optional[asyncio.Task] = None
+        
+        # Analysis log writes that have not finished yet
+        self._pending_writes = set()
+        
     def _initialize_task_patterns(self) -> Dict[str, Dict[str, Any]]:
         """Initialize patterns for task type detection"""
         return {
@@ -97,11 +156,11 @@ class ExecutiveAgent(BaseAgent):
     async def process_task(self, task_data: Dict[str, Any]) -> Dict[str, Any]:
         """Process task - this is the main entry point for task analysis"""
         try:
-            # Analyze the task
-            analysis = await self.analyze_task(task_data)
-            
-            # Add context from memory
-            context = await self._get_relevant_context(task_data)
+            # Analyze the task and gather context from memory concurrently
+            analysis, context = await asyncio.gather(
+                self.analyze_task(task_data),
+                self._get_relevant_context(task_data)
+            )
             analysis['context'] = context
             
             # Determine if this is a multi-step task
@@ -122,6 +181,44 @@ class ExecutiveAgent(BaseAgent):
                 'error': str(e)
             }
     
+    async def stream_task(self, task_data: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Process a task, yielding progress as it happens
+        
+        Yields:
+            An 'analysis' event, then the workflow's events for a multi-step task,
+            or one 'result' event carrying what process_task would return
+        """
+        analysis, context = await asyncio.gather(
+            self.analyze_task(task_data),
+            self._get_relevant_context(task_data)
+        )
+        analysis['context'] = context
+        
+        yield {
+            'event': 'analysis',
+            'task_type': analysis.get('task_type'),
+            'confidence': analysis.get('confidence'),
+            'priority': analysis.get('priority'),
+            'urgency': analysis.get('urgency'),
+            'required_capabilities': analysis.get('required_capabilities', [])
+        }
+        
+        if self._is_multi_step_task(analysis):
+            async for event in self.stream_multi_step_task(analysis):
+                yield event
+            return
+        
+        yield {
+            'event': 'result',
+            'result': {
+                'success': True,
+                'analysis': analysis,
+                'recommendations': await self._generate_recommendations(analysis),
+                'next_steps': await self._suggest_next_steps(analysis)
+            }
+        }
+    
     async def analyze_task(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Analyze user input to determine task type, priority, and requirements
@@ -134,20 +231,23 @@ class ExecutiveAgent(BaseAgent):
                 - context: Additional context
         """
         try:
-            content = input_data.get('content', '').lower()
+            content = input_data.get('content', '')
             user_id = input_data.get('user_id', 'default')
             
+            # Match every keyword group in a single pass over the content
+            hits = self.keyword_matcher.scan(content)
+            
             # Detect task type using pattern matching
-            task_type, confidence = self._detect_task_type(content)
+            task_type, confidence = self._detect_task_type(hits, content)
             
             # Determine priority
-            priority = self._determine_priority(content, task_type)
+            priority = self._determine_priority(hits, task_type)
             
             # Extract required capabilities
-            required_capabilities = self._extract_required_capabilities(content, task_type)
+            required_capabilities = self._extract_required_capabilities(hits, task_type)
             
             # Analyze urgency
-            urgency = self._analyze_urgency(content)
+            urgency = self._analyze_urgency(hits)
             
             # Get user context
             user_context = await self._get_user_context(user_id)
@@ -158,19 +258,22 @@ class ExecutiveAgent(BaseAgent):
                 'priority': priority,
                 'urgency': urgency,
                 'required_capabilities': required_capabilities,
-                'content': input_data.get('content', ''),
+                'keyword_hits': {group: sorted(keywords) for group, keywords in hits.items()},
+                'content': content,
                 'user_id': user_id,
                 'user_context': user_context,
                 'timestamp': datetime.now().isoformat(),
                 'input_type': input_data.get('type', 'text')
             }
             
-            # Store analysis in memory
-            await self.memory_manager.log_interaction(
+            # Store a compact analysis record in memory without waiting for the write
+            context_ids = [item.get('id') for item in user_context.get('recent_interactions', [])]
+            self._log_in_background(
                 user_id=user_id,
                 input_type='task_analysis',
-                content=json.dumps(analysis),
-                timestamp=datetime.now().isoformat()
+                content=content,
+                timestamp=analysis['timestamp'],
+                metadata=compact_task_analysis(analysis, context_ids)
             )
             
             logger.info(f"🔍 Task analysis: {task_type} (confidence: {confidence:.2f}, priority: {priority})")
@@ -189,14 +292,43 @@ class ExecutiveAgent(BaseAgent):
                 'error': str(e)
             }
     
-    def _detect_task_type(self, content: str) -> tuple[str, float]:
-        """Detect task type using keyword patterns"""
+    def _keyword_hits(self, analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """Keyword hits recorded by analyze_task, rescanning the content if they are missing"""
+        hits = analysis.get('keyword_hits')
+        if hits is None:
+            hits = self.keyword_matcher.scan(analysis.get('content', ''))
+        return hits
+    
+    def _detect_task_type(self, hits: Dict[str, Any], content: Optional[str] = None) -> tuple[str, float]:
+        """Detect task type with the intent model, falling back to the keyword hits"""
+        if self.intent_classifier is not None and content:
+            task_type, confidence = self.intent_classifier.classify_one(content)
+            if task_type is not None:
+                return task_type, confidence
+        
+        return self._detect_task_type_by_keywords(hits)
+    
+    def classify_batch(self, contents: List[str]) -> List[tuple]:
+        """Task type and confidence for many messages, with one model call for the whole batch"""
+        if self.intent_classifier is not None:
+            predictions = self.intent_classifier.classify(contents)
+        else:
+            predictions = [(None, 0.0)] * len(contents)
+        
+        return [
+            prediction if prediction[0] is not None
+            else self._detect_task_type_by_keywords(self.keyword_matcher.scan(content))
+            for prediction, content in zip(predictions, contents)
+        ]
+    
+    def _detect_task_type_by_keywords(self, hits: Dict[str, Any]) -> tuple[str, float]:
+        """Detect task type from the keyword hits"""
         best_match = 'general'
         best_confidence = 0.0
         
         for task_type, pattern in self.task_patterns.items():
             keywords = pattern['keywords']
-            matches = sum(1 for keyword in keywords if keyword in content)
+            matches = len(hits.get(task_type, ()))
             
             if matches > 0:
                 confidence = matches / len(keywords)
@@ -206,48 +338,43 @@ class ExecutiveAgent(BaseAgent):
         
         return best_match, best_confidence
     
-    def _determine_priority(self, content: str, task_type: str) -> int:
-        """Determine task priority based on content and type"""
+    def _determine_priority(self, hits: Dict[str, Any], task_type: str) -> int:
+        """Determine task priority based on keyword hits and type"""
         base_priority = self.task_patterns.get(task_type, {}).get('priority', 5)
         
         # Adjust based on urgency indicators
-        urgency_words = ['urgent', 'asap', 'immediately', 'now', 'quick', 'fast']
-        if any(word in content for word in urgency_words):
+        if 'priority_urgent' in hits:
             base_priority += 2
         
         # Adjust based on user importance indicators
-        importance_words = ['important', 'critical', 'essential', 'must', 'need']
-        if any(word in content for word in importance_words):
+        if 'priority_important' in hits:
             base_priority += 1
         
         return min(base_priority, 10)  # Cap at 10
     
-    def _extract_required_capabilities(self, content: str, task_type: str) -> List[str]:
+    def _extract_required_capabilities(self, hits: Dict[str, Any], task_type: str) -> List[str]:
         """Extract required capabilities for the task"""
         base_capabilities = self.task_patterns.get(task_type, {}).get('capabilities', [])
         
-        # Add specific capabilities based on content analysis
+        # Add specific capabilities based on keyword hits
         additional_capabilities = []
         
-        if 'research' in content or 'analysis' in content:
+        if 'needs_research' in hits:
             additional_capabilities.append('research')
         
-        if 'writing' in content or 'content' in content:
+        if 'needs_content_creation' in hits:
             additional_capabilities.append('content_creation')
         
-        if 'money' in content or 'financial' in content:
+        if 'needs_financial_analysis' in hits:
             additional_capabilities.append('financial_analysis')
         
         return list(set(base_capabilities + additional_capabilities))
     
-    def _analyze_urgency(self, content: str) -> str:
+    def _analyze_urgency(self, hits: Dict[str, Any]) -> str:
         """Analyze urgency level of the task"""
-        urgent_words = ['urgent', 'asap', 'immediately', 'now', 'emergency']
-        high_words = ['important', 'critical', 'priority', 'deadline']
-        
-        if any(word in content for word in urgent_words):
+        if 'urgency_urgent' in hits:
             return 'urgent'
-        elif any(word in content for word in high_words):
+        elif 'urgency_high' in hits:
             return 'high'
         else:
             return 'normal'
@@ -280,16 +407,16 @@ class ExecutiveAgent(BaseAgent):
             content = task_data.get('content', '')
             user_id = task_data.get('user_id', 'default')
             
-            # Get related past tasks
-            related_tasks = await self.memory_manager.search_interactions(
-                user_id=user_id,
-                query=content,
-                limit=5
+            # Get related past tasks and the current system status
+            related_tasks, system_status = await asyncio.gather(
+                self.memory_manager.search_interactions(
+                    user_id=user_id,
+                    query=content,
+                    limit=5
+                ),
+                self._get_system_status()
             )
             
-            # Get current system status
-            system_status = await self.agent_manager.health_check()
-            
             return {
                 'related_tasks': related_tasks,
                 'system_status': system_status,
@@ -300,35 +427,75 @@ class ExecutiveAgent(BaseAgent):
             logger.error(f"❌ Failed to get relevant context: {str(e)}")
             return {}
     
+    async def _get_system_status(self) -> Dict[str, Any]:
+        """Cached agent health snapshot; a stale one is served while a refresh runs"""
+        if self._health_snapshot is None:
+            # Nothing cached yet: wait for the first check, shared by concurrent callers
+            await asyncio.shield(self._health_refresh_task())
+        elif time.monotonic() - self._health_checked_at > self.health_refresh_interval:
+            self._health_refresh_task()
+        
+        return self._health_snapshot or {}
+    
+    def _health_refresh_task(self) -> asyncio.Task:
+        """Start a health refresh unless one is already running"""
+        if self._health_refresh is None or self._health_refresh.done():
+            self._health_refresh = asyncio.create_task(self._refresh_health())
+        return self._health_refresh
+    
+    async def _refresh_health(self):
+        """Replace the cached health snapshot with a fresh health check"""
+        try:
+            self._health_snapshot = await self.agent_manager.health_check()
+            self._health_checked_at = time.monotonic()
+        except Exception as e:
+            logger.error(f"❌ Failed to refresh system status: {str(e)}")
+    
+    def _log_in_background(self, **interaction):
+        """Log an interaction without blocking the caller"""
+        task = asyncio.create_task(self.memory_manager.log_interaction(**interaction))
+        self._pending_writes.add(task)
+        task.add_done_callback(self._pending_writes.discard)
+    
+    async def shutdown(self):
+        """Finish pending analysis log writes before shutting down"""
+        if self._pending_writes:
+            await asyncio.gather(*self._pending_writes, return_exceptions=True)
+        await super().shutdown()
+    
     def _is_multi_step_task(self, analysis: Dict[str, Any]) -> bool:
         """Determine if this is a multi-step task requiring coordination"""
         task_type = analysis.get('task_type', '')
-        content = analysis.get('content', '')
-        
-        # Check for multi-step indicators
-        multi_step_indicators = [
-            'and then', 'after that', 'next', 'also', 'additionally',
-            'first', 'second', 'finally', 'step', 'phase'
-        ]
+        hits = self._keyword_hits(analysis)
         
-        has_multi_step_indicators = any(indicator in content.lower() for indicator in multi_step_indicators)
+        # Check for multi-step indicators, or requests naming several kinds of step
+        has_multi_step_indicators = 'multi_step' in hits
+        step_kinds = sum(1 for group in WORKFLOW_STEPS if group in hits)
         
         # Certain task types are inherently multi-step
         multi_step_types = ['project_planning', 'market_research', 'financial_analysis']
         
-        return has_multi_step_indicators or task_type in multi_step_types
+        return has_multi_step_indicators or step_kinds > 1 or task_type in multi_step_types
     
     async def _handle_multi_step_task(self, analysis: Dict[str, Any]) -> Dict[str, Any]:
-        """Handle multi-step tasks by breaking them down"""
+        """Handle multi-step tasks by running their steps as a workflow"""
         try:
-            steps = await self._break_down_task(analysis)
+            final = {}
+            async for event in self.stream_multi_step_task(analysis):
+                if event['event'] == 'workflow_started':
+                    steps = event['steps']
+                    estimated_duration = event['estimated_duration']
+                final = event
             
             return {
-                'success': True,
+                'success': final.get('success', False),
                 'analysis': analysis,
                 'task_type': 'multi_step',
                 'steps': steps,
-                'estimated_duration': self._estimate_duration(steps),
+                'results': final.get('results', {}),
+                'failed_steps': final.get('failed_steps', []),
+                'estimated_duration': estimated_duration,
+                'elapsed': final.get('elapsed'),
                 'coordination_required': True
             }
             
@@ -339,68 +506,79 @@ class ExecutiveAgent(BaseAgent):
                 'error': str(e)
             }
     
-    async def _break_down_task(self, analysis: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Break down a complex task into steps"""
-        content = analysis.get('content', '')
+    async def stream_multi_step_task(self, analysis: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Run a multi-step task, yielding progress as it happens
+        
+        Yields:
+            A 'workflow_started' event with the plan, one event per finished step
+            (partial results), then the 'workflow_completed' event
+        """
+        steps = await self._break_down_task(analysis)
+        yield {
+            'event': 'workflow_started',
+            'steps': [step.to_dict() for step in steps],
+            'estimated_duration': self._estimate_duration(steps)
+        }
+        
+        context = {
+            'content': analysis.get('content', ''),
+            'user_id': analysis.get('user_id', 'default')
+        }
+        async for event in self.workflow_executor.run(steps, context):
+            yield event
+    
+    async def _break_down_task(self, analysis: Dict[str, Any]) -> List[WorkflowStep]:
+        """Break down a complex task into a dependency graph of steps"""
         task_type = analysis.get('task_type', '')
+        priority = analysis.get('priority', 5)
+        hits = self._keyword_hits(analysis)
         
         # Simple step extraction based on common patterns
-        steps = []
-        
-        if 'first' in content.lower() or 'step 1' in content.lower():
-            steps.append({
-                'step': 1,
-                'description': 'Initial analysis and planning',
-                'agent_type': 'planning_agent',
-                'estimated_time': 5
-            })
-        
-        if 'research' in content.lower() or 'find' in content.lower():
-            steps.append({
-                'step': len(steps) + 1,
-                'description': 'Research and data collection',
-                'agent_type': 'job_search_agent',
-                'estimated_time': 10
-            })
-        
-        if 'write' in content.lower() or 'create' in content.lower():
-            steps.append({
-                'step': len(steps) + 1,
-                'description': 'Content creation and writing',
-                'agent_type': 'proposal_writer_agent',
-                'estimated_time': 15
-            })
-        
-        if 'review' in content.lower() or 'check' in content.lower():
-            steps.append({
-                'step': len(steps) + 1,
-                'description': 'Review and quality check',
-                'agent_type': 'executive_agent',
-                'estimated_time': 3
-            })
-        
-        # Default steps if none detected
+        steps = {
+            group: WorkflowStep(step_id=step_id, task_type=step_type, description=description,
+                                priority=priority, estimated_time=estimated_time)
+            for group, (step_id, step_type, description, estimated_time) in WORKFLOW_STEPS.items()
+            if group in hits
+        }
+        
+        # Default step if none detected
         if not steps:
-            steps = [
-                {
-                    'step': 1,
-                    'description': 'Task analysis and planning',
-                    'agent_type': 'executive_agent',
-                    'estimated_time': 5
-                },
-                {
-                    'step': 2,
-                    'description': 'Task execution',
-                    'agent_type': task_type.replace('_', '_agent'),
-                    'estimated_time': 10
-                }
+            return [WorkflowStep(step_id='execute', task_type=task_type or 'general',
+                                 description='Task execution', priority=priority, estimated_time=10)]
+        
+        # Planning comes first; research and rates run side by side; writing uses
+        # whatever they produced; review checks everything else
+        planning = ['planning'] if 'step_planning' in steps else []
+        gathering = [steps[group].step_id for group in ('step_research', 'step_rates') if group in steps]
+        for group in ('step_research', 'step_rates'):
+            if group in steps:
+                steps[group].depends_on = list(planning)
+        if 'step_writing' in steps:
+            steps['step_writing'].depends_on = gathering or list(planning)
+        if 'step_review' in steps:
+            steps['step_review'].depends_on = [
+                step.step_id for group, step in steps.items() if group != 'step_review'
             ]
         
-        return steps
+        return list(steps.values())
+    
+    async def _review_step(self, step: WorkflowStep, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """Review step run by the executive itself over the results of the other steps"""
+        return {
+            'success': True,
+            'result': {
+                'reviewed_steps': sorted(inputs),
+                'agents_used': {
+                    step_id: (result or {}).get('agents_used') or (result or {}).get('agent_used')
+                    for step_id, result in inputs.items()
+                }
+            }
+        }
     
-    def _estimate_duration(self, steps: List[Dict[str, Any]]) -> int:
-        """Estimate total duration for multi-step task"""
-        return sum(step.get('estimated_time', 5) for step in steps)
+    def _estimate_duration(self, steps: List[WorkflowStep]) -> int:
+        """Estimate total duration for multi-step task, counting concurrent steps once"""
+        return critical_path_time(steps)
     
     async def _generate_recommendations(self, analysis: Dict[str, Any]) -> List[str]:
         """Generate recommendations based on task analysis"""
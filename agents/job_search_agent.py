@@ -8,6 +8,7 @@ import logging
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 import json
+from types import MappingProxyType
 
 from core.agent_manager import BaseAgent
 
@@ -19,6 +20,9 @@ class JobSearchAgent(BaseAgent):
     Integrates with multiple platforms and provides intelligent matching
     """
     
+    # Listings and market rates change slowly enough to reuse results for a few minutes
+    cache_ttls = MappingProxyType({'job_search': 300, 'market_research': 900})
+    
     def __init__(self):
         super().__init__(
             agent_id="job_search_agent",
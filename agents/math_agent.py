@@ -42,7 +42,13 @@ class MathAgent(BaseAgent):
     MathAgent for FreelanceX.AI
     Assists with mathematical problems, statistical analysis, financial predictions, and project budgeting
     """
-    
+
+    # NumPy/SciPy/sklearn-heavy task types run in AgentManager's process-pool lane
+    cpu_bound_task_types = frozenset({
+        'statistical_analysis', 'financial_analysis', 'income_forecasting',
+        'risk_assessment', 'optimization', 'market_analysis'
+    })
+
     def __init__(self):
         super().__init__("MathAgent", "mathematics")
         
@@ -122,7 +128,8 @@ class MathAgent(BaseAgent):
     async def execute_task(self, task: Dict[str, Any]) -> Dict[str, Any]:
         """Execute mathematical and financial analysis tasks"""
         start_time = datetime.now()
-        task_type = task.get('type', 'calculate')
+        # Dispatched tasks carry their type as task_type
+        task_type = task.get('type') or task.get('task_type', 'calculate')
         
         try:
             if task_type == 'basic_calculation':
@@ -5,11 +5,12 @@ Specialized agent for creating compelling proposals and cover letters
 
 import asyncio
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, AsyncIterator
 from datetime import datetime
 import json
 
 from core.base_agent import BaseAgent
+from core.deadline import report_partial_result
 from openai_agents import Agent, Session
 from openai import OpenAI
 
@@ -93,15 +94,14 @@ class ProposalWriterAgent(BaseAgent):
             
             # Use OpenAI Agent SDK session if available
             if self.openai_agent:
-                session = self.get_or_create_session(user_id)
-                if session:
-                    response = session.run(content)
-                    return {
-                        'success': True,
-                        'result': str(response),
-                        'agent': self.agent_name,
-                        'timestamp': datetime.now().isoformat()
-                    }
+                priority = 'background' if task.get('background') else 'interactive'
+                response = await self.run_model(user_id, content, priority)
+                return {
+                    'success': True,
+                    'result': str(response),
+                    'agent': self.agent_name,
+                    'timestamp': datetime.now().isoformat()
+                }
             
             # Fallback to custom processing
             return await self.process_task(task)
@@ -115,6 +115,53 @@ class ProposalWriterAgent(BaseAgent):
                 'timestamp': datetime.now().isoformat()
             }
     
+    async def stream_task(self, task: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """Write a proposal, yielding model tokens as they arrive and then the full result"""
+        if not self.openai_agent:
+            yield {'event': 'result', 'result': await self.process_task(task)}
+            return
+        
+        priority = 'background' if task.get('background') else 'interactive'
+        chunks = []
+        async for text in self.stream_model(task.get('user_id', 'default'), task.get('content', ''), priority):
+            chunks.append(text)
+            # The draft so far is returned if the deadline cuts the proposal short
+            report_partial_result({'success': False, 'partial': True, 'result': ''.join(chunks), 'agent': self.agent_name})
+            yield {'event': 'token', 'text': text}
+        
+        yield {
+            'event': 'result',
+            'result': {
+                'success': True,
+                'result': ''.join(chunks),
+                'agent': self.agent_name,
+                'timestamp': datetime.now().isoformat()
+            }
+        }
+    
+    async def self_diagnose(self) -> Dict[str, Any]:
+        """Perform self-diagnosis for the ProposalWriterAgent"""
+        diagnosis = {
+            "agent_health": "healthy",
+            "needs_repair": False,
+            "issues": [],
+            "recommendations": []
+        }
+        
+        # Fallback proposals are built from the templates
+        if not self.templates:
+            diagnosis["needs_repair"] = True
+            diagnosis["issues"].append("Proposal templates not loaded")
+        
+        if not self.openai_agent:
+            diagnosis["agent_health"] = "degraded"
+            diagnosis["issues"].append("OpenAI Agent SDK unavailable, using template fallback")
+        
+        if len(self.proposal_history) > 1000:
+            diagnosis["recommendations"].append("Consider archiving old proposal history")
+        
+        return diagnosis
+    
     async def process_task(self, task_data: Dict[str, Any]) -> Dict[str, Any]:
         """Process proposal writing related tasks (fallback method)"""
         try:
@@ -7,6 +7,7 @@ from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 from dataclasses import dataclass
 from core.base_agent import BaseAgent, AgentStatus
+from core.deadline import report_partial_result
 from bs4 import BeautifulSoup
 import urllib.parse
 
@@ -196,13 +197,22 @@ class WebSearchAgent(BaseAgent):
             all_results = []
             
             # Execute searches across multiple engines
-            for query in search_queries:
+            for queries_searched, query in enumerate(search_queries, 1):
                 for engine in self.search_engines.keys():
                     try:
                         engine_results = await self._search_engine(engine, query)
                         all_results.extend(engine_results)
                     except Exception as e:
                         self.logger.error(f"Search failed for {engine}: {str(e)}")
+                
+                # Raw results gathered so far, returned if the deadline cuts the research short
+                report_partial_result({
+                    "status": "partial",
+                    "topic": topic,
+                    "queries_searched": queries_searched,
+                    "queries_planned": len(search_queries),
+                    "results": list(all_results)
+                })
             
             # Process and analyze results
             processed_results = await self._process_search_results(all_results, topic)
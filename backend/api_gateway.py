@@ -7,33 +7,36 @@ Features: Request routing, rate limiting, authentication, security, monitoring
 
 import asyncio
 import logging
+import math
 import time
 import hashlib
+import json
 import secrets
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, List, Optional, Union, AsyncIterator
 from dataclasses import dataclass
 from collections import defaultdict
 
-from fastapi import FastAPI, HTTPException, Depends, Request, status, Security
+from fastapi import FastAPI, HTTPException, Depends, Request, status, Security, Query, WebSocket, WebSocketDisconnect
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.exceptions import RequestValidationError
 from fastapi.openapi.docs import get_swagger_ui_html
 from fastapi.openapi.utils import get_openapi
 
 import jwt
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationError
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 from slowapi.middleware import SlowAPIMiddleware
 
 # Import FreelanceX.AI components
-from core.agent_manager import AgentManager
+from core.agent_manager import AgentManager, AdmissionRejected
 from core.base_agent import BaseAgent, AgentStatus
+from core.deadline import deadline_scope, time_remaining
 from backend.database import DatabaseManager
 
 # Configure logging
@@ -52,6 +55,10 @@ class APIConfig:
     refresh_token_expire_days: int = 7
     max_requests_per_minute: int = 60
     max_requests_per_hour: int = 1000
+    request_timeout: float = 60.0  # default deadline for agent requests, in seconds
+    max_batch_items: int = 100
+    batch_concurrency: int = 8  # items of one batch executed at once
+    stream_heartbeat_interval: float = 15.0  # seconds of silence before a streaming keep-alive
     enable_cors: bool = True
     enable_https_redirect: bool = True
     trusted_hosts: List[str] = None
@@ -74,6 +81,8 @@ class AgentRequest(BaseModel):
     action: str
     parameters: Dict[str, Any] = {}
     user_context: Optional[Dict[str, Any]] = None
+    timeout: Optional[float] = Field(None, gt=0, description="Request deadline in seconds")
+    priority: int = Field(5, ge=1, le=10, description="Task priority; low-priority work is shed first under load")
 
 class AgentResponse(BaseModel):
     """Agent response model"""
@@ -84,6 +93,45 @@ class AgentResponse(BaseModel):
     timestamp: str
     execution_time: float
 
+class StreamTaskRequest(BaseModel):
+    """Task streamed over SSE or a WebSocket"""
+    content: str = ""
+    task_type: Optional[str] = None
+    priority: int = Field(5, ge=1, le=10, description="Task priority; low-priority work is shed first under load")
+    timeout: Optional[float] = Field(None, gt=0, description="Request deadline in seconds")
+
+class BatchItem(BaseModel):
+    """One operation of a batch request"""
+    agent_name: str
+    action: str
+    parameters: Dict[str, Any] = {}
+    priority: int = Field(5, ge=1, le=10)
+
+class BatchRequest(BaseModel):
+    """Batch agent request model"""
+    items: List[BatchItem] = Field(..., min_length=1)
+    timeout: Optional[float] = Field(None, gt=0, description="Deadline for the whole batch in seconds")
+    max_concurrency: Optional[int] = Field(None, ge=1, description="Items executed at once (capped by the gateway)")
+    stream: bool = Field(False, description="Stream results as NDJSON lines in completion order")
+
+class BatchItemResult(BaseModel):
+    """Result of one batch item"""
+    index: int
+    success: bool
+    data: Any = None
+    error: Optional[str] = None
+    agent_name: str
+    execution_time: float
+
+class BatchResponse(BaseModel):
+    """Batch response model"""
+    success: bool
+    results: List[BatchItemResult]
+    succeeded: int
+    failed: int
+    timestamp: str
+    execution_time: float
+
 class APIGateway:
     """
     Centralized API Gateway for FreelanceX.AI
@@ -114,6 +162,7 @@ class APIGateway:
             "failed_requests": 0,
             "average_response_time": 0.0,
             "active_users": 0,
+            "shed_requests": 0,
             "start_time": datetime.now()
         }
         
@@ -162,7 +211,8 @@ class APIGateway:
             logger.error(f"HTTP error: {exc.detail}")
             return JSONResponse(
                 status_code=exc.status_code,
-                content={"detail": exc.detail}
+                content={"detail": exc.detail},
+                headers=getattr(exc, "headers", None)
             )
 
     def _setup_routes(self):
@@ -223,6 +273,7 @@ class APIGateway:
         ):
             """Execute action on specific agent"""
             start_time = time.time()
+            self.system_metrics["total_requests"] += 1
             
             try:
                 # Validate agent exists
@@ -232,9 +283,20 @@ class APIGateway:
                         detail=f"Agent {agent_name} not found"
                     )
                 
-                # Route request to agent
+                # Route request to agent through its bulkhead under the request deadline;
+                # work the agent can't start before the deadline is shed
+                timeout = min(agent_request.timeout or self.config.request_timeout, self.config.request_timeout)
                 agent = self.agent_manager.agents[agent_name]
-                result = await self._execute_agent_request(agent, agent_request, current_user)
+                try:
+                    result = await self.agent_manager.run_admitted(
+                        agent_name,
+                        lambda: self._execute_agent_request(agent, agent_request, current_user),
+                        agent_request.priority,
+                        timeout
+                    )
+                except AdmissionRejected as e:
+                    self.system_metrics["shed_requests"] += 1
+                    raise self._overloaded_error(e.rejection)
                 
                 execution_time = time.time() - start_time
                 
@@ -250,6 +312,25 @@ class APIGateway:
                     execution_time=execution_time
                 )
                 
+            except asyncio.TimeoutError:
+                execution_time = time.time() - start_time
+                logger.warning(f"Agent request to {agent_name} timed out after {execution_time:.2f}s")
+                
+                # Update metrics
+                self.system_metrics["failed_requests"] += 1
+                
+                return AgentResponse(
+                    success=False,
+                    error=f"Request timed out after {execution_time:.2f}s",
+                    agent_name=agent_name,
+                    timestamp=datetime.now().isoformat(),
+                    execution_time=execution_time
+                )
+                
+            except HTTPException:
+                self.system_metrics["failed_requests"] += 1
+                raise
+                
             except Exception as e:
                 execution_time = time.time() - start_time
                 logger.error(f"Agent execution error: {str(e)}")
@@ -265,6 +346,96 @@ class APIGateway:
                     execution_time=execution_time
                 )
         
+        @self.app.post("/agents/batch", response_model=BatchResponse)
+        @limiter.limit("10/minute")
+        async def execute_agent_batch(
+            request: Request,
+            batch_request: BatchRequest,
+            current_user: dict = Depends(self._get_current_user)
+        ):
+            """Execute several agent actions with one authentication and bounded concurrency"""
+            if len(batch_request.items) > self.config.max_batch_items:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=f"Batch exceeds {self.config.max_batch_items} items"
+                )
+            
+            start_time = time.time()
+            timeout = min(batch_request.timeout or self.config.request_timeout, self.config.request_timeout)
+            concurrency = min(batch_request.max_concurrency or self.config.batch_concurrency,
+                              self.config.batch_concurrency)
+            
+            if batch_request.stream:
+                return StreamingResponse(
+                    self._stream_batch(batch_request.items, current_user, timeout, concurrency, start_time),
+                    media_type="application/x-ndjson"
+                )
+            
+            results = [None] * len(batch_request.items)
+            async for result in self._run_batch(batch_request.items, current_user, timeout, concurrency):
+                results[result.index] = result
+            
+            succeeded = sum(1 for result in results if result.success)
+            return BatchResponse(
+                success=succeeded == len(results),
+                results=results,
+                succeeded=succeeded,
+                failed=len(results) - succeeded,
+                timestamp=datetime.now().isoformat(),
+                execution_time=time.time() - start_time
+            )
+        
+        @self.app.get("/agents/{agent_name}/stream")
+        @limiter.limit("30/minute")
+        async def stream_agent_task(
+            request: Request,
+            agent_name: str,
+            content: str = "",
+            task_type: Optional[str] = None,
+            priority: int = Query(5, ge=1, le=10),
+            timeout: Optional[float] = Query(None, gt=0),
+            current_user: dict = Depends(self._get_current_user)
+        ):
+            """Run a task on an agent, streaming its progress, partial results and tokens as Server-Sent Events"""
+            if agent_name not in self.agent_manager.agents:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Agent {agent_name} not found"
+                )
+            
+            events = self._agent_events(agent_name, StreamTaskRequest(
+                content=content,
+                task_type=task_type,
+                priority=priority,
+                timeout=timeout
+            ), current_user)
+            return StreamingResponse(
+                self._sse_stream(events),
+                media_type="text/event-stream",
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+            )
+        
+        @self.app.websocket("/agents/{agent_name}/ws")
+        async def agent_websocket(websocket: WebSocket, agent_name: str, token: str = Query(...)):
+            """
+            Run tasks on an agent over a WebSocket, streaming each task's events
+            
+            Send {"content", "task_type", "priority", "timeout"} to start a task and
+            {"action": "cancel"} to cancel it; one task runs at a time per connection.
+            """
+            try:
+                current_user = await self._user_from_token(token)
+            except HTTPException as e:
+                await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=e.detail)
+                return
+            
+            if agent_name not in self.agent_manager.agents:
+                await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=f"Agent {agent_name} not found")
+                return
+            
+            await websocket.accept()
+            await self._serve_agent_websocket(websocket, agent_name, current_user)
+        
         @self.app.get("/agents")
         async def list_agents(current_user: dict = Depends(self._get_current_user)):
             """List all available agents and their status"""
@@ -305,6 +476,9 @@ class APIGateway:
                         detail="Failed to initiate negotiation"
                     )
                     
+            except HTTPException:
+                raise
+                
             except Exception as e:
                 logger.error(f"Negotiation initiation error: {str(e)}")
                 raise HTTPException(
@@ -312,6 +486,20 @@ class APIGateway:
                     detail="Negotiation service error"
                 )
         
+        @self.app.get("/agents/negotiations/{negotiation_id}")
+        async def get_agent_negotiation(
+            negotiation_id: str,
+            current_user: dict = Depends(self._get_current_user)
+        ):
+            """Get the status and outcome of a negotiation"""
+            negotiation = await self.agent_manager.get_negotiation(negotiation_id)
+            if not negotiation:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Negotiation {negotiation_id} not found"
+                )
+            return negotiation
+        
         @self.app.get("/metrics")
         async def get_system_metrics(current_user: dict = Depends(self._get_current_user)):
             """Get system performance metrics"""
@@ -319,6 +507,8 @@ class APIGateway:
             
             return {
                 **self.system_metrics,
+                "admission": await self.agent_manager.get_admission_stats(),
+                "message_bus": self.agent_manager.message_bus.get_stats(),
                 "uptime_seconds": uptime.total_seconds(),
                 "requests_per_minute": self.system_metrics["total_requests"] / max(uptime.total_seconds() / 60, 1),
                 "success_rate": (
@@ -372,9 +562,13 @@ class APIGateway:
 
     async def _get_current_user(self, credentials: HTTPAuthorizationCredentials = Security(HTTPBearer())):
         """Get current user from token"""
+        return await self._user_from_token(credentials.credentials)
+
+    async def _user_from_token(self, token: str) -> dict:
+        """Validate an access token and load its user; raises HTTPException (401) otherwise"""
         try:
             payload = jwt.decode(
-                credentials.credentials, 
+                token, 
                 self.config.secret_key, 
                 algorithms=[self.config.algorithm]
             )
@@ -395,12 +589,14 @@ class APIGateway:
             
             return user_data
             
+        except HTTPException:
+            raise
         except jwt.ExpiredSignatureError:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Token expired"
             )
-        except jwt.JWTError:
+        except jwt.InvalidTokenError:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid token"
@@ -428,7 +624,7 @@ class APIGateway:
                 else:
                     raise ValueError(f"Invalid action: {request.action}")
             else:
-                raise ValueError(f"Action {request.action} not supported by agent {agent.agent_name}")
+                raise ValueError(f"Action {request.action} not supported by agent {agent.name}")
             
             return result
             
@@ -436,6 +632,230 @@ class APIGateway:
             logger.error(f"Agent execution error: {str(e)}")
             raise
 
+    async def _execute_batch_item(self, index: int, item: BatchItem, user_context: dict,
+                                  slots: asyncio.Semaphore) -> BatchItemResult:
+        """Execute one batch item under the batch deadline; failures become the item's result"""
+        async with slots:
+            start_time = time.time()
+            self.system_metrics["total_requests"] += 1
+            try:
+                agent = self.agent_manager.agents.get(item.agent_name)
+                if agent is None:
+                    raise ValueError(f"Agent {item.agent_name} not found")
+                
+                agent_request = AgentRequest(
+                    agent_name=item.agent_name,
+                    action=item.action,
+                    parameters=item.parameters,
+                    priority=item.priority
+                )
+                # Items that can't start before the batch deadline are shed individually
+                try:
+                    data = await self.agent_manager.run_admitted(
+                        item.agent_name,
+                        lambda: self._execute_agent_request(agent, agent_request, user_context),
+                        item.priority,
+                        time_remaining()
+                    )
+                except AdmissionRejected:
+                    self.system_metrics["shed_requests"] += 1
+                    raise
+                
+                execution_time = time.time() - start_time
+                self.system_metrics["successful_requests"] += 1
+                self._update_average_response_time(execution_time)
+                return BatchItemResult(index=index, success=True, data=data, agent_name=item.agent_name,
+                                       execution_time=execution_time)
+                
+            except Exception as e:
+                execution_time = time.time() - start_time
+                error = f"Request timed out after {execution_time:.2f}s" if isinstance(e, asyncio.TimeoutError) else str(e)
+                self.system_metrics["failed_requests"] += 1
+                return BatchItemResult(index=index, success=False, error=error, agent_name=item.agent_name,
+                                       execution_time=execution_time)
+    
+    async def _run_batch(self, items: List[BatchItem], user_context: dict, timeout: float,
+                         concurrency: int):
+        """Execute batch items concurrently, yielding each result as it completes"""
+        slots = asyncio.Semaphore(concurrency)
+        with deadline_scope(timeout):
+            tasks = [
+                asyncio.create_task(self._execute_batch_item(index, item, user_context, slots))
+                for index, item in enumerate(items)
+            ]
+        
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                yield await next_result
+        finally:
+            # The client went away (or the consumer stopped): don't run the rest
+            for task in tasks:
+                task.cancel()
+    
+    async def _stream_batch(self, items: List[BatchItem], user_context: dict, timeout: float,
+                            concurrency: int, start_time: float):
+        """NDJSON body of a streamed batch: one line per item, then a summary line"""
+        succeeded = 0
+        async for result in self._run_batch(items, user_context, timeout, concurrency):
+            succeeded += result.success
+            yield json.dumps(result.model_dump(), default=str) + "\n"
+        
+        yield json.dumps({
+            "summary": True,
+            "success": succeeded == len(items),
+            "succeeded": succeeded,
+            "failed": len(items) - succeeded,
+            "timestamp": datetime.now().isoformat(),
+            "execution_time": time.time() - start_time
+        }) + "\n"
+    
+    async def _agent_events(self, agent_name: str, request: StreamTaskRequest,
+                            user_context: dict) -> AsyncIterator[Dict[str, Any]]:
+        """Stream a task through the agent manager, recording the outcome in the gateway metrics"""
+        timeout = min(request.timeout or self.config.request_timeout, self.config.request_timeout)
+        task_data = {
+            "content": request.content,
+            "priority": request.priority,
+            "user_id": user_context.get("username", "default"),
+            "user_context": user_context,
+            "request_id": secrets.token_urlsafe(16)
+        }
+        if request.task_type:
+            task_data["task_type"] = request.task_type
+        
+        self.system_metrics["total_requests"] += 1
+        start_time = time.time()
+        stream = self.agent_manager.stream_task(agent_name, task_data, timeout)
+        try:
+            async for event in stream:
+                if event["event"] == "completed":
+                    self.system_metrics["successful_requests"] += 1
+                    self._update_average_response_time(time.time() - start_time)
+                elif event["event"] in ("error", "timeout", "rejected"):
+                    self.system_metrics["failed_requests"] += 1
+                    if event["event"] == "rejected":
+                        self.system_metrics["shed_requests"] += 1
+                yield event
+        finally:
+            # Closing this stream (client gone) must reach the agent's generator now, not at GC
+            await stream.aclose()
+    
+    async def _with_heartbeats(self, events: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """
+        Relay events, yielding None after each heartbeat interval without one
+        
+        Only one event is requested at a time, so a client that reads slowly holds
+        the agent back rather than letting events pile up in memory.
+        """
+        pending = asyncio.ensure_future(events.__anext__())
+        try:
+            while True:
+                done, _ = await asyncio.wait({pending}, timeout=self.config.stream_heartbeat_interval)
+                if not done:
+                    yield None
+                    continue
+                
+                try:
+                    event = pending.result()
+                except StopAsyncIteration:
+                    return
+                yield event
+                pending = asyncio.ensure_future(events.__anext__())
+        
+        finally:
+            # Client disconnected or the stream ended: stop the agent's work
+            if not pending.done():
+                pending.cancel()
+                try:
+                    await pending
+                except (asyncio.CancelledError, Exception):
+                    pass
+            await events.aclose()
+    
+    async def _sse_stream(self, events: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[str]:
+        """Server-Sent Events body: one named event per agent event, comments as keep-alives"""
+        relayed = self._with_heartbeats(events)
+        try:
+            async for event in relayed:
+                if event is None:
+                    yield ": keep-alive\n\n"
+                else:
+                    yield f"event: {event['event']}\ndata: {json.dumps(event, default=str)}\n\n"
+        finally:
+            await relayed.aclose()
+    
+    async def _serve_agent_websocket(self, websocket: WebSocket, agent_name: str, user_context: dict):
+        """Read task and cancel messages from a WebSocket until it disconnects"""
+        running: Optional[asyncio.Task] = None
+        try:
+            while True:
+                try:
+                    message = await websocket.receive_json()
+                except (ValueError, KeyError):
+                    message = None
+                if not isinstance(message, dict):
+                    await websocket.send_json({"event": "error", "error": "Messages must be JSON objects"})
+                    continue
+                
+                if message.get("action") == "cancel":
+                    if running is not None and not running.done():
+                        running.cancel()
+                    continue
+                
+                if running is not None and not running.done():
+                    await websocket.send_json({"event": "error", "error": "A task is already running"})
+                    continue
+                
+                try:
+                    request = StreamTaskRequest.model_validate(message)
+                except ValidationError as e:
+                    await websocket.send_json({
+                        "event": "error",
+                        "error": "Request validation failed",
+                        "errors": e.errors()
+                    })
+                    continue
+                
+                running = asyncio.create_task(
+                    self._send_task_events(websocket, self._agent_events(agent_name, request, user_context))
+                )
+        
+        except WebSocketDisconnect:
+            pass
+        
+        finally:
+            if running is not None and not running.done():
+                running.cancel()
+    
+    async def _send_task_events(self, websocket: WebSocket, events: AsyncIterator[Dict[str, Any]]):
+        """Send one task's events over a WebSocket; each send waits for the connection to take it"""
+        relayed = self._with_heartbeats(events)
+        try:
+            async for event in relayed:
+                await websocket.send_json(event if event is not None else {"event": "heartbeat"})
+        except asyncio.CancelledError:
+            try:
+                await websocket.send_json({"event": "cancelled"})
+            except Exception:
+                pass
+        except Exception as e:
+            logger.warning(f"WebSocket stream ended: {str(e)}")
+        finally:
+            await relayed.aclose()
+    
+    def _overloaded_error(self, rejection: Dict[str, Any]) -> HTTPException:
+        """Translate an overloaded result: 429 for shed low-priority work, 503 otherwise"""
+        if rejection.get("priority_class") == "low":
+            status_code = status.HTTP_429_TOO_MANY_REQUESTS
+        else:
+            status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        
+        return HTTPException(
+            status_code=status_code,
+            detail=rejection["error"],
+            headers={"Retry-After": str(math.ceil(rejection["retry_after"]))}
+        )
+
     def _update_average_response_time(self, response_time: float):
         """Update average response time metric"""
         total_requests = self.system_metrics["total_requests"]
@@ -19,6 +19,8 @@ import hashlib
 import hmac
 from abc import ABC, abstractmethod
 
+from core.deadline import DeadlineExceeded, check_deadline, time_remaining
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -73,6 +75,11 @@ class ExternalIntegration(ABC):
             timeout = aiohttp.ClientTimeout(total=30)
             self.session = aiohttp.ClientSession(timeout=timeout)
     
+    def _request_timeout(self) -> aiohttp.ClientTimeout:
+        """Per-request timeout bounded by the caller's deadline"""
+        check_deadline()
+        return aiohttp.ClientTimeout(total=time_remaining(30))
+    
     async def _close_session(self):
         """Close HTTP session"""
         if self.session:
@@ -91,6 +98,9 @@ class ExternalIntegration(ABC):
         if self.rate_limits["request_count"] >= self.rate_limits["requests_per_minute"]:
             sleep_time = 60 - (current_time - self.rate_limits["last_request_time"])
             if sleep_time > 0:
+                remaining = time_remaining()
+                if remaining is not None and sleep_time >= remaining:
+                    raise DeadlineExceeded("Rate limit wait exceeds request deadline")
                 await asyncio.sleep(sleep_time)
         
         self.rate_limits["request_count"] += 1
@@ -123,7 +133,7 @@ class UpworkIntegration(ExternalIntegration):
             url = f"{self.base_url}/profiles/v1/metadata/categories"
             headers = await self._get_auth_headers()
             
-            async with self.session.get(url, headers=headers) as response:
+            async with self.session.get(url, headers=headers, timeout=self._request_timeout()) as response:
                 return response.status == 200
         except Exception as e:
             logger.error(f"Upwork connection test failed: {str(e)}")
@@ -161,7 +171,7 @@ class UpworkIntegration(ExternalIntegration):
             url = f"{self.base_url}/profiles/v1/search/jobs"
             headers = await self._get_auth_headers()
             
-            async with self.session.get(url, params=params, headers=headers) as response:
+            async with self.session.get(url, params=params, headers=headers, timeout=self._request_timeout()) as response:
                 if response.status == 200:
                     data = await response.json()
                     return self._parse_upwork_jobs(data)
@@ -227,7 +237,7 @@ class FreelancerIntegration(ExternalIntegration):
             url = f"{self.base_url}/projects/0.1/projects"
             headers = {"Authorization": f"Bearer {self.api_key}"}
             
-            async with self.session.get(url, headers=headers) as response:
+            async with self.session.get(url, headers=headers, timeout=self._request_timeout()) as response:
                 return response.status == 200
         except Exception as e:
             logger.error(f"Freelancer connection test failed: {str(e)}")
@@ -255,7 +265,7 @@ class FreelancerIntegration(ExternalIntegration):
             url = f"{self.base_url}/projects/0.1/projects"
             headers = {"Authorization": f"Bearer {self.api_key}"}
             
-            async with self.session.get(url, params=params, headers=headers) as response:
+            async with self.session.get(url, params=params, headers=headers, timeout=self._request_timeout()) as response:
                 if response.status == 200:
                     data = await response.json()
                     return self._parse_freelancer_jobs(data)
@@ -307,7 +317,7 @@ class LinkedInIntegration(ExternalIntegration):
             url = f"{self.base_url}/me"
             headers = {"Authorization": f"Bearer {self.api_key}"}
             
-            async with self.session.get(url, headers=headers) as response:
+            async with self.session.get(url, headers=headers, timeout=self._request_timeout()) as response:
                 return response.status == 200
         except Exception as e:
             logger.error(f"LinkedIn connection test failed: {str(e)}")
@@ -345,7 +355,7 @@ class GoogleScholarIntegration(ExternalIntegration):
                 "num": 1
             }
             
-            async with self.session.get(self.base_url, params=params) as response:
+            async with self.session.get(self.base_url, params=params, timeout=self._request_timeout()) as response:
                 return response.status == 200
         except Exception as e:
             logger.error(f"Google Scholar connection test failed: {str(e)}")
@@ -370,7 +380,7 @@ class GoogleScholarIntegration(ExternalIntegration):
                 if filters.get("year_to"):
                     params["as_yhi"] = filters["year_to"]
             
-            async with self.session.get(self.base_url, params=params) as response:
+            async with self.session.get(self.base_url, params=params, timeout=self._request_timeout()) as response:
                 if response.status == 200:
                     data = await response.json()
                     return self._parse_scholar_results(data)
@@ -443,7 +453,8 @@ class RedditIntegration(ExternalIntegration):
             async with self.session.post(
                 f"{self.base_url}/access_token",
                 data=auth_data,
-                headers=headers
+                headers=headers,
+                timeout=self._request_timeout()
             ) as response:
                 if response.status == 200:
                     token_data = await response.json()
@@ -477,7 +488,7 @@ class RedditIntegration(ExternalIntegration):
                     "User-Agent": "FreelanceX.AI/1.0"
                 }
                 
-                async with self.session.get(search_url, params=params, headers=headers) as response:
+                async with self.session.get(search_url, params=params, headers=headers, timeout=self._request_timeout()) as response:
                     if response.status == 200:
                         data = await response.json()
                         results.extend(self._parse_reddit_results(data, subreddit))
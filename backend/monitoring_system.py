@@ -17,8 +17,8 @@ from collections import defaultdict, deque
 from enum import Enum
 import json
 import smtplib
-from email.mime.text import MimeText
-from email.mime.multipart import MimeMultipart
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
 import subprocess
 
 # Import FreelanceX.AI components
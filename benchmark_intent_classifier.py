@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for the intent classifier
+Single-message and batched classification on a synthetic model and message set
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent
+sys.path.append(str(project_root))
+
+from core.intent_classifier import IntentClassifier, hash_features
+
+TEMPLATES = {
+    'job_search': ["find me a {} gig", "any remote {} jobs this week", "looking for {} freelance work"],
+    'proposal_writing': ["write a proposal for a {} client", "draft a cover letter for the {} position"],
+    'invoicing': ["send an invoice for the {} project", "the {} client has not paid the bill yet"],
+    'market_research': ["what are the {} market trends", "research competition for {} services"],
+    'scheduling': ["book a meeting about the {} work", "put the {} call on my calendar"]
+}
+SKILLS = ['react', 'python', 'design', 'seo', 'copywriting', 'data', 'mobile', 'devops']
+FILLER = "please could you also make sure this gets done soon thanks a lot".split()
+
+
+def make_samples(count: int, seed: int = 0):
+    """Synthetic (text, label) pairs with some filler words"""
+    rng = random.Random(seed)
+    samples = []
+    for _ in range(count):
+        label = rng.choice(list(TEMPLATES))
+        text = rng.choice(TEMPLATES[label]).format(rng.choice(SKILLS))
+        text += ' ' + ' '.join(rng.choice(FILLER) for _ in range(rng.randint(0, 12)))
+        samples.append((text, label))
+    return samples
+
+
+def rate(count: int, seconds: float) -> str:
+    return f"{count / seconds:>10,.0f} msg/s  ({seconds / count * 1e6:.1f} µs/msg)"
+
+
+def main():
+    training = make_samples(5000, seed=0)
+    model = IntentClassifier.train([text for text, _ in training], [label for _, label in training])
+    messages = [text for text, _ in make_samples(1000, seed=1)]
+    print(f"model: {len(model.labels)} labels x {model.n_features} features, "
+          f"{model.get_info()['size_bytes'] / 1024:.0f} KiB")
+
+    # Warm the token hash cache the way a long-running process would be
+    model.classify(messages)
+
+    start = time.perf_counter()
+    for message in messages:
+        model.classify_one(message)
+    print(f"single messages:   {rate(len(messages), time.perf_counter() - start)}")
+
+    for batch_size in (100, 1000):
+        batches = [messages[i:i + batch_size] for i in range(0, len(messages), batch_size)]
+        repeat = 5
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for batch in batches:
+                model.classify(batch)
+        print(f"batches of {batch_size:<5}: {rate(repeat * len(messages), time.perf_counter() - start)}")
+
+    features = hash_features(messages, model.n_features)
+    start = time.perf_counter()
+    for _ in range(20):
+        hash_features(messages, model.n_features)
+    featurize = (time.perf_counter() - start) / 20
+    start = time.perf_counter()
+    for _ in range(20):
+        features @ model.weights + model.bias
+    matmul = (time.perf_counter() - start) / 20
+    print(f"1k batch breakdown: featurize {featurize * 1e3:.2f} ms, matmul {matmul * 1e3:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
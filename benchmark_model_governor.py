@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Load test for the model call governor
+Drives a fake model server that slows down under load and answers 429 past its limit
+"""
+
+import asyncio
+import logging
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent
+sys.path.append(str(project_root))
+
+from core.model_governor import ModelCallGovernor
+
+
+class RateLimitError(Exception):
+    """What the fake server raises instead of HTTP 429"""
+    status_code = 429
+
+    def __init__(self, retry_after: float):
+        super().__init__("rate limited")
+        self.retry_after = retry_after
+
+
+class FakeModelServer:
+    """
+    Stand-in for a model provider
+    Latency is `base_latency` up to `capacity` concurrent requests and grows linearly
+    beyond it; more than `hard_limit` concurrent requests are rejected with a 429.
+    """
+
+    def __init__(self, base_latency: float = 0.05, capacity: int = 6, hard_limit: int = 12,
+                 retry_after: float = 0.2):
+        self.base_latency = base_latency
+        self.capacity = capacity
+        self.hard_limit = hard_limit
+        self.retry_after = retry_after
+        self.active = 0
+        self.peak = 0
+        self.served = 0
+        self.rejected = 0
+
+    async def complete(self, prompt: str) -> str:
+        if self.active >= self.hard_limit:
+            self.rejected += 1
+            raise RateLimitError(self.retry_after)
+
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            overload = max(0, self.active - self.capacity)
+            await asyncio.sleep(self.base_latency * (1 + overload))
+            self.served += 1
+            return f"answer to {prompt}"
+        finally:
+            self.active -= 1
+
+
+async def fire(server: FakeModelServer, governor, count: int, priority: str = 'interactive'):
+    """Send `count` requests at once; returns (completed, failed, per-request latencies)"""
+    latencies = []
+
+    async def one(i: int):
+        start = time.perf_counter()
+        try:
+            if governor is None:
+                await server.complete(f"prompt {i}")
+            else:
+                await governor.run(lambda: server.complete(f"prompt {i}"), priority, tokens=100)
+            latencies.append(time.perf_counter() - start)
+            return True
+        except RateLimitError:
+            return False
+
+    outcomes = await asyncio.gather(*(one(i) for i in range(count)))
+    return sum(outcomes), len(outcomes) - sum(outcomes), sorted(latencies)
+
+
+async def main():
+    logging.basicConfig(level=logging.WARNING)
+    requests = 200
+
+    server = FakeModelServer()
+    start = time.perf_counter()
+    completed, failed, _ = await fire(server, None, requests)
+    print(f"ungoverned: {completed} ok, {failed} 429s, peak {server.peak} concurrent, "
+          f"{time.perf_counter() - start:.2f}s")
+
+    server = FakeModelServer()
+    governor = ModelCallGovernor(initial_limit=32, max_limit=64)
+    start = time.perf_counter()
+    completed, failed, latencies = await fire(server, governor, requests)
+    stats = governor.get_stats()
+    print(f"governed:   {completed} ok, {failed} 429s, peak {server.peak} concurrent, "
+          f"{time.perf_counter() - start:.2f}s, limit settled at {stats['limit']} "
+          f"(p50 {latencies[len(latencies) // 2] * 1e3:.0f} ms)")
+
+    # Interactive calls queued behind a background burst are still served first
+    server = FakeModelServer()
+    governor = ModelCallGovernor(initial_limit=4, max_limit=4)
+    background = asyncio.create_task(fire(server, governor, 100, 'background'))
+    await asyncio.sleep(0.01)
+    await fire(server, governor, 10, 'interactive')
+    await background
+    queue_time = governor.get_stats()['queue_time']
+    print(f"priorities: interactive p95 queue {queue_time['interactive']['p95'] * 1e3:.0f} ms, "
+          f"background p95 queue {queue_time['background']['p95'] * 1e3:.0f} ms")
+
+    # Token budget: 3000 tokens/minute admits 30 calls of 100 tokens at once, the 31st waits 2s
+    server = FakeModelServer()
+    governor = ModelCallGovernor(tokens_per_minute=3000)
+    start = time.perf_counter()
+    await fire(server, governor, 31)
+    print(f"token budget: 31 calls of 100 tokens under 3000/min took {time.perf_counter() - start:.2f}s "
+          f"(expected about 2s)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
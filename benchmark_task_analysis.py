@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for ExecutiveAgent keyword analysis
+Compares the single-pass KeywordMatcher against the previous per-list substring scans
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent
+sys.path.append(str(project_root))
+
+from agents.executive_agent import ExecutiveAgent, SIGNAL_KEYWORDS
+
+FILLER = (
+    "the client needs help with a website backend built on react and node they want someone "
+    "experienced who can deliver quality results within the agreed budget and keep them updated"
+).split()
+
+
+def make_message(words: int, seed: int, density: float) -> str:
+    """Long synthetic message of filler text with roughly `density` of its words being keywords"""
+    rng = random.Random(seed)
+    keywords = [kw for kws in SIGNAL_KEYWORDS.values() for kw in kws] + ['proposal', 'invoice', 'market']
+    return ' '.join(rng.choice(keywords) if rng.random() < density else rng.choice(FILLER) for _ in range(words))
+
+
+def legacy_analysis(agent: ExecutiveAgent, content: str):
+    """The previous analysis: one substring scan per keyword list, as process_task ran it"""
+    lowered = content.lower()
+    best_match, best_confidence = 'general', 0.0
+    for task_type, pattern in agent.task_patterns.items():
+        matches = sum(1 for keyword in pattern['keywords'] if keyword in lowered)
+        if matches and matches / len(pattern['keywords']) > best_confidence:
+            best_match, best_confidence = task_type, matches / len(pattern['keywords'])
+    flags = {
+        group: any(keyword in lowered for keyword in keywords)
+        for group, keywords in SIGNAL_KEYWORDS.items()
+        if not group.startswith(('multi_step', 'step_'))
+    }
+    # _is_multi_step_task and _break_down_task lowercased the raw content for every check
+    flags['multi_step'] = any(keyword in content.lower() for keyword in SIGNAL_KEYWORDS['multi_step'])
+    for group in ('step_planning', 'step_research', 'step_writing', 'step_review'):
+        flags[group] = any(keyword in content.lower() for keyword in SIGNAL_KEYWORDS[group])
+    return best_match, best_confidence, flags
+
+
+def single_pass_analysis(agent: ExecutiveAgent, content: str):
+    """The current analysis: one KeywordMatcher scan, everything derived from its hits"""
+    hits = agent.keyword_matcher.scan(content)
+    task_type, confidence = agent._detect_task_type_by_keywords(hits)
+    return (
+        task_type,
+        confidence,
+        agent._determine_priority(hits, task_type),
+        agent._analyze_urgency(hits),
+        agent._extract_required_capabilities(hits, task_type),
+        'multi_step' in hits,
+        [group for group in ('step_planning', 'step_research', 'step_writing', 'step_review') if group in hits]
+    )
+
+
+def bench(fn, agent, messages, repeat: int) -> float:
+    """Mean microseconds per message"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for message in messages:
+            fn(agent, message)
+    return (time.perf_counter() - start) / (repeat * len(messages)) * 1e6
+
+
+def main():
+    agent = ExecutiveAgent(agent_manager=None, memory_manager=None, config=None)
+
+    print(f"{'density':>8} {'words':>8} {'chars':>8} {'legacy µs':>12} {'single-pass µs':>16} {'speedup':>9}")
+    for density in (0.02, 0.001):
+        for words in (20, 200, 2000, 20000):
+            messages = [make_message(words, seed, density) for seed in range(10)]
+            repeat = max(1, 20000 // words)
+            legacy = bench(legacy_analysis, agent, messages, repeat)
+            single = bench(single_pass_analysis, agent, messages, repeat)
+            chars = sum(len(message) for message in messages) // len(messages)
+            print(f"{density:>8} {words:>8} {chars:>8} {legacy:>12.1f} {single:>16.1f} {legacy / single:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
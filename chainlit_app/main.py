@@ -26,6 +26,8 @@ sys.path.append(str(project_root))
 
 from core.executive_agent import ExecutiveAgent
 from core.agent_manager import AgentManager
+from core.config import Config
+from core.intent_classifier import get_configured_intent_classifier
 from backend.database import DatabaseManager
 from chainlit_app.dashboard_widgets import DashboardManager
 from agents.job_search_agent import JobSearchAgent
@@ -47,6 +49,16 @@ job_search_agent = JobSearchAgent()
 web_search_agent = WebSearchAgent()
 math_agent = MathAgent()
 
+# Configuration from agent.yaml, loaded on first use
+config = Config()
+
+INTENT_ROUTES = {
+    'job_search': job_search_agent,
+    'market_research': web_search_agent,
+    'financial_analysis': math_agent,
+    'invoicing': math_agent
+}
+
 # Register agents with the manager
 agent_manager.register_agent(job_search_agent)
 agent_manager.register_agent(web_search_agent)
@@ -310,6 +322,21 @@ async def calculate_rates_action(action):
         logger.error(f"Error in rate calculation: {str(e)}")
         await cl.Message(content="Failed to calculate rates. Please try again.").send()
 
+@cl.action_callback("negotiate_rate")
+async def negotiate_rate_action(action):
+    """Handle negotiation tips action"""
+    try:
+        # Standalone prompt with no chat history, so repeats are answered from the response cache
+        skill = user_context.get("primary_skill", "freelance")
+        tips = await executive_agent.ask(
+            f"Give me practical strategies for negotiating a higher rate as a {skill} freelancer"
+        )
+        await cl.Message(content=f"💬 **Negotiation Tips:**\n\n{tips}").send()
+
+    except Exception as e:
+        logger.error(f"Error in negotiation tips: {str(e)}")
+        await cl.Message(content="Failed to fetch negotiation tips. Please try again.").send()
+
 @cl.action_callback("show_dashboard")
 async def show_dashboard_action(action):
     """Handle dashboard display action"""
@@ -383,9 +410,25 @@ async def handle_image_input(image_element, text_context: str) -> str:
         logger.error(f"Image processing error: {str(e)}")
         return "Error processing the image. Please try uploading again."
 
+async def get_intent_model():
+    """
+    Trained intent model at the configured system.intent_model_path, the same one
+    ExecutiveAgent loads (None until train_intent_classifier.py has produced one)
+    """
+    if config.system_config is None:
+        await config.load()
+    return get_configured_intent_classifier(config)
+
 async def route_text_message(content: str) -> str:
     """Intelligently route text messages to appropriate agents"""
     try:
+        # Route by the intent model when it is confident
+        intent_classifier = await get_intent_model()
+        if intent_classifier is not None:
+            task_type, _ = intent_classifier.classify_one(content)
+            if task_type in INTENT_ROUTES:
+                return await INTENT_ROUTES[task_type].process_message(content)
+        
         content_lower = content.lower()
         
         # Job search routing
@@ -115,6 +115,8 @@ class AgentConfig:
     fallback_model: str = "gpt-3.5-turbo"
     max_tokens: int = 4000
     temperature: float = 0.7
+    # Agents constructed at startup; the others are built on first dispatch
+    eager_agents: List[str] = field(default_factory=lambda: ["proposal_writer", "job_search"])
 
 class FreelanceXConfig:
     """Main configuration class for FreelanceX.AI"""
@@ -4,18 +4,35 @@ Manages agent registration, lifecycle, and coordination
 """
 
 import asyncio
+import itertools
 import logging
-from typing import Dict, List, Optional, Any
+import time
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Any, Callable, Awaitable, AsyncIterator
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
 from datetime import datetime
 import uuid
 
 from openai_agents import Agent, Session
 from openai import OpenAI
 
+from .latency import LatencyTracker
+from .deadline import deadline_scope, get_deadline, partial_result_scope, time_remaining
+from .execution_lanes import ExecutionLane, ProcessLane, task_handler
+from .result_cache import TaskResultCache, task_cache_key
+from .message_bus import MessageBus
+
 logger = logging.getLogger(__name__)
 
+class AdmissionRejected(Exception):
+    """Raised by AgentManager.run_admitted when admission control sheds the work"""
+    
+    def __init__(self, rejection: Dict[str, Any]):
+        super().__init__(rejection['error'])
+        self.rejection = rejection
+
 @dataclass
 class AgentStatus:
     """Status information for an agent"""
@@ -25,7 +42,86 @@ class AgentStatus:
     last_activity: datetime
     task_count: int
     error_count: int
-    avg_response_time: float
+    avg_response_time: float  # EWMA of latency
+    p95_response_time: float = 0.0
+    p99_response_time: float = 0.0
+    in_flight: int = 0
+    timeout_count: int = 0
+
+class AgentBulkhead:
+    """
+    Per-agent concurrency limit with its own wait queue
+    Keeps a slow or saturated agent from holding execution slots other agents need
+    """
+    
+    def __init__(self, agent_id: str, limit: int, max_queued: int = 100):
+        self.agent_id = agent_id
+        self.limit = limit
+        self.semaphore = asyncio.Semaphore(limit)
+        # Entries are (priority rank, sequence, task) so higher classes are served first
+        self.queue = asyncio.PriorityQueue(maxsize=max_queued)
+        self.workers: List[asyncio.Task] = []
+        self.in_flight = 0
+        self.waiting = 0
+        self.completed = 0
+        
+        # Everything waiting for this agent, in the queue or on the semaphore
+        self.sequence = itertools.count()
+        self.pending: Dict[int, tuple] = {}  # ticket -> (priority class, monotonic enqueue time)
+        self.pending_by_class: Dict[str, int] = {}
+        self.dequeued = 0
+        self.total_queue_time = 0.0
+        self.max_queue_time = 0.0
+    
+    @property
+    def depth(self) -> int:
+        """Number of tasks waiting to run"""
+        return len(self.pending)
+    
+    def enter_queue(self, priority_class: str) -> int:
+        """Record a task starting to wait; returns a ticket for leave_queue"""
+        ticket = next(self.sequence)
+        self.pending[ticket] = (priority_class, time.monotonic())
+        self.pending_by_class[priority_class] = self.pending_by_class.get(priority_class, 0) + 1
+        return ticket
+    
+    def leave_queue(self, ticket: int) -> float:
+        """Record a task done waiting; returns how long it waited"""
+        priority_class, enqueued_at = self.pending.pop(ticket)
+        self.pending_by_class[priority_class] -= 1
+        waited = time.monotonic() - enqueued_at
+        self.dequeued += 1
+        self.total_queue_time += waited
+        self.max_queue_time = max(self.max_queue_time, waited)
+        return waited
+    
+    def oldest_queue_age(self) -> float:
+        """Seconds the longest-waiting task has been queued"""
+        if not self.pending:
+            return 0.0
+        return time.monotonic() - min(enqueued_at for _, enqueued_at in self.pending.values())
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Return bulkhead occupancy statistics"""
+        return {
+            'limit': self.limit,
+            'in_flight': self.in_flight,
+            'waiting': self.waiting,
+            'queued': self.queue.qsize(),
+            'queued_by_class': dict(self.pending_by_class),
+            'oldest_queue_age': self.oldest_queue_age(),
+            'avg_queue_time': self.total_queue_time / self.dequeued if self.dequeued else 0.0,
+            'max_queue_time': self.max_queue_time,
+            'completed': self.completed
+        }
+
+@dataclass
+class LazyAgentSpec:
+    """Agent that is constructed and registered on first dispatch"""
+    agent_id: str
+    factory: Callable[[], Any]
+    capabilities: List[str] = field(default_factory=list)
+    task_types: List[str] = field(default_factory=list)
 
 # BaseAgent is now imported from base_agent.py - keeping this for backward compatibility
 class BaseAgent(ABC):
@@ -34,6 +130,22 @@ class BaseAgent(ABC):
     Provides common functionality and interface
     """
     
+    # Agents that can handle several tasks in one call set supports_batch
+    # and override process_batch
+    supports_batch = False
+    max_batch_size = 1
+    
+    # Per-agent concurrency limit; None uses the agent config or manager default
+    max_concurrency: Optional[int] = None
+    
+    # CPU-bound agents set execution_lane = 'cpu', or list only their heavy task
+    # types in cpu_bound_task_types, to run them in the process-pool lane
+    execution_lane = 'default'
+    cpu_bound_task_types: frozenset = frozenset()
+    
+    # Result cache TTLs in seconds by task type ('*' for any type); empty disables caching
+    cache_ttls: Mapping[str, float] = MappingProxyType({})
+    
     def __init__(self, agent_id: str, name: str, description: str):
         self.agent_id = agent_id
         self.name = name
@@ -41,7 +153,8 @@ class BaseAgent(ABC):
         self.status = 'idle'
         self.task_count = 0
         self.error_count = 0
-        self.response_times = []
+        self.timeout_count = 0
+        self.latency = LatencyTracker()
         self.last_activity = datetime.now()
         self.tools = {}
         self.memory = {}
@@ -56,6 +169,10 @@ class BaseAgent(ABC):
         """Return list of agent capabilities"""
         pass
     
+    async def process_batch(self, tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Process a list of tasks and return results in the same order"""
+        return [await self.process_task(task_data) for task_data in tasks]
+    
     async def initialize(self):
         """Initialize agent resources"""
         try:
@@ -78,17 +195,29 @@ class BaseAgent(ABC):
     
     def get_status(self) -> AgentStatus:
         """Get current agent status"""
-        avg_response_time = sum(self.response_times) / len(self.response_times) if self.response_times else 0
+        # 'busy' is derived from in-flight work so concurrent tasks can't clobber it
+        status = self.status
+        if status == 'idle' and self.latency.in_flight > 0:
+            status = 'busy'
+        
         return AgentStatus(
             agent_id=self.agent_id,
             name=self.name,
-            status=self.status,
+            status=status,
             last_activity=self.last_activity,
             task_count=self.task_count,
             error_count=self.error_count,
-            avg_response_time=avg_response_time
+            avg_response_time=self.latency.ewma,
+            p95_response_time=self.latency.p95,
+            p99_response_time=self.latency.p99,
+            in_flight=self.latency.in_flight,
+            timeout_count=self.timeout_count
         )
     
+    def is_cacheable(self, task_data: Dict[str, Any]) -> bool:
+        """Whether a task's result may be cached; override to exclude tasks"""
+        return task_data.get('cacheable', True)
+    
     def add_tool(self, tool_name: str, tool_func):
         """Add a tool to the agent"""
         self.tools[tool_name] = tool_func
@@ -98,6 +227,57 @@ class BaseAgent(ABC):
         """Check if agent has specific capability"""
         return capability in self.get_capabilities()
 
+class ManagedAgent(BaseAgent):
+    """
+    Adapter for agents built on core.base_agent.BaseAgent
+    Gives them the manager's interface (ID, lifecycle, status and latency tracking)
+    and runs their tasks through execute_task
+    """
+    
+    # Scheduling declarations taken over from the wrapped agent's class
+    FORWARDED_ATTRIBUTES = ('execution_lane', 'cpu_bound_task_types', 'max_concurrency', 'cache_ttls')
+    
+    def __init__(self, agent: Any, agent_id: Optional[str] = None):
+        super().__init__(agent_id or agent.agent_name, agent.agent_name, agent.agent_type)
+        self.wrapped_agent = agent
+        for attribute in self.FORWARDED_ATTRIBUTES:
+            if hasattr(agent, attribute):
+                setattr(self, attribute, getattr(agent, attribute))
+        if hasattr(agent, 'stream_task'):
+            self.stream_task = agent.stream_task
+    
+    @property
+    def agent_name(self) -> str:
+        """Name the wrapped agent uses on the message bus"""
+        return self.wrapped_agent.agent_name
+    
+    async def process_task(self, task_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Run the task through the wrapped agent"""
+        return await self.wrapped_agent.execute_task(task_data)
+    
+    def get_capabilities(self) -> List[str]:
+        """Capabilities of the wrapped agent, if it declares any"""
+        get_capabilities = getattr(self.wrapped_agent, 'get_capabilities', None)
+        return get_capabilities() if get_capabilities is not None else []
+    
+    def attach_message_bus(self, message_bus):
+        """Connect the wrapped agent to the message bus"""
+        self.wrapped_agent.attach_message_bus(message_bus)
+    
+    def attach_memory_backend(self, memory_manager):
+        """Spill the wrapped agent's memory and sessions to the memory database"""
+        self.wrapped_agent.attach_memory_backend(memory_manager)
+    
+    async def run(self):
+        """Run the wrapped agent's message loop"""
+        await self.wrapped_agent.run()
+
+def as_managed_agent(agent: Any, agent_id: Optional[str] = None) -> BaseAgent:
+    """Return an agent in the manager's interface, wrapping core.base_agent agents"""
+    if isinstance(agent, BaseAgent):
+        return agent
+    return ManagedAgent(agent, agent_id)
+
 class AgentManager:
     """
     Central manager for all FreelanceX.AI agents with OpenAI Agent SDK integration
@@ -105,13 +285,56 @@ class AgentManager:
     Integrates with OpenAI Agent SDK for enhanced agent capabilities
     """
     
-    def __init__(self, memory_manager=None):
+    # Priority classes by minimum task priority (1-10), highest first
+    PRIORITY_CLASSES = (('high', 8), ('normal', 4), ('low', 0))
+    
+    def __init__(self, memory_manager=None, config=None):
         self.agents: Dict[str, BaseAgent] = {}
         self.agent_status: Dict[str, AgentStatus] = {}
-        self.task_queue = asyncio.Queue()
         self.running = False
+        self.config = config
         self.max_concurrent_tasks = 10
-        self.active_tasks = 0
+        self.default_agent_concurrency = 4
+        self.default_task_timeout = float(config.get_system_setting('task_timeout', 300)) if config else 300.0
+        self.bulkheads: Dict[str, AgentBulkhead] = {}
+        self._task_slots = asyncio.Semaphore(self.max_concurrent_tasks)
+        self._active_futures: set = set()
+        
+        # Admission control per priority class: an agent's queue depth and estimated
+        # wait must stay under these bounds, so low-priority work is shed first
+        self.admission_limits = {
+            'high': {'max_queued': 100, 'max_wait': 60.0},
+            'normal': {'max_queued': 50, 'max_wait': 20.0},
+            'low': {'max_queued': 10, 'max_wait': 5.0}
+        }
+        self.default_service_time = 1.0  # seconds, assumed for agents without latency history
+        self.admission_metrics = {
+            'admitted': 0,
+            'shed': {priority_class: 0 for priority_class, _ in self.PRIORITY_CLASSES},
+            'shed_reasons': {'queue_full': 0, 'wait_exceeds_limit': 0, 'deadline': 0}
+        }
+        
+        # Results of identical tasks, for agents that declare cache TTLs
+        self.result_cache_enabled = True
+        self.result_cache = TaskResultCache()
+        
+        # Agent-to-agent messaging; agents with mailboxes get a message loop while running
+        self.message_bus = MessageBus()
+        self._message_loops: Dict[str, asyncio.Task] = {}
+        self.negotiations: Dict[str, Dict[str, Any]] = {}
+        self.max_negotiation_history = 1000
+        self._negotiation_tasks: set = set()
+        
+        # Agents deferred until first use, and their in-progress loads
+        self.lazy_agents: Dict[str, LazyAgentSpec] = {}
+        self._lazy_loads: Dict[str, asyncio.Task] = {}
+        
+        # Execution lanes: 'default' runs on the event loop, 'cpu' in a process pool
+        cpu_workers = config.get_system_setting('cpu_workers', None) if config else None
+        self.lanes: Dict[str, ExecutionLane] = {
+            'default': ExecutionLane('default'),
+            'cpu': ProcessLane('cpu', max_workers=cpu_workers)
+        }
         
         # OpenAI Agent SDK integration
         self.memory_manager = memory_manager
@@ -120,7 +343,8 @@ class AgentManager:
         logger.info("🎯 AgentManager initialized with OpenAI Agent SDK integration")
         
     async def register_agent(self, agent: BaseAgent) -> bool:
-        """Register a new agent"""
+        """Register a new agent; core.base_agent agents are wrapped in a ManagedAgent"""
+        agent = as_managed_agent(agent)
         try:
             if agent.agent_id in self.agents:
                 logger.warning(f"⚠️ Agent {agent.name} already registered")
@@ -133,7 +357,27 @@ class AgentManager:
             self.agents[agent.agent_id] = agent
             self.agent_status[agent.agent_id] = agent.get_status()
             
-            logger.info(f"📋 Registered agent: {agent.name} (ID: {agent.agent_id})")
+            if self._uses_cpu_lane(agent):
+                self.lanes['cpu'].add_agent(agent)
+            
+            if hasattr(agent, 'attach_memory_backend') and self.memory_manager is not None:
+                agent.attach_memory_backend(self.memory_manager)
+            
+            if hasattr(agent, 'attach_message_bus'):
+                agent.attach_message_bus(self.message_bus)
+                if self.running:
+                    self._start_message_loop(agent)
+            
+            bulkhead = AgentBulkhead(
+                agent.agent_id,
+                self._resolve_concurrency_limit(agent),
+                max(limits['max_queued'] for limits in self.admission_limits.values())
+            )
+            self.bulkheads[agent.agent_id] = bulkhead
+            if self.running:
+                self._start_workers(bulkhead)
+            
+            logger.info(f"📋 Registered agent: {agent.name} (ID: {agent.agent_id}, concurrency: {bulkhead.limit})")
             return True
             
         except Exception as e:
@@ -149,6 +393,12 @@ class AgentManager:
             
             agent = self.agents[agent_id]
             await agent.shutdown()
+            await self._stop_message_loop(agent_id)
+            self.message_bus.unregister(self._bus_address(agent))
+            
+            bulkhead = self.bulkheads.pop(agent_id, None)
+            if bulkhead:
+                await self._stop_workers(bulkhead)
             
             del self.agents[agent_id]
             del self.agent_status[agent_id]
@@ -160,16 +410,94 @@ class AgentManager:
             logger.error(f"❌ Failed to unregister agent {agent_id}: {str(e)}")
             return False
     
+    def register_lazy_agent(self, agent_id: str, factory: Callable[[], Any],
+                            capabilities: Optional[List[str]] = None,
+                            task_types: Optional[List[str]] = None):
+        """
+        Register an agent to be constructed on first dispatch
+        
+        Args:
+            agent_id: ID the constructed agent is registered under
+            factory: Zero-argument callable returning the agent; runs in a worker thread
+            capabilities: Capabilities the agent will provide, used to route to it before it exists
+            task_types: Task types the agent serves, used the same way
+        """
+        if agent_id in self.agents or agent_id in self.lazy_agents:
+            logger.warning(f"⚠️ Agent {agent_id} already registered")
+            return
+        
+        self.lazy_agents[agent_id] = LazyAgentSpec(agent_id, factory, capabilities or [], task_types or [])
+        logger.info(f"💤 Deferred agent: {agent_id} (loads on first dispatch)")
+    
+    async def load_lazy_agent(self, agent_id: str) -> Optional[BaseAgent]:
+        """Construct and register a deferred agent; concurrent callers share one load"""
+        if agent_id in self.agents:
+            return self.agents[agent_id]
+        if agent_id not in self.lazy_agents:
+            return None
+        
+        load = self._lazy_loads.get(agent_id)
+        if load is None:
+            load = asyncio.create_task(self._load_lazy_agent(self.lazy_agents[agent_id]))
+            self._lazy_loads[agent_id] = load
+        return await asyncio.shield(load)
+    
+    async def load_lazy_agents(self, task_type: Optional[str] = None,
+                               capabilities: Optional[List[str]] = None) -> List[BaseAgent]:
+        """Load the deferred agents that declare the task type or all the capabilities"""
+        matching = [
+            spec.agent_id for spec in self.lazy_agents.values()
+            if (task_type and task_type in spec.task_types)
+            or (capabilities and all(cap in spec.capabilities for cap in capabilities))
+        ]
+        if not matching:
+            return []
+        
+        agents = await asyncio.gather(*(self.load_lazy_agent(agent_id) for agent_id in matching))
+        return [agent for agent in agents if agent is not None]
+    
+    async def _load_lazy_agent(self, spec: LazyAgentSpec) -> Optional[BaseAgent]:
+        """Build a deferred agent off the event loop, then register it"""
+        try:
+            start_time = time.perf_counter()
+            agent = as_managed_agent(await asyncio.to_thread(spec.factory), spec.agent_id)
+            construct_time = time.perf_counter() - start_time
+            
+            # Register under the declared ID so routing and lookups agree
+            if getattr(agent, 'agent_id', None) != spec.agent_id:
+                if getattr(agent, 'agent_id', None) is not None:
+                    logger.warning(f"⚠️ Deferred agent {spec.agent_id} built with ID {agent.agent_id}, re-keying")
+                agent.agent_id = spec.agent_id
+            
+            registered = await self.register_agent(agent)
+            total_time = time.perf_counter() - start_time
+            logger.info(f"⏱️ Loaded deferred agent {spec.agent_id}: construct {construct_time:.2f}s, "
+                        f"initialize {total_time - construct_time:.2f}s, total {total_time:.2f}s")
+            return agent if registered else None
+            
+        except Exception as e:
+            logger.error(f"❌ Failed to load deferred agent {spec.agent_id}: {str(e)}")
+            return None
+        
+        finally:
+            self.lazy_agents.pop(spec.agent_id, None)
+            self._lazy_loads.pop(spec.agent_id, None)
+    
     async def get_agent(self, agent_id: str) -> Optional[BaseAgent]:
-        """Get agent by ID"""
-        return self.agents.get(agent_id)
+        """Get agent by ID, loading it if it was deferred"""
+        agent = self.agents.get(agent_id)
+        if agent is None and agent_id in self.lazy_agents:
+            agent = await self.load_lazy_agent(agent_id)
+        return agent
     
     async def get_agent_by_capability(self, capability: str) -> Optional[BaseAgent]:
         """Find agent with specific capability"""
         for agent in self.agents.values():
             if agent.has_capability(capability) and agent.status != 'disabled':
                 return agent
-        return None
+        
+        loaded = await self.load_lazy_agents(capabilities=[capability])
+        return loaded[0] if loaded else None
     
     async def get_agent_by_name(self, name: str) -> Optional[BaseAgent]:
         """Find agent by name"""
@@ -178,40 +506,315 @@ class AgentManager:
                 return agent
         return None
     
-    async def execute_task(self, agent_id: str, task_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute a task with a specific agent"""
+    def _resolve_concurrency_limit(self, agent: BaseAgent) -> int:
+        """Concurrency limit for an agent: agent attribute, then agent config, then default"""
+        limit = agent.max_concurrency
+        if limit is None and self.config is not None:
+            agent_config = self.config.get_agent_config(agent.agent_id)
+            if agent_config is not None:
+                limit = agent_config.max_concurrency
+        if limit is None:
+            limit = self.default_agent_concurrency
+        return max(1, min(int(limit), self.max_concurrent_tasks))
+    
+    def _uses_cpu_lane(self, agent: Any) -> bool:
+        """Whether any of an agent's work runs in the process-pool lane"""
+        return getattr(agent, 'execution_lane', 'default') == 'cpu' or bool(getattr(agent, 'cpu_bound_task_types', None))
+    
+    def _select_lane(self, agent: Any, task_data: Dict[str, Any]) -> ExecutionLane:
+        """Pick the execution lane for a task from the agent's declarations"""
+        lane_name = getattr(agent, 'execution_lane', 'default')
+        task_type = task_data.get('type') or task_data.get('task_type')
+        if task_type in getattr(agent, 'cpu_bound_task_types', ()):
+            lane_name = 'cpu'
+        return self.lanes.get(lane_name, self.lanes['default'])
+    
+    @asynccontextmanager
+    async def _execution_slot(self, agent_id: str, priority_class: str = 'normal', ticket: Optional[int] = None):
+        """
+        Hold one slot of the agent's bulkhead and one global slot
+        
+        `ticket` is a queue entry already taken at admission; otherwise one is taken here.
+        """
+        bulkhead = self.bulkheads[agent_id]
+        if ticket is None:
+            ticket = bulkhead.enter_queue(priority_class)
+        
+        # Wait on the agent's own semaphore first so a saturated agent never holds global slots
+        bulkhead.waiting += 1
         try:
-            agent = await self.get_agent(agent_id)
-            if not agent:
-                return {
-                    'success': False,
-                    'error': f'Agent {agent_id} not found'
-                }
-            
-            if agent.status == 'disabled':
+            await bulkhead.semaphore.acquire()
+        finally:
+            bulkhead.waiting -= 1
+            bulkhead.leave_queue(ticket)
+        
+        try:
+            async with self._task_slots:
+                bulkhead.in_flight += 1
+                try:
+                    yield
+                finally:
+                    bulkhead.in_flight -= 1
+                    bulkhead.completed += 1
+        finally:
+            bulkhead.semaphore.release()
+    
+    def _priority_class(self, priority: Any) -> str:
+        """Map a task priority (1-10) to its priority class"""
+        try:
+            priority = int(priority)
+        except (TypeError, ValueError):
+            priority = 5
+        for priority_class, min_priority in self.PRIORITY_CLASSES:
+            if priority >= min_priority:
+                return priority_class
+        return self.PRIORITY_CLASSES[-1][0]
+    
+    def estimate_wait(self, agent_id: str) -> float:
+        """Estimated seconds a new task would wait for one of the agent's slots"""
+        bulkhead = self.bulkheads.get(agent_id)
+        agent = self.agents.get(agent_id)
+        if bulkhead is None or agent is None:
+            return 0.0
+        
+        free_slots = bulkhead.limit - bulkhead.in_flight
+        if bulkhead.depth < free_slots:
+            return 0.0
+        
+        service_time = agent.latency.ewma if agent.latency.count else self.default_service_time
+        return (bulkhead.depth - free_slots + 1) / bulkhead.limit * service_time
+    
+    def check_admission(self, agent_id: str, priority: Any = 5, budget: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Admission control by queue depth and estimated wait
+        
+        Args:
+            agent_id: Agent the task is for
+            priority: Task priority (1-10)
+            budget: Seconds the caller can wait at most; the current deadline also applies
+        
+        Returns:
+            An overloaded result when the task should be shed, None when it is admitted
+        """
+        bulkhead = self.bulkheads.get(agent_id)
+        if bulkhead is None:
+            return None
+        
+        priority_class = self._priority_class(priority)
+        limits = self.admission_limits[priority_class]
+        estimated_wait = self.estimate_wait(agent_id)
+        remaining = time_remaining(budget)
+        
+        if bulkhead.depth >= limits['max_queued']:
+            reason = 'queue_full'
+        elif estimated_wait > limits['max_wait']:
+            reason = 'wait_exceeds_limit'
+        elif remaining is not None and estimated_wait > remaining:
+            reason = 'deadline'
+        else:
+            self.admission_metrics['admitted'] += 1
+            return None
+        
+        self.admission_metrics['shed'][priority_class] += 1
+        self.admission_metrics['shed_reasons'][reason] += 1
+        retry_after = max(1.0, estimated_wait)
+        
+        logger.warning(f"⚠️ Shed {priority_class} priority task for {agent_id}: {reason} "
+                       f"(depth {bulkhead.depth}, estimated wait {estimated_wait:.2f}s)")
+        return {
+            'success': False,
+            'overloaded': True,
+            'reason': reason,
+            'priority_class': priority_class,
+            'estimated_wait': estimated_wait,
+            'retry_after': retry_after,
+            'error': f'Agent {agent_id} is overloaded, retry after {retry_after:.0f}s',
+            'agent_id': agent_id
+        }
+    
+    def _resolve_timeout(self, task_data: Dict[str, Any], timeout: Optional[float]) -> float:
+        """Effective timeout: explicit argument, then task_data['timeout'], then the default"""
+        if timeout is None:
+            timeout = task_data.get('timeout')
+        if timeout is None:
+            timeout = self.default_task_timeout
+        return float(timeout)
+    
+    def _timeout_result(self, agent: BaseAgent, timeout: float, elapsed: float, partial: Dict[str, Any]) -> Dict[str, Any]:
+        """Record a timed-out task and build its result"""
+        agent.timeout_count += 1
+        agent.error_count += 1
+        agent.latency.record(elapsed)
+        self.agent_status[agent.agent_id] = agent.get_status()
+        
+        logger.warning(f"⏱️ Task on {agent.name} timed out after {elapsed:.2f}s (timeout {timeout:.2f}s)")
+        return {
+            'success': False,
+            'timed_out': True,
+            'error': f'Task timed out after {elapsed:.2f}s',
+            'partial_result': partial.get('result'),
+            'agent_id': agent.agent_id,
+            'response_time': elapsed
+        }
+    
+    async def execute_task(self, agent_id: str, task_data: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Execute a task with a specific agent
+        
+        The task runs under a deadline (the tighter of `timeout`, task_data['timeout'],
+        the default task timeout and any deadline inherited from the caller's context).
+        When it passes, the task is cancelled and a timeout result is returned.
+        """
+        agent = await self.get_agent(agent_id)
+        if not agent:
+            return {
+                'success': False,
+                'error': f'Agent {agent_id} not found'
+            }
+        
+        if agent.status == 'disabled':
+            return {
+                'success': False,
+                'error': f'Agent {agent.name} is disabled'
+            }
+        
+        timeout = self._resolve_timeout(task_data, timeout)
+        ttl = self._cache_ttl(agent, task_data)
+        if not ttl:
+            return await self._admit_and_execute(agent, task_data, timeout)
+        
+        # Identical tasks are served from the cache or share one in-flight execution
+        start_time = time.perf_counter()
+        with deadline_scope(timeout):
+            try:
+                return await self.result_cache.get_or_run(
+                    task_cache_key(agent_id, task_data),
+                    ttl,
+                    lambda: self._admit_and_execute(agent, task_data, timeout),
+                    self._is_cacheable_result
+                )
+            except asyncio.TimeoutError:
+                elapsed = time.perf_counter() - start_time
                 return {
                     'success': False,
-                    'error': f'Agent {agent.name} is disabled'
+                    'timed_out': True,
+                    'error': f'Task timed out after {elapsed:.2f}s waiting on a shared execution',
+                    'agent_id': agent_id,
+                    'response_time': elapsed
                 }
-            
-            # Update agent status
-            agent.status = 'busy'
+    
+    async def _admit_and_execute(self, agent: BaseAgent, task_data: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """Run admission control, then execute the task"""
+        rejection = self.check_admission(agent.agent_id, task_data.get('priority', 5), timeout)
+        if rejection:
+            return rejection
+        
+        # Count the task as queued right away so a burst can't all pass admission at once
+        ticket = self.bulkheads[agent.agent_id].enter_queue(self._priority_class(task_data.get('priority', 5)))
+        return await self._execute_admitted(agent, task_data, timeout, ticket)
+    
+    def _cache_ttl(self, agent: BaseAgent, task_data: Dict[str, Any]) -> float:
+        """Result cache TTL for a task, 0 when it must not be cached"""
+        ttls = getattr(agent, 'cache_ttls', None)
+        if not self.result_cache_enabled or not ttls:
+            return 0
+        
+        is_cacheable = getattr(agent, 'is_cacheable', None)
+        if is_cacheable is not None and not is_cacheable(task_data):
+            return 0
+        
+        task_type = task_data.get('type') or task_data.get('task_type')
+        return ttls.get(task_type, ttls.get('*', 0))
+    
+    def _is_cacheable_result(self, result: Dict[str, Any]) -> bool:
+        """Only successful results are cached, including the agent's own success flag"""
+        if not result.get('success'):
+            return False
+        inner = result.get('result')
+        return not (isinstance(inner, dict) and inner.get('success') is False)
+    
+    async def _execute_admitted(self, agent: BaseAgent, task_data: Dict[str, Any],
+                                timeout: Optional[float] = None, ticket: Optional[int] = None) -> Dict[str, Any]:
+        """Execute a task that has passed admission control under its deadline"""
+        timeout = self._resolve_timeout(task_data, timeout)
+        start_time = time.perf_counter()
+        
+        with deadline_scope(timeout), partial_result_scope() as partial:
+            try:
+                return await asyncio.wait_for(self._execute_in_slot(agent, task_data, ticket), time_remaining())
+            except asyncio.TimeoutError:
+                return self._timeout_result(agent, timeout, time.perf_counter() - start_time, partial)
+            finally:
+                # Release the queue entry if the task never reached a slot
+                bulkhead = self.bulkheads.get(agent.agent_id)
+                if ticket is not None and bulkhead is not None and ticket in bulkhead.pending:
+                    bulkhead.leave_queue(ticket)
+    
+    async def run_admitted(self, agent_id: str, call: Callable[[], Awaitable[Any]], priority: Any = 5,
+                           timeout: Optional[float] = None) -> Any:
+        """
+        Run work on an agent that bypasses execute_task (e.g. a direct agent action)
+        
+        The work goes through the same admission control, bulkhead slot and deadline
+        as a task, so it counts toward the queue depth and in-flight figures that
+        admission decisions are based on.
+        
+        Raises:
+            AdmissionRejected: The work was shed; `rejection` holds the overloaded result
+            asyncio.TimeoutError: The deadline passed before the work finished
+        """
+        timeout = self._resolve_timeout({}, timeout)
+        rejection = self.check_admission(agent_id, priority, timeout)
+        if rejection:
+            raise AdmissionRejected(rejection)
+        
+        if agent_id not in self.bulkheads:
+            # Not registered through register_agent: nothing to queue on
+            with deadline_scope(timeout):
+                return await asyncio.wait_for(call(), time_remaining())
+        
+        priority_class = self._priority_class(priority)
+        ticket = self.bulkheads[agent_id].enter_queue(priority_class)
+        with deadline_scope(timeout):
+            try:
+                return await asyncio.wait_for(self._run_in_slot(agent_id, call, priority_class, ticket), time_remaining())
+            finally:
+                bulkhead = self.bulkheads.get(agent_id)
+                if bulkhead is not None and ticket in bulkhead.pending:
+                    bulkhead.leave_queue(ticket)
+    
+    async def _run_in_slot(self, agent_id: str, call: Callable[[], Awaitable[Any]],
+                           priority_class: str, ticket: int) -> Any:
+        """Wait for an execution slot, then run the work"""
+        async with self._execution_slot(agent_id, priority_class, ticket):
+            return await call()
+    
+    async def _execute_in_slot(self, agent: BaseAgent, task_data: Dict[str, Any], ticket: Optional[int] = None) -> Dict[str, Any]:
+        """Wait for an execution slot, then run the task"""
+        priority_class = self._priority_class(task_data.get('priority', 5))
+        async with self._execution_slot(agent.agent_id, priority_class, ticket):
+            return await self._run_task(agent, task_data)
+    
+    async def _run_task(self, agent: BaseAgent, task_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Run a task on an agent and record its metrics"""
+        agent_id = agent.agent_id
+        started = False
+        try:
             agent.last_activity = datetime.now()
-            start_time = datetime.now()
+            agent.latency.start()
+            started = True
+            start_time = time.perf_counter()
             
-            # Execute task
-            result = await agent.process_task(task_data)
+            # Execute task in its lane
+            result = await self._select_lane(agent, task_data).run_task(agent, task_data)
             
             # Update metrics
-            end_time = datetime.now()
-            response_time = (end_time - start_time).total_seconds()
-            agent.response_times.append(response_time)
+            response_time = time.perf_counter() - start_time
+            agent.latency.finish(response_time)
+            started = False
             agent.task_count += 1
-            agent.status = 'idle'
-            
-            # Keep only last 100 response times for average calculation
-            if len(agent.response_times) > 100:
-                agent.response_times = agent.response_times[-100:]
+            if agent.status == 'error':
+                agent.status = 'idle'
             
             # Update status
             self.agent_status[agent_id] = agent.get_status()
@@ -228,16 +831,233 @@ class AgentManager:
             logger.error(f"❌ Task execution failed for agent {agent_id}: {str(e)}")
             
             # Update error metrics
-            if agent:
-                agent.error_count += 1
-                agent.status = 'error'
-                self.agent_status[agent_id] = agent.get_status()
+            agent.error_count += 1
+            agent.status = 'error'
+            self.agent_status[agent_id] = agent.get_status()
             
             return {
                 'success': False,
                 'error': str(e),
                 'agent_id': agent_id
             }
+        
+        finally:
+            if started:
+                agent.latency.finish()
+    
+    async def stream_task(self, agent_id: str, task_data: Dict[str, Any],
+                          timeout: Optional[float] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Execute a task with a specific agent, yielding events as they are produced
+        
+        Agents with an async generator `stream_task(task_data)` stream their own events
+        (progress, partial results, model tokens); other agents produce one 'result'
+        event from process_task. The task goes through admission control and holds an
+        execution slot like execute_task, but bypasses the result cache and always runs
+        on the event loop. The agent's generator is only advanced when the caller asks
+        for the next event, so a slow consumer slows the agent down instead of buffering
+        its output, and closing this iterator cancels the agent's work.
+        
+        Yields:
+            'started', the agent's events, then 'completed'; or a single 'error',
+            'rejected' or 'timeout' event in place of the remainder
+        """
+        agent = await self.get_agent(agent_id)
+        if not agent:
+            yield {'event': 'error', 'error': f'Agent {agent_id} not found'}
+            return
+        
+        if agent.status == 'disabled':
+            yield {'event': 'error', 'error': f'Agent {agent.name} is disabled'}
+            return
+        
+        timeout = self._resolve_timeout(task_data, timeout)
+        rejection = self.check_admission(agent_id, task_data.get('priority', 5), timeout)
+        if rejection:
+            yield {'event': 'rejected', **rejection}
+            return
+        
+        priority_class = self._priority_class(task_data.get('priority', 5))
+        ticket = self.bulkheads[agent_id].enter_queue(priority_class)
+        start_time = time.perf_counter()
+        
+        # The consumer may advance this generator from different tasks, so the deadline
+        # is fixed here and re-entered around each step rather than held across yields
+        deadline = time.monotonic() + timeout
+        if get_deadline() is not None:
+            deadline = min(deadline, get_deadline())
+        partial: Dict[str, Any] = {}
+        
+        try:
+            slot = self._execution_slot(agent_id, priority_class, ticket)
+            await asyncio.wait_for(slot.__aenter__(), max(0.0, deadline - time.monotonic()))
+        except asyncio.TimeoutError:
+            yield {'event': 'timeout', **self._timeout_result(agent, timeout, time.perf_counter() - start_time, partial)}
+            return
+        finally:
+            bulkhead = self.bulkheads.get(agent_id)
+            if bulkhead is not None and ticket in bulkhead.pending:
+                bulkhead.leave_queue(ticket)
+        
+        agent.last_activity = datetime.now()
+        agent.latency.start()
+        run_start = time.perf_counter()
+        events = self._agent_events(agent, task_data)
+        recorded = False
+        try:
+            yield {'event': 'started', 'agent_id': agent_id, 'queue_time': run_start - start_time}
+            
+            while True:
+                try:
+                    event = await asyncio.wait_for(self._next_event(events, deadline, partial),
+                                                   max(0.0, deadline - time.monotonic()))
+                except StopAsyncIteration:
+                    break
+                yield event
+            
+            response_time = time.perf_counter() - run_start
+            agent.latency.finish(response_time)
+            agent.task_count += 1
+            recorded = True
+            if agent.status == 'error':
+                agent.status = 'idle'
+            yield {'event': 'completed', 'agent_id': agent_id, 'response_time': response_time}
+        
+        except asyncio.TimeoutError:
+            agent.latency.finish()
+            recorded = True
+            yield {'event': 'timeout', **self._timeout_result(agent, timeout, time.perf_counter() - run_start, partial)}
+        
+        except Exception as e:
+            logger.error(f"❌ Streamed task failed for agent {agent_id}: {str(e)}")
+            agent.latency.finish()
+            agent.error_count += 1
+            agent.status = 'error'
+            recorded = True
+            yield {'event': 'error', 'error': str(e), 'agent_id': agent_id}
+        
+        finally:
+            if not recorded:
+                # Closed or cancelled by the consumer: stop the agent's work as well
+                agent.latency.finish()
+            await events.aclose()
+            await slot.__aexit__(None, None, None)
+            self.agent_status[agent_id] = agent.get_status()
+    
+    async def _next_event(self, events: AsyncIterator[Dict[str, Any]], deadline: float,
+                          partial: Dict[str, Any]) -> Dict[str, Any]:
+        """Advance an agent's event stream under the task's deadline, keeping its latest partial result"""
+        with deadline_scope(deadline=deadline), partial_result_scope() as holder:
+            try:
+                return await events.__anext__()
+            finally:
+                if 'result' in holder:
+                    partial['result'] = holder['result']
+    
+    async def _agent_events(self, agent: Any, task_data: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """An agent's own event stream, or one 'result' event for agents that don't stream"""
+        stream_task = getattr(agent, 'stream_task', None)
+        if stream_task is not None:
+            # Closed explicitly: leaving the loop early would otherwise leave the
+            # agent's generator open until it is garbage collected
+            stream = stream_task(task_data)
+            try:
+                async for event in stream:
+                    yield event
+            finally:
+                await stream.aclose()
+            return
+        
+        yield {'event': 'result', 'result': await task_handler(agent)(task_data)}
+    
+    async def execute_batch(self, agent_id: str, task_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Execute a list of tasks with a specific agent, in one call if it supports batching"""
+        agent = await self.get_agent(agent_id)
+        if not agent or not getattr(agent, 'supports_batch', False):
+            return [await self.execute_task(agent_id, task_data) for task_data in task_list]
+        
+        if agent.status == 'disabled':
+            return [{
+                'success': False,
+                'error': f'Agent {agent.name} is disabled'
+            } for _ in task_list]
+        
+        # A batch runs under the tightest deadline and is admitted at the highest priority of its tasks
+        timeout = min(self._resolve_timeout(task_data, None) for task_data in task_list)
+        priority = max(task_data.get('priority', 5) for task_data in task_list)
+        rejection = self.check_admission(agent_id, priority, timeout)
+        if rejection:
+            return [dict(rejection) for _ in task_list]
+        
+        bulkhead = self.bulkheads[agent_id]
+        ticket = bulkhead.enter_queue(self._priority_class(priority))
+        start_time = time.perf_counter()
+        
+        with deadline_scope(timeout), partial_result_scope() as partial:
+            try:
+                return await asyncio.wait_for(self._execute_batch_in_slot(agent, task_list, priority, ticket), time_remaining())
+            except asyncio.TimeoutError:
+                result = self._timeout_result(agent, timeout, time.perf_counter() - start_time, partial)
+                return [dict(result) for _ in task_list]
+            finally:
+                if ticket in bulkhead.pending:
+                    bulkhead.leave_queue(ticket)
+    
+    async def _execute_batch_in_slot(self, agent: BaseAgent, task_list: List[Dict[str, Any]],
+                                     priority: Any = 5, ticket: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Wait for an execution slot, then run the batch"""
+        async with self._execution_slot(agent.agent_id, self._priority_class(priority), ticket):
+            return await self._run_batch(agent, task_list)
+    
+    async def _run_batch(self, agent: BaseAgent, task_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Run a batch of tasks on an agent in one call and record its metrics"""
+        agent_id = agent.agent_id
+        try:
+            agent.last_activity = datetime.now()
+            agent.latency.start()
+            start_time = time.perf_counter()
+            
+            # Execute batch
+            try:
+                results = await agent.process_batch(task_list)
+            finally:
+                batch_time = time.perf_counter() - start_time
+                agent.latency.finish()
+            if len(results) != len(task_list):
+                raise ValueError(f'Agent returned {len(results)} results for {len(task_list)} tasks')
+            
+            # Update metrics, spreading the batch time over its tasks: one sample per task,
+            # so batching agents are compared with others on per-task latency
+            response_time = batch_time / len(task_list)
+            for _ in task_list:
+                agent.latency.record(response_time)
+            agent.task_count += len(task_list)
+            if agent.status == 'error':
+                agent.status = 'idle'
+            
+            self.agent_status[agent_id] = agent.get_status()
+            
+            logger.info(f"✅ Batch of {len(task_list)} tasks completed by {agent.name}")
+            return [{
+                'success': True,
+                'result': result,
+                'agent_id': agent_id,
+                'response_time': response_time,
+                'batch_size': len(task_list)
+            } for result in results]
+            
+        except Exception as e:
+            logger.error(f"❌ Batch execution failed for agent {agent_id}: {str(e)}")
+            
+            agent.error_count += 1
+            agent.status = 'error'
+            self.agent_status[agent_id] = agent.get_status()
+            
+            return [{
+                'success': False,
+                'error': str(e),
+                'agent_id': agent_id
+            } for _ in task_list]
     
     async def get_all_status(self) -> Dict[str, AgentStatus]:
         """Get status of all agents"""
@@ -286,15 +1106,23 @@ class AgentManager:
             'agents': {},
             'total_agents': len(self.agents),
             'enabled_agents': len(await self.get_enabled_agents()),
-            'errors': []
+            'errors': [],
+            'deferred_agents': list(self.lazy_agents),
+            'admission': await self.get_admission_stats(),
+            'result_cache': await self.get_cache_stats(),
+            'message_bus': self.message_bus.get_stats(),
+            'lanes': await self.get_lane_stats()
         }
         
         for agent_id, agent in self.agents.items():
             agent_health = {
-                'status': agent.status,
+                'status': agent.get_status().status,
                 'task_count': agent.task_count,
                 'error_count': agent.error_count,
-                'last_activity': agent.last_activity.isoformat()
+                'timeout_count': agent.timeout_count,
+                'last_activity': agent.last_activity.isoformat(),
+                'latency': agent.latency.snapshot(),
+                'bulkhead': self.bulkheads[agent_id].get_stats() if agent_id in self.bulkheads else None
             }
             
             if agent.status == 'error':
@@ -305,53 +1133,280 @@ class AgentManager:
         
         return health_status
     
+    @property
+    def active_tasks(self) -> int:
+        """Number of queued tasks currently executing"""
+        return len(self._active_futures)
+    
+    async def get_bulkhead_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get per-agent concurrency and queue statistics"""
+        return {agent_id: bulkhead.get_stats() for agent_id, bulkhead in self.bulkheads.items()}
+    
+    async def get_admission_stats(self) -> Dict[str, Any]:
+        """Get admission control counters and per-agent queue age"""
+        return {
+            'admitted': self.admission_metrics['admitted'],
+            'shed': dict(self.admission_metrics['shed']),
+            'shed_reasons': dict(self.admission_metrics['shed_reasons']),
+            'queues': {
+                agent_id: {
+                    'depth': bulkhead.depth,
+                    'oldest_queue_age': bulkhead.oldest_queue_age(),
+                    'estimated_wait': self.estimate_wait(agent_id)
+                }
+                for agent_id, bulkhead in self.bulkheads.items()
+            }
+        }
+    
+    async def get_cache_stats(self) -> Dict[str, Any]:
+        """Get result cache statistics"""
+        return self.result_cache.get_stats()
+    
+    async def get_lane_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get per-lane queue and timing statistics"""
+        return {name: lane.get_stats() for name, lane in self.lanes.items()}
+    
     async def start(self):
         """Start the agent manager"""
+        if self.running:
+            return
+        
         self.running = True
-        logger.info("🚀 Agent Manager started")
         
-        # Start background task processor
-        asyncio.create_task(self._process_task_queue())
+        # Warm the process-pool lane only when a registered agent needs it
+        if any(self._uses_cpu_lane(agent) for agent in self.agents.values()):
+            try:
+                await self.lanes['cpu'].start()
+            except Exception as e:
+                logger.error(f"❌ Failed to warm CPU lane: {str(e)}")
+        
+        # Start one set of background workers per agent, sized to its concurrency limit
+        for bulkhead in self.bulkheads.values():
+            self._start_workers(bulkhead)
+        
+        for agent in self.agents.values():
+            if hasattr(agent, 'attach_message_bus'):
+                self._start_message_loop(agent)
+        logger.info(f"🚀 Agent Manager started with workers for {len(self.bulkheads)} agents")
     
-    async def stop(self):
-        """Stop the agent manager"""
+    async def stop(self, drain: bool = True, timeout: Optional[float] = 30.0):
+        """
+        Stop the agent manager
+        
+        Args:
+            drain: Wait for queued tasks to finish before stopping workers
+            timeout: Maximum seconds to wait when draining; leftover tasks are cancelled
+        """
         self.running = False
         logger.info("🛑 Agent Manager stopping...")
         
+        if drain:
+            try:
+                await asyncio.wait_for(
+                    asyncio.gather(*(bulkhead.queue.join() for bulkhead in self.bulkheads.values() if bulkhead.workers)),
+                    timeout
+                )
+            except asyncio.TimeoutError:
+                logger.warning(f"⚠️ Task queues not drained after {timeout}s, cancelling remaining tasks")
+        
+        for bulkhead in self.bulkheads.values():
+            await self._stop_workers(bulkhead)
+        
+        for negotiation in list(self._negotiation_tasks):
+            negotiation.cancel()
+        await asyncio.gather(*self._negotiation_tasks, return_exceptions=True)
+        
+        for agent_id in list(self._message_loops):
+            await self._stop_message_loop(agent_id)
+        
         # Shutdown all agents
         for agent in self.agents.values():
             await agent.shutdown()
         
+        for lane in self.lanes.values():
+            await lane.stop()
+        
         logger.info("✅ Agent Manager stopped")
     
-    async def _process_task_queue(self):
-        """Background task processor"""
-        while self.running:
+    def _bus_address(self, agent: Any) -> str:
+        """Message bus address of an agent"""
+        return getattr(agent, 'agent_name', None) or agent.agent_id
+    
+    def _start_message_loop(self, agent: Any):
+        """Run an agent's message loop in the background"""
+        agent_id = agent.agent_id
+        if agent_id not in self._message_loops:
+            self._message_loops[agent_id] = asyncio.create_task(agent.run())
+    
+    async def _stop_message_loop(self, agent_id: str):
+        """Cancel an agent's message loop"""
+        loop_task = self._message_loops.pop(agent_id, None)
+        if loop_task:
+            loop_task.cancel()
+            await asyncio.gather(loop_task, return_exceptions=True)
+    
+    async def initiate_negotiation(self, agent_a: str, agent_b: str, context: Dict[str, Any],
+                                   timeout: Optional[float] = None) -> Optional[str]:
+        """
+        Start a negotiation from one agent to another over the message bus
+        
+        Returns:
+            Negotiation ID to look up with get_negotiation, or None if either agent is unavailable
+        """
+        initiator = await self.get_agent(agent_a) or await self.get_agent_by_name(agent_a)
+        counterpart = await self.get_agent(agent_b) or await self.get_agent_by_name(agent_b)
+        if not initiator or not counterpart:
+            logger.warning(f"⚠️ Cannot negotiate: agent {agent_a if not initiator else agent_b} not found")
+            return None
+        
+        sender = self._bus_address(initiator)
+        recipient = self._bus_address(counterpart)
+        if not self.message_bus.is_registered(recipient):
+            logger.warning(f"⚠️ Cannot negotiate: {recipient} has no mailbox")
+            return None
+        
+        # Keep a bounded history of negotiations
+        while len(self.negotiations) >= self.max_negotiation_history:
+            self.negotiations.pop(next(iter(self.negotiations)))
+        
+        negotiation_id = str(uuid.uuid4())
+        self.negotiations[negotiation_id] = {
+            'negotiation_id': negotiation_id,
+            'participants': [sender, recipient],
+            'context': context,
+            'status': 'in_progress',
+            'response': None,
+            'started_at': datetime.now().isoformat()
+        }
+        
+        async def run_negotiation():
+            record = self.negotiations[negotiation_id]
             try:
-                # Process tasks from queue
-                if not self.task_queue.empty() and self.active_tasks < self.max_concurrent_tasks:
-                    task = await self.task_queue.get()
-                    self.active_tasks += 1
-                    
-                    # Execute task in background
-                    asyncio.create_task(self._execute_queued_task(task))
+                if hasattr(initiator, 'negotiate_with_agent'):
+                    response = await initiator.negotiate_with_agent(recipient, context, negotiation_id)
+                else:
+                    response = await self.message_bus.request(
+                        sender, recipient, {'proposal': context, 'negotiation_id': negotiation_id},
+                        message_type='negotiation', timeout=timeout
+                    )
+                record['response'] = response
+                record['status'] = response.get('status', 'completed') if isinstance(response, dict) else 'completed'
+            except asyncio.TimeoutError:
+                record['status'] = 'timed_out'
+            except asyncio.CancelledError:
+                record['status'] = 'cancelled'
+                raise
+            except Exception as e:
+                logger.error(f"❌ Negotiation {negotiation_id} failed: {str(e)}")
+                record['status'] = 'failed'
+                record['error'] = str(e)
+            finally:
+                record['finished_at'] = datetime.now().isoformat()
+        
+        # Keep a reference so the task isn't garbage collected while it runs
+        negotiation = asyncio.create_task(run_negotiation())
+        self._negotiation_tasks.add(negotiation)
+        negotiation.add_done_callback(self._negotiation_tasks.discard)
+        logger.info(f"🤝 Negotiation {negotiation_id} started: {sender} -> {recipient}")
+        return negotiation_id
+    
+    async def get_negotiation(self, negotiation_id: str) -> Optional[Dict[str, Any]]:
+        """Get the state of a negotiation"""
+        return self.negotiations.get(negotiation_id)
+    
+    def _start_workers(self, bulkhead: AgentBulkhead):
+        """Start the background workers for an agent's queue"""
+        bulkhead.workers = [
+            asyncio.create_task(self._task_worker(bulkhead))
+            for _ in range(bulkhead.limit)
+        ]
+    
+    async def _stop_workers(self, bulkhead: AgentBulkhead):
+        """Stop an agent's workers and cancel anything left in its queue"""
+        # In-flight tasks have their futures cancelled by the worker
+        for worker in bulkhead.workers:
+            worker.cancel()
+        await asyncio.gather(*bulkhead.workers, return_exceptions=True)
+        bulkhead.workers = []
+        
+        while not bulkhead.queue.empty():
+            _, _, task = bulkhead.queue.get_nowait()
+            bulkhead.leave_queue(task['ticket'])
+            task['future'].cancel()
+            bulkhead.queue.task_done()
+    
+    async def _task_worker(self, bulkhead: AgentBulkhead):
+        """Background worker executing queued tasks for one agent"""
+        while True:
+            _, _, task = await bulkhead.queue.get()
+            bulkhead.leave_queue(task['ticket'])
+            future = task['future']
+            try:
+                if future.cancelled():
+                    continue
+                
+                agent = self.agents.get(bulkhead.agent_id)
+                if agent is None:
+                    future.set_result({'success': False, 'error': f'Agent {bulkhead.agent_id} not found'})
+                    continue
+                
+                self._active_futures.add(future)
+                try:
+                    # Restore the deadline the task was queued under; it was admitted when queued
+                    with deadline_scope(deadline=task.get('deadline')):
+                        result = await self._execute_admitted(agent, task['task_data'])
+                finally:
+                    self._active_futures.discard(future)
                 
-                await asyncio.sleep(0.1)  # Small delay to prevent busy waiting
+                if not future.done():
+                    future.set_result(result)
+                    
+            except asyncio.CancelledError:
+                if not future.done():
+                    future.cancel()
+                raise
                 
             except Exception as e:
-                logger.error(f"❌ Task queue processing error: {str(e)}")
-                await asyncio.sleep(1)
-    
-    async def _execute_queued_task(self, task):
-        """Execute a queued task"""
-        try:
-            await self.execute_task(task['agent_id'], task['task_data'])
-        finally:
-            self.active_tasks -= 1
+                logger.error(f"❌ Task worker for {bulkhead.agent_id} error: {str(e)}")
+                if not future.done():
+                    future.set_exception(e)
+                    
+            finally:
+                bulkhead.queue.task_done()
     
-    async def queue_task(self, agent_id: str, task_data: Dict[str, Any]):
-        """Queue a task for execution"""
-        await self.task_queue.put({
+    async def queue_task(self, agent_id: str, task_data: Dict[str, Any]) -> asyncio.Future:
+        """
+        Queue a task for execution on the agent's own queue
+        
+        Returns:
+            Future resolving to the execute_task result once a worker has run the task
+        """
+        future = asyncio.get_running_loop().create_future()
+        
+        if agent_id in self.lazy_agents:
+            await self.load_lazy_agent(agent_id)
+        
+        bulkhead = self.bulkheads.get(agent_id)
+        if not bulkhead:
+            future.set_result({
+                'success': False,
+                'error': f'Agent {agent_id} not found'
+            })
+            return future
+        
+        rejection = self.check_admission(agent_id, task_data.get('priority', 5), task_data.get('timeout'))
+        if rejection:
+            future.set_result(rejection)
+            return future
+        
+        priority_class = self._priority_class(task_data.get('priority', 5))
+        rank = [name for name, _ in self.PRIORITY_CLASSES].index(priority_class)
+        ticket = bulkhead.enter_queue(priority_class)
+        bulkhead.queue.put_nowait((rank, ticket, {
             'agent_id': agent_id,
-            'task_data': task_data
-        })
+            'task_data': task_data,
+            'deadline': get_deadline(),
+            'ticket': ticket,
+            'future': future
+        }))
+        return future
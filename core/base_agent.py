@@ -1,14 +1,21 @@
 import json
 import asyncio
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, AsyncIterator
 from datetime import datetime
 from abc import ABC, abstractmethod
 from enum import Enum
+from types import MappingProxyType
 
 from openai import OpenAI
+from openai_agents import Agent, Session
 from pydantic import BaseModel
 
+from .config_registry import get_config_registry
+from .bounded_memory import BoundedMemoryStore
+from .session_manager import SessionManager, SessionLocks, stream_event_text
+from .model_governor import get_model_governor, estimate_call_tokens
+
 class AgentStatus(Enum):
     IDLE = "idle"
     BUSY = "busy"
@@ -21,7 +28,31 @@ class MessageType(Enum):
     NEGOTIATION = "negotiation"
     BROADCAST = "broadcast"
 
+# Shared by every agent; read-only so one instance can't change another's guidelines
+ETHICAL_GUIDELINES = MappingProxyType({
+    "transparency": True,
+    "fairness": True,
+    "privacy_protection": True,
+    "bias_mitigation": True,
+    "user_consent_required": True,
+    "data_encryption": True,
+    "anonymization": True
+})
+
 class BaseAgent(ABC):
+    # Messages handled at once by the execution loop
+    max_concurrent_messages = 4
+    # Seconds between self-diagnosis runs
+    diagnosis_interval = 60.0
+    # Approximate memory_store budget in bytes, and default TTL of stored keys in seconds
+    memory_budget_bytes = 1_000_000
+    memory_default_ttl: Optional[float] = 86400.0
+    # Live SDK sessions per agent, seconds before an idle session is evicted,
+    # and approximate prompt tokens of history kept per session
+    max_sessions = 500
+    session_idle_timeout = 1800.0
+    session_token_budget = 4000
+
     def __init__(self, agent_name: str, agent_type: str):
         self.agent_name = agent_name
         self.agent_type = agent_type
@@ -34,7 +65,8 @@ class BaseAgent(ABC):
         
         # Core FreelanceX.AI attributes
         self.ethical_guidelines = self._load_ethical_guidelines()
-        self.memory_store = {}
+        self.memory_store = BoundedMemoryStore(self.memory_budget_bytes, self.memory_default_ttl)
+        self.memory_backend = None  # Optional MemoryManager that evicted entries spill to
         self.negotiation_history = []
         self.performance_metrics = {
             "tasks_completed": 0,
@@ -45,10 +77,18 @@ class BaseAgent(ABC):
         
         # Cross-agent communication
         self.message_queue = asyncio.Queue()
-        self.agent_registry = None  # Will be set by AgentManager
+        self.message_bus = None  # Will be set by AgentManager
+        self._message_slots = asyncio.Semaphore(self.max_concurrent_messages)
+        self._message_tasks = set()
         
         # Session management for OpenAI Agent SDK
-        self.sessions: Dict[str, Session] = {}
+        self.sessions = SessionManager(
+            lambda: Session(agent=self.openai_agent),
+            max_sessions=self.max_sessions,
+            idle_timeout=self.session_idle_timeout,
+            token_budget=self.session_token_budget
+        )
+        self._session_locks = SessionLocks()
         
         self.logger.info(f"FreelanceX.AI Agent '{agent_name}' initialized with OpenAI Agent SDK")
 
@@ -76,9 +116,8 @@ class BaseAgent(ABC):
     def _load_system_prompt(self) -> str:
         """Load system prompt with FreelanceX.AI context"""
         try:
-            with open('config/system_prompt.json', 'r') as f:
-                config = json.load(f)
-                base_prompt = config.get('SYSTEM_PROMPT', '')
+            config = get_config_registry().load_json('config/system_prompt.json')
+            base_prompt = config.get('SYSTEM_PROMPT', '')
                 
             # Add FreelanceX.AI specific context
             freelancex_context = f"""
@@ -105,59 +144,111 @@ class BaseAgent(ABC):
     
     def _load_ethical_guidelines(self) -> Dict[str, Any]:
         """Load FreelanceX.AI ethical guidelines"""
-        return {
-            "transparency": True,
-            "fairness": True,
-            "privacy_protection": True,
-            "bias_mitigation": True,
-            "user_consent_required": True,
-            "data_encryption": True,
-            "anonymization": True
-        }
+        return ETHICAL_GUIDELINES
     
     def get_or_create_session(self, user_id: str) -> Optional[Session]:
         """Get or create a session for a user"""
         if not self.openai_agent:
             return None
-            
-        if user_id not in self.sessions:
-            self.sessions[user_id] = Session(agent=self.openai_agent)
-            self.logger.info(f"Created new session for user: {user_id}")
-        return self.sessions[user_id]
-
-    async def send_message(self, target_agent: str, message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Send message to another agent through centralized API"""
-        if not self.agent_registry:
-            self.logger.error("Agent registry not available for communication")
+        
+        return self.sessions.get_or_create(user_id)
+
+    async def run_model(self, user_id: str, content: str, priority: str = 'interactive') -> Any:
+        """
+        Run one turn of a user's SDK session off the event loop
+        
+        The call waits for the process-wide model call governor, and turns on the
+        same session run one at a time.
+        
+        Raises:
+            RuntimeError: The OpenAI Agent SDK is not available
+        """
+        if not self.openai_agent:
+            raise RuntimeError("OpenAI Agent SDK is not available")
+        
+        async with self._session_locks.hold(user_id):
+            session = self.get_or_create_session(user_id)
+            tokens = estimate_call_tokens(self.system_prompt, session, content)
+            return await get_model_governor().run(
+                lambda: asyncio.to_thread(session.run, content), priority, tokens
+            )
+
+    async def stream_model(self, user_id: str, content: str, priority: str = 'interactive') -> AsyncIterator[str]:
+        """
+        Run one turn of a user's SDK session, yielding response text as it is generated
+        
+        Falls back to run_model (one chunk) when the SDK session can't stream.
+        
+        Raises:
+            RuntimeError: The OpenAI Agent SDK is not available
+        """
+        if not self.openai_agent:
+            raise RuntimeError("OpenAI Agent SDK is not available")
+        
+        if getattr(self.get_or_create_session(user_id), 'run_streamed', None) is None:
+            yield str(await self.run_model(user_id, content, priority))
+            return
+        
+        async with self._session_locks.hold(user_id):
+            session = self.get_or_create_session(user_id)
+            governor = get_model_governor()
+            ticket = await governor.acquire(priority, estimate_call_tokens(self.system_prompt, session, content))
+            error = None
+            try:
+                async for event in session.run_streamed(content):
+                    text = stream_event_text(event)
+                    if text:
+                        yield text
+            except BaseException as e:
+                error = e
+                raise
+            finally:
+                governor.release(ticket, error=error)
+
+    def attach_message_bus(self, message_bus):
+        """Connect this agent's mailbox to the message bus"""
+        self.message_bus = message_bus
+        message_bus.register(self.agent_name, self.message_queue)
+
+    async def send_message(self, target_agent: str, message: Dict[str, Any],
+                           message_type: str = MessageType.REQUEST.value,
+                           timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Send a message to another agent and wait for its reply"""
+        if not self.message_bus:
+            self.logger.error("Message bus not available for communication")
             return None
-            
-        message_payload = {
-            "from": self.agent_name,
-            "to": target_agent,
-            "type": MessageType.REQUEST.value,
-            "timestamp": datetime.now().isoformat(),
-            "data": message
-        }
         
         try:
-            response = await self.agent_registry.route_message(message_payload)
-            self.logger.info(f"Message sent to {target_agent}")
-            return response
+            return await self.message_bus.request(self.agent_name, target_agent, message, message_type, timeout)
+        except asyncio.TimeoutError:
+            self.logger.warning(f"No reply from {target_agent} in time")
+            return None
         except Exception as e:
             self.logger.error(f"Failed to send message to {target_agent}: {str(e)}")
             return None
 
-    async def negotiate_with_agent(self, target_agent: str, proposal: Dict[str, Any]) -> Dict[str, Any]:
+    async def publish(self, topic: str, data: Dict[str, Any]) -> int:
+        """Publish a message to every agent subscribed to a topic"""
+        if not self.message_bus:
+            return 0
+        return await self.message_bus.publish(self.agent_name, topic, data)
+
+    def subscribe(self, topic: str):
+        """Receive messages published to a topic"""
+        if self.message_bus:
+            self.message_bus.subscribe(self.agent_name, topic)
+
+    async def negotiate_with_agent(self, target_agent: str, proposal: Dict[str, Any],
+                                   negotiation_id: Optional[str] = None) -> Dict[str, Any]:
         """Initiate negotiation with another agent"""
         self.status = AgentStatus.NEGOTIATING
         
         negotiation_request = {
-            "type": "negotiation",
             "proposal": proposal,
-            "negotiation_id": f"{self.agent_name}_{target_agent}_{datetime.now().timestamp()}"
+            "negotiation_id": negotiation_id or f"{self.agent_name}_{target_agent}_{datetime.now().timestamp()}"
         }
         
-        response = await self.send_message(target_agent, negotiation_request)
+        response = await self.send_message(target_agent, negotiation_request, MessageType.NEGOTIATION.value)
         
         # Store negotiation history for transparency
         self.negotiation_history.append({
@@ -194,35 +285,58 @@ class BaseAgent(ABC):
                 (current_satisfaction * (total_tasks - 1) + user_rating) / total_tasks
             )
 
-    def store_memory(self, key: str, value: Any, user_consent: bool = True):
-        """Store information in agent memory with privacy controls"""
+    def attach_memory_backend(self, memory_manager):
+        """Spill memory_store entries and evicted sessions to the memory database"""
+        self.memory_backend = memory_manager
+        
+        async def spill(key: str, value: Any, ttl: Optional[float]):
+            await memory_manager.store_agent_memory(self.agent_name, key, value, ttl)
+        
+        async def persist_session(user_id: str, session: Session):
+            session_id = f"{self.agent_name}:{user_id}"
+            await memory_manager.archive_session(session_id, user_id, self.agent_name, session)
+        
+        self.memory_store.spill = spill
+        self.sessions.persist = persist_session
+
+    def store_memory(self, key: str, value: Any, user_consent: bool = True, ttl: Optional[float] = None):
+        """Store information in agent memory with privacy controls, expiring after `ttl` seconds"""
         if not user_consent:
             self.logger.warning("Memory storage declined due to lack of user consent")
             return
-            
-        if self.ethical_guidelines["privacy_protection"]:
-            # In real implementation, this would include encryption
-            self.memory_store[key] = {
-                "value": value,
-                "timestamp": datetime.now().isoformat(),
-                "encrypted": True
-            }
-        else:
-            self.memory_store[key] = value
+        
+        self.memory_store.set(key, value, ttl)
 
     def retrieve_memory(self, key: str) -> Any:
         """Retrieve information from agent memory"""
-        if key in self.memory_store:
-            memory_item = self.memory_store[key]
-            if isinstance(memory_item, dict) and "value" in memory_item:
-                return memory_item["value"]
-            return memory_item
-        return None
+        return self.memory_store.get(key)
+
+    async def recall_memory(self, key: str) -> Any:
+        """Retrieve information from agent memory, falling back to spilled entries"""
+        value = self.memory_store.get(key)
+        if value is not None or not self.memory_backend:
+            return value
+        
+        entry = await self.memory_backend.get_agent_memory(self.agent_name, key)
+        if entry is None:
+            return None
+        
+        # Bring the entry back into the in-process store
+        self.memory_store.set(key, entry["value"], entry["ttl"])
+        await self.memory_backend.delete_agent_memory(self.agent_name, key)
+        return entry["value"]
 
     def clear_memory(self, user_request: bool = False):
         """Clear agent memory (user-controlled)"""
         if user_request:
             self.memory_store.clear()
+            if self.memory_backend:
+                try:
+                    asyncio.get_running_loop().create_task(
+                        self.memory_backend.delete_agent_memory(self.agent_name)
+                    )
+                except RuntimeError:
+                    pass
             self.logger.info("Agent memory cleared by user request")
         else:
             self.logger.warning("Memory clear attempted without user authorization")
@@ -244,33 +358,56 @@ class BaseAgent(ABC):
             "type": self.agent_type,
             "status": self.status.value,
             "performance_metrics": self.performance_metrics,
-            "ethical_guidelines": self.ethical_guidelines,
+            "ethical_guidelines": dict(self.ethical_guidelines),
             "memory_items": len(self.memory_store),
+            "memory": self.memory_store.get_stats(),
+            "sessions": self.sessions.get_stats(),
             "negotiations_count": len(self.negotiation_history)
         }
 
     async def run(self):
         """Main agent execution loop"""
         self.logger.info(f"Agent {self.agent_name} starting execution loop")
-        while True:
-            try:
-                # Process incoming messages
-                if not self.message_queue.empty():
+        diagnosis_task = asyncio.create_task(self._diagnosis_loop())
+        try:
+            while True:
+                # Take a slot before the next message so excess messages wait in the queue
+                await self._message_slots.acquire()
+                try:
                     message = await self.message_queue.get()
-                    await self._process_message(message)
-                
-                # Perform self-diagnosis periodically
-                if self.performance_metrics["tasks_completed"] % 10 == 0:
-                    diagnosis = await self.self_diagnose()
-                    if diagnosis.get("needs_repair", False):
-                        await self._initiate_self_repair(diagnosis)
-                
-                await asyncio.sleep(1)  # Prevent busy waiting
+                except BaseException:
+                    self._message_slots.release()
+                    raise
                 
+                task = asyncio.create_task(self._handle_message(message))
+                self._message_tasks.add(task)
+                task.add_done_callback(self._message_tasks.discard)
+        finally:
+            diagnosis_task.cancel()
+            for task in list(self._message_tasks):
+                task.cancel()
+
+    async def _handle_message(self, message: Dict[str, Any]):
+        """Process one message and release its slot"""
+        try:
+            await self._process_message(message)
+        except Exception as e:
+            self.logger.error(f"Error processing message: {str(e)}")
+            self.status = AgentStatus.ERROR
+        finally:
+            self._message_slots.release()
+            self.message_queue.task_done()
+
+    async def _diagnosis_loop(self):
+        """Run self-diagnosis on its own timer"""
+        while True:
+            await asyncio.sleep(self.diagnosis_interval)
+            try:
+                diagnosis = await self.self_diagnose()
+                if diagnosis.get("needs_repair", False):
+                    await self._initiate_self_repair(diagnosis)
             except Exception as e:
-                self.logger.error(f"Error in agent execution loop: {str(e)}")
-                self.status = AgentStatus.ERROR
-                await asyncio.sleep(5)  # Wait before retrying
+                self.logger.error(f"Self-diagnosis failed: {str(e)}")
 
     async def _process_message(self, message: Dict[str, Any]):
         """Process incoming message"""
@@ -280,6 +417,8 @@ class BaseAgent(ABC):
             await self._handle_negotiation(message)
         elif message_type == MessageType.REQUEST.value:
             await self._handle_request(message)
+        elif message_type == MessageType.BROADCAST.value:
+            await self._handle_broadcast(message)
         else:
             self.logger.warning(f"Unknown message type: {message_type}")
 
@@ -293,20 +432,22 @@ class BaseAgent(ABC):
             "agent": self.agent_name
         }
         
-        # Send response back
-        sender = message.get("from")
-        if sender:
-            await self.send_message(sender, response)
+        # Reply to the sender, correlated with its request
+        if self.message_bus:
+            await self.message_bus.reply(message, response, self.agent_name)
 
     async def _handle_request(self, message: Dict[str, Any]):
         """Handle regular request from another agent"""
         task = message.get("data", {})
         result = await self.execute_task(task)
         
-        # Send response back
-        sender = message.get("from")
-        if sender:
-            await self.send_message(sender, result)
+        # Reply to the sender, correlated with its request
+        if self.message_bus:
+            await self.message_bus.reply(message, result, self.agent_name)
+
+    async def _handle_broadcast(self, message: Dict[str, Any]):
+        """Handle a topic or broadcast message - override to react to them"""
+        self.logger.debug(f"Broadcast from {message.get('from')} on {message.get('topic') or 'all'}")
 
     async def _initiate_self_repair(self, diagnosis: Dict[str, Any]):
         """Initiate self-repair based on diagnosis"""
@@ -0,0 +1,151 @@
+"""
+FreelanceX.AI Bounded Agent Memory
+Per-agent key/value memory with TTLs, a byte budget and LRU eviction
+"""
+
+import asyncio
+import logging
+import pickle
+import sys
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Callable, Awaitable, Iterator
+
+logger = logging.getLogger(__name__)
+
+# Async callable (key, value, ttl_remaining) that persists an evicted entry
+SpillHandler = Callable[[str, Any, Optional[float]], Awaitable[None]]
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate in-memory size of a value in bytes"""
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(value)
+
+
+class BoundedMemoryStore:
+    """
+    LRU key/value store bounded by an approximate byte budget
+    Entries expire after their TTL. Entries evicted for space (not expired ones)
+    are handed to the optional spill handler, e.g. to persist them in the memory DB.
+    """
+
+    def __init__(self, max_bytes: int = 1_000_000, default_ttl: Optional[float] = None,
+                 spill: Optional[SpillHandler] = None):
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.spill = spill
+        self._entries: OrderedDict = OrderedDict()  # key -> (value, expires_at, size)
+        self.bytes = 0
+        self.metrics = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'expirations': 0,
+            'spilled': 0,
+            'rejected': 0
+        }
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        """Store a value; False when it alone exceeds the byte budget"""
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            self.metrics['rejected'] += 1
+            logger.warning(f"⚠️ Memory value for {key} ({size} bytes) exceeds the {self.max_bytes} byte budget")
+            return False
+
+        self.delete(key)
+        ttl = self.default_ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl else None
+        self._entries[key] = (value, expires_at, size)
+        self.bytes += size
+
+        # Reclaim expired entries before evicting live ones
+        if self.bytes > self.max_bytes:
+            self._evict_expired()
+        while self.bytes > self.max_bytes:
+            self._evict_oldest()
+        return True
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return a live value and mark it recently used"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.metrics['misses'] += 1
+            return default
+
+        value, expires_at, _ = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            self._remove(key)
+            self.metrics['expirations'] += 1
+            self.metrics['misses'] += 1
+            return default
+
+        self._entries.move_to_end(key)
+        self.metrics['hits'] += 1
+        return value
+
+    def delete(self, key: str):
+        """Remove a key if present"""
+        if key in self._entries:
+            self._remove(key)
+
+    def clear(self):
+        """Remove every entry"""
+        self._entries.clear()
+        self.bytes = 0
+
+    def __contains__(self, key: str) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and (entry[1] is None or entry[1] > time.monotonic())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def keys(self) -> Iterator[str]:
+        """Keys currently stored, least recently used first"""
+        return iter(list(self._entries))
+
+    def _remove(self, key: str) -> tuple:
+        entry = self._entries.pop(key)
+        self.bytes -= entry[2]
+        return entry
+
+    def _evict_expired(self):
+        now = time.monotonic()
+        expired = [key for key, (_, expires_at, _) in self._entries.items()
+                   if expires_at is not None and expires_at <= now]
+        for key in expired:
+            self._remove(key)
+        self.metrics['expirations'] += len(expired)
+
+    def _evict_oldest(self):
+        key, (value, expires_at, _) = next(iter(self._entries.items()))
+        self._remove(key)
+        self.metrics['evictions'] += 1
+
+        if self.spill is not None:
+            ttl_remaining = expires_at - time.monotonic() if expires_at is not None else None
+            try:
+                asyncio.get_running_loop().create_task(self._spill(key, value, ttl_remaining))
+            except RuntimeError:
+                # No event loop to persist from; the entry is simply dropped
+                pass
+
+    async def _spill(self, key: str, value: Any, ttl_remaining: Optional[float]):
+        try:
+            await self.spill(key, value, ttl_remaining)
+            self.metrics['spilled'] += 1
+        except Exception as e:
+            logger.error(f"❌ Failed to spill memory entry {key}: {str(e)}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return size and eviction statistics"""
+        return {
+            'entries': len(self._entries),
+            'bytes': self.bytes,
+            'max_bytes': self.max_bytes,
+            **self.metrics
+        }
@@ -24,6 +24,7 @@ class AgentConfig:
     tools: list
     enabled: bool
     priority: int
+    max_concurrency: int = 4  # tasks this agent may run at once
 
 @dataclass
 class ToolConfig:
@@ -43,6 +44,8 @@ class SystemConfig:
     retry_attempts: int
     health_check_interval: int
     memory_cleanup_interval: int
+    cpu_workers: Optional[int] = None
+    intent_model_path: Optional[str] = None
 
 class Config:
     """
@@ -141,7 +144,8 @@ class Config:
                     capabilities=agent_data.get('capabilities', []),
                     tools=agent_data.get('tools', []),
                     enabled=agent_data.get('enabled', True),
-                    priority=agent_data.get('priority', 999)
+                    priority=agent_data.get('priority', 999),
+                    max_concurrency=agent_data.get('max_concurrency', 4)
                 )
                 self.agents[agent_id] = agent_config
                 logger.info(f"📋 Parsed agent config: {agent_config.name}")
@@ -179,7 +183,9 @@ class Config:
                 task_timeout=system_data.get('task_timeout', 300),
                 retry_attempts=system_data.get('retry_attempts', 3),
                 health_check_interval=system_data.get('health_check_interval', 300),
-                memory_cleanup_interval=system_data.get('memory_cleanup_interval', 86400)
+                memory_cleanup_interval=system_data.get('memory_cleanup_interval', 86400),
+                cpu_workers=system_data.get('cpu_workers'),
+                intent_model_path=system_data.get('intent_model_path')
             )
             logger.info("⚙️ System configuration parsed")
             
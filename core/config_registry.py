@@ -0,0 +1,103 @@
+"""
+FreelanceX.AI Config Registry
+Process-wide cache of parsed prompt and config files, invalidated when a file changes
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from types import MappingProxyType
+from typing import Dict, Any, Callable, Tuple
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+
+def freeze(value: Any) -> Any:
+    """Return an immutable copy of parsed config data (mappings become read-only, lists tuples)"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+class ConfigRegistry:
+    """
+    Loads each config file once per process and shares the parsed, frozen result
+    Entries are keyed by absolute path and validated against the file's mtime and
+    size, checked at most once per `check_interval` seconds, so edits are picked up
+    without restarting.
+    """
+
+    def __init__(self, check_interval: float = 1.0):
+        self.check_interval = check_interval
+        self._entries: Dict[str, Tuple[Tuple[int, int], float, Any]] = {}  # path -> (stamp, checked_at, value)
+        self._lock = threading.Lock()
+        self.metrics = {'hits': 0, 'loads': 0, 'reloads': 0}
+
+    def load(self, path: str, parser: Callable[[Any], Any]) -> Any:
+        """
+        Return the frozen parsed contents of a file
+
+        Raises:
+            FileNotFoundError: The file does not exist
+            Parser errors (e.g. json.JSONDecodeError) for malformed files
+        """
+        key = os.path.abspath(path)
+        now = time.monotonic()
+
+        entry = self._entries.get(key)
+        if entry is not None and now - entry[1] < self.check_interval:
+            self.metrics['hits'] += 1
+            return entry[2]
+
+        with self._lock:
+            stat = os.stat(key)
+            stamp = (stat.st_mtime_ns, stat.st_size)
+
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == stamp:
+                self._entries[key] = (stamp, now, entry[2])
+                self.metrics['hits'] += 1
+                return entry[2]
+
+            with open(key, 'r') as f:
+                value = freeze(parser(f))
+
+            self._entries[key] = (stamp, now, value)
+            self.metrics['reloads' if entry is not None else 'loads'] += 1
+            if entry is not None:
+                logger.info(f"🔄 Reloaded changed config file: {path}")
+            return value
+
+    def load_json(self, path: str) -> Any:
+        """Load a JSON file through the registry"""
+        return self.load(path, json.load)
+
+    def load_yaml(self, path: str) -> Any:
+        """Load a YAML file through the registry"""
+        return self.load(path, yaml.safe_load)
+
+    def invalidate(self, path: str = None):
+        """Drop one cached file, or all of them"""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(os.path.abspath(path), None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return cache statistics"""
+        return {**self.metrics, 'files': len(self._entries)}
+
+
+_config_registry = ConfigRegistry()
+
+
+def get_config_registry() -> ConfigRegistry:
+    """Get the process-wide config registry"""
+    return _config_registry
@@ -0,0 +1,93 @@
+"""
+FreelanceX.AI Deadline Propagation
+Request deadlines carried through contextvars into agents, integrations and DB calls
+"""
+
+import asyncio
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Any, Optional
+
+
+class DeadlineExceeded(asyncio.TimeoutError):
+    """Raised when work is started or continued past its deadline"""
+    pass
+
+
+# Absolute deadline on the time.monotonic() clock, None when unbounded
+_deadline: ContextVar[Optional[float]] = ContextVar('freelancex_deadline', default=None)
+
+# Holder for the latest partial result reported by the running task
+_partial_result: ContextVar[Optional[Dict[str, Any]]] = ContextVar('freelancex_partial_result', default=None)
+
+
+def get_deadline() -> Optional[float]:
+    """Return the current absolute deadline (time.monotonic() clock), if any"""
+    return _deadline.get()
+
+
+def time_remaining(default: Optional[float] = None) -> Optional[float]:
+    """
+    Seconds left before the current deadline
+    Returns `default` when no deadline is set, otherwise the smaller of the two.
+    """
+    deadline = _deadline.get()
+    if deadline is None:
+        return default
+
+    remaining = max(0.0, deadline - time.monotonic())
+    return remaining if default is None else min(remaining, default)
+
+
+def check_deadline():
+    """Raise DeadlineExceeded if the current deadline has passed"""
+    if time_remaining() == 0.0:
+        raise DeadlineExceeded("Deadline exceeded")
+
+
+@contextmanager
+def deadline_scope(timeout: Optional[float] = None, deadline: Optional[float] = None):
+    """
+    Tighten the current deadline for the enclosed block
+    A scope can only shorten an inherited deadline, never extend it.
+
+    Args:
+        timeout: Seconds from now
+        deadline: Absolute deadline on the time.monotonic() clock
+    """
+    current = _deadline.get()
+    candidates = [value for value in (current, deadline) if value is not None]
+    if timeout is not None:
+        candidates.append(time.monotonic() + timeout)
+
+    if not candidates or min(candidates) == current:
+        yield current
+        return
+
+    token = _deadline.set(min(candidates))
+    try:
+        yield min(candidates)
+    finally:
+        _deadline.reset(token)
+
+
+@contextmanager
+def partial_result_scope():
+    """Collect partial results reported by code running in the enclosed block"""
+    holder: Dict[str, Any] = {}
+    token = _partial_result.set(holder)
+    try:
+        yield holder
+    finally:
+        _partial_result.reset(token)
+
+
+def report_partial_result(result: Any):
+    """
+    Record progress so far for the running task
+    Returned to the caller if the task is cancelled by its deadline.
+    """
+    holder = _partial_result.get()
+    if holder is not None:
+        holder['result'] = result
@@ -5,8 +5,11 @@ Routes tasks to appropriate agents based on capabilities and availability
 
 import asyncio
 import logging
-from typing import Dict, Any, Optional, List
+import random
+import time
+from typing import Dict, Any, Optional, List, Tuple, AsyncIterator
 from datetime import datetime
+from itertools import zip_longest
 import re
 
 logger = logging.getLogger(__name__)
@@ -17,12 +20,44 @@ class TaskDispatcher:
     Uses capability matching, load balancing, and priority management
     """
     
+    # single: best-scored agent only
+    # fanout: all candidates concurrently, results merged
+    # first_success: all candidates concurrently, first good result wins
+    # hedged: best agent, backup started once the primary exceeds its p95 latency
+    DISPATCH_STRATEGIES = ('single', 'fanout', 'first_success', 'hedged')
+    
+    # weighted: additive score from status, error rate and average latency
+    # expected_completion: least expected completion time (EWMA latency x outstanding requests)
+    SCORING_MODES = ('weighted', 'expected_completion')
+    
     def __init__(self):
         self.agent_manager = None
         self.task_history = []
         self.routing_rules = self._initialize_routing_rules()
+        self.dispatch_strategies = self._initialize_dispatch_strategies()
+        self.strategy_metrics = {
+            strategy: self._new_strategy_metrics() for strategy in self.DISPATCH_STRATEGIES
+        }
         self.priority_queue = asyncio.PriorityQueue()
         
+        # Optional IntentClassifier for tasks submitted without a task type
+        self.intent_classifier = None
+        
+        # Hedging configuration
+        self.hedge_default_delay = 2.0  # seconds, used until an agent has latency history
+        self.hedge_min_samples = 20
+        
+        # Most agents a fanout, first_success or hedged dispatch runs a task on
+        self.max_fanout = 3
+        
+        # Agent scoring configuration
+        self.scoring_mode = 'expected_completion'
+        self.power_of_two_choices = True
+        self.default_latency = 1.0  # seconds, assumed for agents without latency history
+        
+        # Task deadlines by priority (minimum priority, timeout in seconds); urgent work fails fast
+        self.priority_timeouts = [(8, 60.0), (5, 180.0), (0, 300.0)]
+        
     def set_agent_manager(self, agent_manager):
         """Set the agent manager reference"""
         self.agent_manager = agent_manager
@@ -42,9 +77,31 @@ class TaskDispatcher:
             'follow_up': ['client_agent']
         }
     
-    async def dispatch_task(self, task_analysis: Dict[str, Any]) -> Dict[str, Any]:
+    def _initialize_dispatch_strategies(self) -> Dict[str, str]:
+        """Initialize dispatch strategies for task types routed to several agents"""
+        return {
+            'market_research': 'fanout',
+            'financial_analysis': 'fanout'
+        }
+    
+    def _new_strategy_metrics(self) -> Dict[str, Any]:
+        """Create an empty metrics record for a dispatch strategy"""
+        return {
+            'dispatches': 0,
+            'successes': 0,
+            'failures': 0,
+            'agents_invoked': 0,
+            'cancelled': 0,
+            'hedges_fired': 0,
+            'hedge_wins': 0,
+            'total_time': 0.0,
+            'avg_time': 0.0,
+            'max_time': 0.0
+        }
+    
+    async def dispatch_task(self, task_analysis: Dict[str, Any], strategy: Optional[str] = None) -> Dict[str, Any]:
         """
-        Dispatch a task to the most appropriate agent
+        Dispatch a task to the most appropriate agent(s)
         
         Args:
             task_analysis: Analysis result from executive agent containing:
@@ -53,13 +110,14 @@ class TaskDispatcher:
                 - required_capabilities: List of required capabilities
                 - content: Task content
                 - user_id: User identifier
+                - dispatch_strategy: Optional strategy override
+            strategy: One of DISPATCH_STRATEGIES; overrides the task type default
         """
         try:
+            task_analysis = self._classify_untyped([task_analysis])[0]
             task_type = task_analysis.get('task_type', 'general')
             priority = task_analysis.get('priority', 5)
             required_capabilities = task_analysis.get('required_capabilities', [])
-            content = task_analysis.get('content', '')
-            user_id = task_analysis.get('user_id', 'default')
             
             # Find suitable agents
             suitable_agents = await self._find_suitable_agents(task_type, required_capabilities)
@@ -71,37 +129,50 @@ class TaskDispatcher:
                     'task_type': task_type
                 }
             
-            # Select best agent based on load balancing and priority
-            selected_agent = await self._select_best_agent(suitable_agents, priority)
+            # Rank agents based on load balancing and priority
+            ranked_agents = await self._rank_agents(suitable_agents, priority)
             
-            if not selected_agent:
+            if not ranked_agents:
                 return {
                     'success': False,
                     'error': 'No available agents to handle the task',
                     'task_type': task_type
                 }
             
+            strategy = self._resolve_strategy(task_type, strategy or task_analysis.get('dispatch_strategy'))
+            if strategy != 'single':
+                ranked_agents = self._multi_agent_candidates(task_type, required_capabilities, ranked_agents)
+            
             # Prepare task data
-            task_data = {
-                'task_type': task_type,
-                'content': content,
-                'user_id': user_id,
-                'priority': priority,
-                'timestamp': datetime.now().isoformat(),
-                'required_capabilities': required_capabilities
-            }
+            task_data = self._build_task_data(task_analysis)
+            
+            # Execute task with the selected strategy
+            start_time = time.perf_counter()
+            if strategy == 'fanout':
+                result, executions = await self._dispatch_fanout(ranked_agents, task_data)
+            elif strategy == 'first_success':
+                result, executions = await self._dispatch_first_success(ranked_agents, task_data)
+            elif strategy == 'hedged':
+                result, executions = await self._dispatch_hedged(ranked_agents, task_data)
+            else:
+                result, executions = await self._dispatch_single(ranked_agents[0], task_data)
+            elapsed = time.perf_counter() - start_time
             
-            # Execute task
-            result = await self.agent_manager.execute_task(selected_agent.agent_id, task_data)
+            self._record_strategy_metrics(strategy, self._result_succeeded(result), elapsed, len(executions))
             
             # Log task execution
-            self._log_task_execution(task_analysis, selected_agent, result)
+            for agent, agent_result in executions:
+                self._log_task_execution(task_analysis, agent, agent_result)
+            
+            selected_agent = self._primary_agent(result, executions)
             
             return {
                 'success': True,
                 'result': result,
                 'agent_used': selected_agent.name,
                 'agent_id': selected_agent.agent_id,
+                'agents_used': [agent.name for agent, _ in executions],
+                'strategy': strategy,
                 'task_type': task_type
             }
             
@@ -113,6 +184,171 @@ class TaskDispatcher:
                 'task_type': task_analysis.get('task_type', 'unknown')
             }
     
+    async def dispatch_many(self, tasks: List[Dict[str, Any]], concurrency: int = 5) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Dispatch a batch of tasks with bounded concurrency
+        
+        Tasks are routed once per (task_type, capabilities, priority) and grouped by
+        the selected agent. Agents with `supports_batch` receive their tasks as lists of
+        up to `max_batch_size`; all others get one task per call. A failing task never
+        aborts the batch.
+        
+        Args:
+            tasks: Task analyses, in the same format as dispatch_task
+            concurrency: Maximum number of agent calls in flight
+            
+        Yields:
+            Dispatch results in completion order, each tagged with the task's
+            `index` in `tasks`
+        """
+        results = asyncio.Queue()
+        groups: Dict[str, List[Tuple[int, Dict[str, Any]]]] = {}
+        routed_agents: Dict[str, Any] = {}
+        route_cache: Dict[Tuple, Any] = {}
+        tasks = self._classify_untyped(tasks)
+        
+        for index, task_analysis in enumerate(tasks):
+            task_type = task_analysis.get('task_type', 'general')
+            required_capabilities = task_analysis.get('required_capabilities', [])
+            priority = task_analysis.get('priority', 5)
+            route_key = (task_type, tuple(sorted(required_capabilities)), priority)
+            
+            try:
+                if route_key not in route_cache:
+                    suitable_agents = await self._find_suitable_agents(task_type, required_capabilities)
+                    route_cache[route_key] = await self._select_best_agent(suitable_agents, priority)
+                agent = route_cache[route_key]
+            except Exception as e:
+                logger.error(f"❌ Batch routing failed for task {index}: {str(e)}")
+                results.put_nowait({'index': index, 'success': False, 'error': str(e), 'task_type': task_type})
+                continue
+            
+            if not agent:
+                results.put_nowait({
+                    'index': index,
+                    'success': False,
+                    'error': f'No suitable agents found for task type: {task_type}',
+                    'task_type': task_type
+                })
+                continue
+            
+            routed_agents[agent.agent_id] = agent
+            groups.setdefault(agent.agent_id, []).append((index, task_analysis))
+        
+        # Split groups into work units and interleave them so agents share the concurrency
+        agent_units = []
+        for agent_id, items in groups.items():
+            agent = routed_agents[agent_id]
+            unit_size = max(1, getattr(agent, 'max_batch_size', 1)) if getattr(agent, 'supports_batch', False) else 1
+            agent_units.append([(agent, items[i:i + unit_size]) for i in range(0, len(items), unit_size)])
+        
+        work = asyncio.Queue()
+        for round_units in zip_longest(*agent_units):
+            for unit in round_units:
+                if unit:
+                    work.put_nowait(unit)
+        
+        async def worker():
+            while True:
+                try:
+                    agent, items = work.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                for result in await self._execute_batch_unit(agent, items):
+                    results.put_nowait(result)
+        
+        workers = [asyncio.create_task(worker()) for _ in range(min(max(1, concurrency), work.qsize()))]
+        
+        try:
+            for _ in range(len(tasks)):
+                yield await results.get()
+        finally:
+            for task in workers:
+                task.cancel()
+    
+    async def _execute_batch_unit(self, agent: Any, items: List[Tuple[int, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Execute one work unit of a batch, never raising"""
+        task_list = [self._build_task_data(task_analysis) for _, task_analysis in items]
+        
+        try:
+            if len(task_list) == 1:
+                agent_results = [await self.agent_manager.execute_task(agent.agent_id, task_list[0])]
+            else:
+                agent_results = await self.agent_manager.execute_batch(agent.agent_id, task_list)
+        except Exception as e:
+            logger.error(f"❌ Batch execution failed on {agent.name}: {str(e)}")
+            agent_results = [{'success': False, 'error': str(e), 'agent_id': agent.agent_id} for _ in items]
+        
+        dispatched = []
+        for (index, task_analysis), result in zip(items, agent_results):
+            self._log_task_execution(task_analysis, agent, result)
+            item = {
+                'index': index,
+                'success': self._result_succeeded(result),
+                'result': result,
+                'agent_used': agent.name,
+                'agent_id': agent.agent_id,
+                'task_type': task_analysis.get('task_type', 'general')
+            }
+            if not item['success']:
+                inner = result.get('result')
+                item['error'] = result.get('error') or (inner.get('error') if isinstance(inner, dict) else None)
+            dispatched.append(item)
+        
+        return dispatched
+    
+    def _result_succeeded(self, result: Dict[str, Any]) -> bool:
+        """Whether an execution succeeded, including the agent's own success flag"""
+        if not result.get('success'):
+            return False
+        inner = result.get('result')
+        return not (isinstance(inner, dict) and inner.get('success') is False)
+    
+    def _result_error(self, result: Dict[str, Any]) -> str:
+        """Error of a failed execution, or of the agent's own failed result"""
+        inner = result.get('result')
+        nested = inner.get('error') if isinstance(inner, dict) else None
+        return result.get('error') or nested or 'unknown error'
+    
+    def _classify_untyped(self, tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Fill in missing task types with the intent classifier, one batch for all tasks"""
+        untyped = [index for index, task in enumerate(tasks) if not task.get('task_type')]
+        if not untyped or self.intent_classifier is None:
+            return tasks
+        
+        tasks = list(tasks)
+        predictions = self.intent_classifier.classify([tasks[index].get('content', '') for index in untyped])
+        for index, (task_type, confidence) in zip(untyped, predictions):
+            if task_type is not None:
+                tasks[index] = {**tasks[index], 'task_type': task_type, 'confidence': confidence}
+        return tasks
+    
+    def _build_task_data(self, task_analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the task payload handed to agents from a task analysis"""
+        task_data = {
+            'task_type': task_analysis.get('task_type', 'general'),
+            'content': task_analysis.get('content', ''),
+            'user_id': task_analysis.get('user_id', 'default'),
+            'priority': task_analysis.get('priority', 5),
+            'timestamp': datetime.now().isoformat(),
+            'required_capabilities': task_analysis.get('required_capabilities', []),
+            'timeout': task_analysis.get('timeout') or self._timeout_for_priority(task_analysis.get('priority', 5))
+        }
+
+        # Workflow steps also carry their description and the results of the steps they depend on
+        for key in ('step_id', 'description', 'inputs'):
+            if key in task_analysis:
+                task_data[key] = task_analysis[key]
+
+        return task_data
+    
+    def _timeout_for_priority(self, priority: int) -> float:
+        """Task deadline in seconds for a priority level"""
+        for min_priority, timeout in self.priority_timeouts:
+            if priority >= min_priority:
+                return timeout
+        return self.priority_timeouts[-1][1]
+    
     async def _find_suitable_agents(self, task_type: str, required_capabilities: List[str]) -> List[Any]:
         """Find agents suitable for the task"""
         suitable_agents = []
@@ -120,6 +356,9 @@ class TaskDispatcher:
         # Get routing rules for task type
         preferred_agents = self.routing_rules.get(task_type, [])
         
+        # Load any deferred agents that serve this task before they can be ranked
+        await self.agent_manager.load_lazy_agents(task_type, required_capabilities)
+        
         # Get all enabled agents
         enabled_agents = await self.agent_manager.get_enabled_agents()
         
@@ -130,10 +369,7 @@ class TaskDispatcher:
             )
             
             # Check if agent is in preferred list or has matching capabilities
-            is_preferred = any(
-                preferred_agent in agent.name.lower() 
-                for preferred_agent in preferred_agents
-            )
+            is_preferred = self._is_preferred(agent, preferred_agents)
             
             if has_capabilities or is_preferred:
                 suitable_agents.append(agent)
@@ -144,6 +380,33 @@ class TaskDispatcher:
         
         return suitable_agents
     
+    def _is_preferred(self, agent: Any, preferred_agents: List[str]) -> bool:
+        """Whether a routing rule names the agent, by ID or as part of its name"""
+        return any(
+            preferred_agent == agent.agent_id or preferred_agent in agent.name.lower()
+            for preferred_agent in preferred_agents
+        )
+    
+    def _multi_agent_candidates(self, task_type: str, required_capabilities: List[str],
+                                ranked_agents: List[Any]) -> List[Any]:
+        """
+        Agents a fanout, first_success or hedged dispatch may run the task on
+        
+        Only agents named by the task type's routing rule, or holding every required
+        capability when some are given, qualify - the looser matches that are fine
+        for picking one agent would otherwise put every enabled agent to work. At
+        most `max_fanout` are kept, in rank order; without any the best-ranked
+        agent runs alone.
+        """
+        preferred_agents = self.routing_rules.get(task_type, [])
+        candidates = [
+            agent for agent in ranked_agents
+            if self._is_preferred(agent, preferred_agents) or (
+                required_capabilities and all(agent.has_capability(cap) for cap in required_capabilities)
+            )
+        ]
+        return candidates[:self.max_fanout] or ranked_agents[:1]
+    
     async def _fuzzy_match_agents(self, task_type: str, agents: List[Any]) -> List[Any]:
         """Fuzzy match agents based on task type keywords"""
         task_keywords = self._extract_keywords(task_type)
@@ -170,14 +433,183 @@ class TaskDispatcher:
         keywords = [word for word in words if word not in common_words and len(word) > 2]
         return keywords
     
+    def _resolve_strategy(self, task_type: str, requested: Optional[str]) -> str:
+        """Pick the dispatch strategy for a task, falling back to 'single'"""
+        strategy = requested or self.dispatch_strategies.get(task_type, 'single')
+        if strategy not in self.DISPATCH_STRATEGIES:
+            logger.warning(f"⚠️ Unknown dispatch strategy '{strategy}', using 'single'")
+            return 'single'
+        return strategy
+    
+    async def _dispatch_single(self, agent: Any, task_data: Dict[str, Any]) -> Tuple[Dict[str, Any], List[Tuple[Any, Dict[str, Any]]]]:
+        """Run the task on a single agent"""
+        result = await self.agent_manager.execute_task(agent.agent_id, task_data)
+        return result, [(agent, result)]
+    
+    async def _dispatch_fanout(self, agents: List[Any], task_data: Dict[str, Any]) -> Tuple[Dict[str, Any], List[Tuple[Any, Dict[str, Any]]]]:
+        """Run the task on every candidate concurrently and merge the results"""
+        if len(agents) == 1:
+            return await self._dispatch_single(agents[0], task_data)
+        
+        outcomes = await asyncio.gather(
+            *(self.agent_manager.execute_task(agent.agent_id, dict(task_data)) for agent in agents),
+            return_exceptions=True
+        )
+        
+        executions = []
+        for agent, outcome in zip(agents, outcomes):
+            if isinstance(outcome, BaseException):
+                outcome = {'success': False, 'error': str(outcome), 'agent_id': agent.agent_id}
+            executions.append((agent, outcome))
+        
+        successful = [(agent, outcome) for agent, outcome in executions if self._result_succeeded(outcome)]
+        primary = successful[0][0] if successful else agents[0]
+        
+        merged = {
+            'success': bool(successful),
+            'result': {agent.name: outcome.get('result') for agent, outcome in successful},
+            'results': {agent.name: outcome for agent, outcome in executions},
+            'agent_id': primary.agent_id,
+            'response_time': max((outcome.get('response_time', 0) for _, outcome in executions), default=0)
+        }
+        if not successful:
+            merged['error'] = '; '.join(
+                f"{agent.name}: {self._result_error(outcome)}" for agent, outcome in executions
+            )
+        
+        return merged, executions
+    
+    async def _dispatch_first_success(self, agents: List[Any], task_data: Dict[str, Any]) -> Tuple[Dict[str, Any], List[Tuple[Any, Dict[str, Any]]]]:
+        """Run the task on every candidate concurrently and keep the first good result"""
+        if len(agents) == 1:
+            return await self._dispatch_single(agents[0], task_data)
+        
+        running = {
+            asyncio.create_task(self.agent_manager.execute_task(agent.agent_id, dict(task_data))): agent
+            for agent in agents
+        }
+        return await self._race(running, 'first_success')
+    
+    async def _dispatch_hedged(self, agents: List[Any], task_data: Dict[str, Any]) -> Tuple[Dict[str, Any], List[Tuple[Any, Dict[str, Any]]]]:
+        """
+        Run the task on the best agent and hedge with a backup once it exceeds its p95 latency
+        A primary that fails before the hedge delay hands over to the backup right away.
+        """
+        if len(agents) == 1:
+            return await self._dispatch_single(agents[0], task_data)
+        
+        primary, backup = agents[0], agents[1]
+        hedge_delay = self._get_hedge_delay(primary)
+        
+        primary_task = asyncio.create_task(self.agent_manager.execute_task(primary.agent_id, dict(task_data)))
+        try:
+            done, _ = await asyncio.wait({primary_task}, timeout=hedge_delay)
+        except asyncio.CancelledError:
+            primary_task.cancel()
+            raise
+        
+        if done:
+            result = self._collect_result(primary_task, primary)
+            if self._result_succeeded(result):
+                return result, [(primary, result)]
+            
+            logger.info(f"⚠️ {primary.name} failed before the hedge delay, hedging with {backup.name} now")
+            self.strategy_metrics['hedged']['hedges_fired'] += 1
+            backup_result = await self.agent_manager.execute_task(backup.agent_id, dict(task_data))
+            executions = [(primary, result), (backup, backup_result)]
+            if not self._result_succeeded(backup_result):
+                return result, executions
+            self.strategy_metrics['hedged']['hedge_wins'] += 1
+            return backup_result, executions
+        
+        logger.info(f"⏱️ {primary.name} exceeded hedge delay {hedge_delay:.2f}s, hedging with {backup.name}")
+        self.strategy_metrics['hedged']['hedges_fired'] += 1
+        
+        backup_task = asyncio.create_task(self.agent_manager.execute_task(backup.agent_id, dict(task_data)))
+        result, executions = await self._race({primary_task: primary, backup_task: backup}, 'hedged')
+        
+        if self._result_succeeded(result) and result.get('agent_id') == backup.agent_id:
+            self.strategy_metrics['hedged']['hedge_wins'] += 1
+        
+        return result, executions
+    
+    async def _race(self, running: Dict[asyncio.Task, Any], strategy: str) -> Tuple[Dict[str, Any], List[Tuple[Any, Dict[str, Any]]]]:
+        """Wait for the first successful result among running tasks and cancel the rest"""
+        pending = set(running)
+        executions = []
+        result = None
+        
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    agent = running[task]
+                    outcome = self._collect_result(task, agent)
+                    executions.append((agent, outcome))
+                    if self._result_succeeded(outcome) and (result is None or not self._result_succeeded(result)):
+                        result = outcome
+                    elif result is None:
+                        result = outcome
+                if result and self._result_succeeded(result):
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+            self.strategy_metrics[strategy]['cancelled'] += len(pending)
+        
+        return result, executions
+    
+    def _collect_result(self, task: asyncio.Task, agent: Any) -> Dict[str, Any]:
+        """Turn a finished execution task into a result dict"""
+        if task.cancelled():
+            return {'success': False, 'error': 'cancelled', 'agent_id': agent.agent_id}
+        if task.exception():
+            return {'success': False, 'error': str(task.exception()), 'agent_id': agent.agent_id}
+        return task.result()
+    
+    def _primary_agent(self, result: Dict[str, Any], executions: List[Tuple[Any, Dict[str, Any]]]) -> Any:
+        """Return the agent whose result was used"""
+        for agent, _ in executions:
+            if agent.agent_id == result.get('agent_id'):
+                return agent
+        return executions[0][0]
+    
+    def _get_hedge_delay(self, agent: Any) -> float:
+        """Delay before hedging: the agent's p95 latency, or a default without enough history"""
+        latency = getattr(agent, 'latency', None)
+        if latency is None or latency.count < self.hedge_min_samples:
+            return self.hedge_default_delay
+        return latency.p95
+    
+    def _record_strategy_metrics(self, strategy: str, success: bool, elapsed: float, agents_invoked: int):
+        """Update per-strategy dispatch metrics"""
+        metrics = self.strategy_metrics[strategy]
+        metrics['dispatches'] += 1
+        if success:
+            metrics['successes'] += 1
+        else:
+            metrics['failures'] += 1
+        metrics['agents_invoked'] += agents_invoked
+        metrics['total_time'] += elapsed
+        metrics['avg_time'] = metrics['total_time'] / metrics['dispatches']
+        metrics['max_time'] = max(metrics['max_time'], elapsed)
+    
     async def _select_best_agent(self, suitable_agents: List[Any], priority: int) -> Optional[Any]:
         """Select the best agent based on load balancing and priority"""
+        ranked_agents = await self._rank_agents(suitable_agents, priority)
+        return ranked_agents[0] if ranked_agents else None
+    
+    async def _rank_agents(self, suitable_agents: List[Any], priority: int) -> List[Any]:
+        """Order suitable agents from best to worst based on load balancing and priority"""
         if not suitable_agents:
-            return None
+            return []
         
         # Get agent statuses
         agent_statuses = await self.agent_manager.get_all_status()
         
+        if self.scoring_mode == 'expected_completion':
+            return self._rank_by_expected_completion(suitable_agents, agent_statuses)
+        
         # Score agents based on multiple factors
         agent_scores = []
         
@@ -190,13 +622,53 @@ class TaskDispatcher:
             score = self._calculate_agent_score(agent, status, priority)
             agent_scores.append((score, agent))
         
-        # Sort by score (higher is better) and return the best
+        # Sort by score (higher is better)
         agent_scores.sort(key=lambda x: x[0], reverse=True)
         
-        if agent_scores:
-            return agent_scores[0][1]
+        return [agent for _, agent in agent_scores]
+    
+    def _rank_by_expected_completion(self, suitable_agents: List[Any], agent_statuses: Dict[str, Any]) -> List[Any]:
+        """
+        Order agents by expected completion time (least outstanding work first)
+        With power-of-two-choices the head of the list is the better of two randomly
+        sampled agents, which avoids every dispatcher piling onto the same agent.
+        """
+        candidates = [agent for agent in suitable_agents if agent.agent_id in agent_statuses]
+        costs = {
+            agent.agent_id: self._expected_completion_time(agent, agent_statuses[agent.agent_id])
+            for agent in candidates
+        }
+        ranked = sorted(candidates, key=lambda agent: costs[agent.agent_id])
+        
+        if self.power_of_two_choices and len(ranked) > 2:
+            healthy = [agent for agent in ranked if agent_statuses[agent.agent_id].status != 'error']
+            if len(healthy) >= 2:
+                first, second = random.sample(healthy, 2)
+                choice = first if costs[first.agent_id] <= costs[second.agent_id] else second
+                ranked.remove(choice)
+                ranked.insert(0, choice)
         
-        return None
+        return ranked
+    
+    def _expected_completion_time(self, agent: Any, status: Any) -> float:
+        """Expected seconds until this agent returns a successful result for a new task"""
+        latency = getattr(agent, 'latency', None)
+        if latency is not None:
+            completion_time = latency.expected_completion_time(self.default_latency)
+        else:
+            service_time = status.avg_response_time or self.default_latency
+            completion_time = service_time * (getattr(status, 'in_flight', 0) + 1)
+        
+        # Failed attempts have to be retried elsewhere, so scale by the success rate
+        attempts = status.task_count + status.error_count
+        if attempts > 0:
+            success_rate = max(status.task_count / attempts, 0.1)
+            completion_time /= success_rate
+        
+        if status.status == 'error':
+            completion_time *= 10
+        
+        return completion_time
     
     def _calculate_agent_score(self, agent: Any, status: Any, priority: int) -> float:
         """Calculate agent score for selection"""
@@ -256,7 +728,8 @@ class TaskDispatcher:
                 'success_rate': 0,
                 'avg_response_time': 0,
                 'task_types': {},
-                'agent_performance': {}
+                'agent_performance': {},
+                'strategy_metrics': await self.get_strategy_metrics()
             }
         
         total_tasks = len(self.task_history)
@@ -298,9 +771,28 @@ class TaskDispatcher:
             'success_rate': success_rate,
             'avg_response_time': avg_response_time,
             'task_types': task_types,
-            'agent_performance': agent_performance
+            'agent_performance': agent_performance,
+            'strategy_metrics': await self.get_strategy_metrics()
         }
     
+    async def get_strategy_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Get per-strategy dispatch metrics"""
+        return {strategy: metrics.copy() for strategy, metrics in self.strategy_metrics.items()}
+    
+    async def set_scoring_mode(self, mode: str):
+        """Set the agent scoring mode"""
+        if mode not in self.SCORING_MODES:
+            raise ValueError(f"Unknown scoring mode: {mode}")
+        self.scoring_mode = mode
+        logger.info(f"📋 Set agent scoring mode: {mode}")
+    
+    async def set_dispatch_strategy(self, task_type: str, strategy: str):
+        """Set the default dispatch strategy for a task type"""
+        if strategy not in self.DISPATCH_STRATEGIES:
+            raise ValueError(f"Unknown dispatch strategy: {strategy}")
+        self.dispatch_strategies[task_type] = strategy
+        logger.info(f"📋 Set dispatch strategy: {task_type} -> {strategy}")
+    
     async def add_routing_rule(self, task_type: str, agent_names: List[str]):
         """Add a new routing rule"""
         self.routing_rules[task_type] = agent_names
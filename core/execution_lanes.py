@@ -0,0 +1,240 @@
+"""
+FreelanceX.AI Execution Lanes
+Separate lanes for agent work so CPU-bound tasks never block the event loop
+"""
+
+import asyncio
+import importlib
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Any, Optional, Iterable, List
+
+logger = logging.getLogger(__name__)
+
+# Heavy libraries imported once when a pool worker starts
+DEFAULT_PRELOAD_MODULES = ('numpy', 'pandas', 'scipy.stats', 'sklearn.linear_model')
+
+# Per-process state of pool workers
+_worker_agents: Dict[str, Any] = {}
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _agent_path(agent: Any) -> str:
+    """Importable 'module:Class' path of an agent, or of the agent a ManagedAgent wraps"""
+    agent_class = type(getattr(agent, 'wrapped_agent', agent))
+    return f"{agent_class.__module__}:{agent_class.__qualname__}"
+
+
+def task_handler(agent: Any):
+    """
+    The coroutine method an agent runs tasks with, as AgentManager dispatches them:
+    execute_task for core.base_agent agents (what ManagedAgent.process_task calls),
+    process_task for agents built on the manager's BaseAgent
+    """
+    return getattr(agent, 'execute_task', None) or agent.process_task
+
+
+def _get_worker_agent(agent_path: str) -> Any:
+    """Return this worker's instance of an agent, creating it on first use"""
+    agent = _worker_agents.get(agent_path)
+    if agent is None:
+        module_name, class_name = agent_path.split(':')
+        agent = getattr(importlib.import_module(module_name), class_name)()
+        _worker_agents[agent_path] = agent
+    return agent
+
+
+def _warm_worker(preload_modules: Iterable[str], agent_paths: Iterable[str]):
+    """Pool initializer: import heavy libraries and build agent instances up front"""
+    for module_name in preload_modules:
+        try:
+            importlib.import_module(module_name)
+        except ImportError as e:
+            logger.warning(f"⚠️ Could not preload {module_name} in worker: {str(e)}")
+
+    for agent_path in agent_paths:
+        try:
+            _get_worker_agent(agent_path)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not preload agent {agent_path} in worker: {str(e)}")
+
+
+def _ping() -> int:
+    """No-op used to force worker processes to start"""
+    return os.getpid()
+
+
+def _run_agent_task(agent_path: str, task_data: Dict[str, Any], submitted_at: float) -> Dict[str, Any]:
+    """Run an agent task inside a pool worker (module level so it pickles)"""
+    global _worker_loop
+
+    started_at = time.time()
+    agent = _get_worker_agent(agent_path)
+
+    if _worker_loop is None:
+        _worker_loop = asyncio.new_event_loop()
+
+    result = _worker_loop.run_until_complete(task_handler(agent)(task_data))
+
+    return {
+        'result': result,
+        'wait_time': max(0.0, started_at - submitted_at),
+        'run_time': time.time() - started_at
+    }
+
+
+class ExecutionLane:
+    """
+    Default execution lane
+    Runs agent tasks directly on the event loop
+    """
+
+    def __init__(self, name: str = 'default'):
+        self.name = name
+        self.metrics = {
+            'submitted': 0,
+            'pending': 0,
+            'completed': 0,
+            'failed': 0,
+            'total_wait_time': 0.0,
+            'total_run_time': 0.0,
+            'max_wait_time': 0.0
+        }
+
+    async def start(self):
+        """Prepare the lane for work"""
+        pass
+
+    async def stop(self):
+        """Release lane resources"""
+        pass
+
+    async def run_task(self, agent: Any, task_data: Dict[str, Any]) -> Any:
+        """Run a task for an agent in this lane"""
+        self._task_submitted()
+        start_time = time.perf_counter()
+        try:
+            result = await task_handler(agent)(task_data)
+        except BaseException:
+            self._task_finished(False, 0.0, time.perf_counter() - start_time)
+            raise
+        self._task_finished(True, 0.0, time.perf_counter() - start_time)
+        return result
+
+    def _task_submitted(self):
+        self.metrics['submitted'] += 1
+        self.metrics['pending'] += 1
+
+    def _task_finished(self, success: bool, wait_time: float, run_time: float):
+        self.metrics['pending'] -= 1
+        self.metrics['completed' if success else 'failed'] += 1
+        self.metrics['total_wait_time'] += wait_time
+        self.metrics['total_run_time'] += run_time
+        self.metrics['max_wait_time'] = max(self.metrics['max_wait_time'], wait_time)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return lane queue and timing metrics"""
+        finished = self.metrics['completed'] + self.metrics['failed']
+        return {
+            'name': self.name,
+            **self.metrics,
+            'avg_wait_time': self.metrics['total_wait_time'] / finished if finished else 0.0,
+            'avg_run_time': self.metrics['total_run_time'] / finished if finished else 0.0
+        }
+
+
+class ProcessLane(ExecutionLane):
+    """
+    Process-pool execution lane for CPU-bound agents
+    Tasks run in warm worker processes that pre-import heavy libraries and keep one
+    instance per agent class (the wrapped class for a ManagedAgent). Workers build that
+    instance with no arguments, so it shares no state with the registered agent: agents
+    using this lane must be constructible without arguments and must not rely on
+    per-instance configuration, and task payloads and results must be picklable.
+
+    A task cancelled while running (e.g. by its deadline) releases its caller right
+    away, but its worker keeps running it to completion: a pool cannot stop one
+    worker, and recycling the pool would kill every other caller's task. Until it
+    finishes that worker takes no new tasks; get_stats() reports such workers as
+    'orphaned'.
+    """
+
+    def __init__(self, name: str = 'cpu', max_workers: Optional[int] = None,
+                 preload_modules: Iterable[str] = DEFAULT_PRELOAD_MODULES):
+        super().__init__(name)
+        self.max_workers = max_workers or max(1, (os.cpu_count() or 2) - 1)
+        self.preload_modules: List[str] = list(preload_modules)
+        self.agent_paths: List[str] = []
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.metrics['orphaned'] = 0
+
+    def add_agent(self, agent: Any):
+        """Preload an agent's module and instance in workers started from now on"""
+        agent_path = _agent_path(agent)
+        if agent_path not in self.agent_paths:
+            self.agent_paths.append(agent_path)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self.executor is None:
+            # spawn avoids forking a process that has a running event loop and threads
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_warm_worker,
+                initargs=(tuple(self.preload_modules), tuple(self.agent_paths))
+            )
+        return self.executor
+
+    async def start(self):
+        """Start and warm the worker processes"""
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        start_time = time.perf_counter()
+        await asyncio.gather(*(loop.run_in_executor(executor, _ping) for _ in range(self.max_workers)))
+        logger.info(f"🔥 Lane '{self.name}' warmed {self.max_workers} workers in {time.perf_counter() - start_time:.2f}s")
+
+    async def stop(self):
+        """Shut down the worker processes"""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    async def run_task(self, agent: Any, task_data: Dict[str, Any]) -> Any:
+        """Run a task for an agent in a worker process"""
+        loop = asyncio.get_running_loop()
+        self._task_submitted()
+        submitted_at = time.time()
+
+        future = self._get_executor().submit(_run_agent_task, _agent_path(agent), dict(task_data), submitted_at)
+        try:
+            outcome = await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            if not future.cancelled():
+                # Already running in a worker, which stays busy until the task ends
+                self.metrics['orphaned'] += 1
+                future.add_done_callback(lambda _: loop.call_soon_threadsafe(self._orphan_finished))
+            self._task_finished(False, 0.0, time.time() - submitted_at)
+            raise
+        except BrokenProcessPool:
+            logger.error(f"❌ Lane '{self.name}' worker pool broke, restarting it on next task")
+            self.executor = None
+            self._task_finished(False, 0.0, time.time() - submitted_at)
+            raise
+        except BaseException:
+            self._task_finished(False, 0.0, time.time() - submitted_at)
+            raise
+
+        self._task_finished(True, outcome['wait_time'], outcome['run_time'])
+        return outcome['result']
+
+    def _orphan_finished(self):
+        self.metrics['orphaned'] -= 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = super().get_stats()
+        stats['workers'] = self.max_workers
+        return stats
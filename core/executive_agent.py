@@ -5,15 +5,21 @@ Central coordinator using OpenAI Agent SDK for task delegation and management
 """
 
 import os
-import yaml
 import logging
 import asyncio
-from typing import Dict, Any, List, Optional
+import time
+from typing import Dict, Any, List, Optional, AsyncIterator
 from datetime import datetime
 
 from openai import OpenAI
+from openai_agents import Agent, Session
 from pydantic import BaseModel
 
+from .config_registry import get_config_registry
+from .session_manager import SessionManager, SessionLocks, estimate_tokens, stream_event_text
+from .prompt_cache import PromptCache
+from .model_governor import ModelCallGovernor, CallTicket, get_model_governor, estimate_call_tokens
+
 logger = logging.getLogger(__name__)
 
 class TaskRequest(BaseModel):
@@ -29,7 +35,9 @@ class ExecutiveAgent:
     Manages task delegation and coordination using the OpenAI Agent SDK
     """
     
-    def __init__(self, config_path: str = 'config/system_prompts.yaml'):
+    def __init__(self, config_path: str = 'config/system_prompts.yaml', max_sessions: int = 1000,
+                 session_idle_timeout: float = 1800.0, session_token_budget: int = 4000,
+                 response_cache: Optional[PromptCache] = None, governor: Optional[ModelCallGovernor] = None):
         # Set up logging
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
@@ -53,19 +61,41 @@ class ExecutiveAgent:
             tools=[self._get_task_delegation_tool(), self._get_status_check_tool()]
         )
         
-        # Session management
-        self.sessions: Dict[str, Session] = {}
+        # Session management: bounded number of live sessions, bounded history per session
+        self.sessions = SessionManager(
+            lambda: Session(agent=self.agent),
+            max_sessions=max_sessions,
+            idle_timeout=session_idle_timeout,
+            token_budget=session_token_budget
+        )
+        
+        # Model calls run off the event loop, admitted by the process-wide governor;
+        # calls on the same session are serialized
+        self.governor = governor or get_model_governor()
+        self._session_locks = SessionLocks()
+        self.model_call_metrics = {
+            'calls': 0,
+            'streamed_calls': 0,
+            'failed_calls': 0,
+            'in_flight': 0,
+            'waiting': 0,
+            'total_wait_time': 0.0,
+            'max_wait_time': 0.0,
+            'total_call_time': 0.0
+        }
+        
+        # Responses to stateless prompts (ask); session turns never go through it
+        self.response_cache = response_cache or PromptCache()
         
         self.logger.info('✅ ExecutiveAgent initialized with OpenAI Agent SDK')
     
     def _load_config(self, config_path: str) -> str:
         """Load and validate configuration from YAML file."""
         try:
-            with open(config_path, 'r') as f:
-                config = yaml.safe_load(f)
-                if not config.get('system_prompt'):
-                    raise ValueError("system_prompt not found in config file")
-                return config['system_prompt']
+            config = get_config_registry().load_yaml(config_path)
+            if not config.get('system_prompt'):
+                raise ValueError("system_prompt not found in config file")
+            return config['system_prompt']
         except Exception as e:
             self.logger.error(f"Failed to load config: {str(e)}")
             # Fallback system prompt
@@ -133,11 +163,92 @@ class ExecutiveAgent:
         return check_agent_status
     
     def get_or_create_session(self, user_id: str) -> Session:
-        """Get or create a session for a user"""
-        if user_id not in self.sessions:
-            self.sessions[user_id] = Session(agent=self.agent)
-            self.logger.info(f"Created new session for user: {user_id}")
-        return self.sessions[user_id]
+        """Get or create a session for a user, trimmed to the session token budget"""
+        return self.sessions.get_or_create(user_id)
+    
+    def attach_memory_backend(self, memory_manager):
+        """Archive evicted and closed sessions and persist cached responses in the memory database"""
+        async def persist_session(user_id: str, session: Session):
+            await memory_manager.archive_session(f"executive:{user_id}", user_id, 'executive', session)
+        
+        self.sessions.persist = persist_session
+        self.response_cache.store = memory_manager
+    
+    async def _acquire_model_slot(self, user_id: Optional[str], tokens: int,
+                                  priority: str = 'interactive') -> CallTicket:
+        """Wait for the user's session lock (if any) and the governor; returns the call ticket"""
+        wait_start = time.perf_counter()
+        self.model_call_metrics['waiting'] += 1
+        try:
+            if user_id is not None:
+                await self._session_locks.acquire(user_id)
+            try:
+                ticket = await self.governor.acquire(priority, tokens)
+            except BaseException:
+                if user_id is not None:
+                    self._session_locks.release(user_id)
+                raise
+        finally:
+            self.model_call_metrics['waiting'] -= 1
+        
+        wait_time = time.perf_counter() - wait_start
+        self.model_call_metrics['in_flight'] += 1
+        self.model_call_metrics['total_wait_time'] += wait_time
+        self.model_call_metrics['max_wait_time'] = max(self.model_call_metrics['max_wait_time'], wait_time)
+        return ticket
+    
+    def _release_model_slot(self, user_id: Optional[str], ticket: CallTicket, call_start: float,
+                            error: Optional[BaseException] = None, tokens_used: Optional[int] = None):
+        """Report the call to the governor and release the user's session lock"""
+        self.governor.release(ticket, error=error, tokens_used=tokens_used)
+        if user_id is not None:
+            self._session_locks.release(user_id)
+        
+        self.model_call_metrics['in_flight'] -= 1
+        self.model_call_metrics['calls'] += 1
+        self.model_call_metrics['total_call_time'] += time.perf_counter() - call_start
+        if isinstance(error, Exception):
+            self.model_call_metrics['failed_calls'] += 1
+    
+    async def _run_session(self, user_id: Optional[str], message: str, priority: str = 'interactive') -> Any:
+        """
+        Run one turn of a user's session without blocking the event loop
+        
+        Uses the SDK's async runner when the session has one, otherwise runs the
+        blocking call in a worker thread. With no user_id the turn runs in a
+        throwaway session with no history.
+        """
+        if user_id is None:
+            session = self.sessions.session_factory()
+        else:
+            session = self.get_or_create_session(user_id)
+        prompt_tokens = estimate_call_tokens(self.system_prompt, session, message, completion_tokens=0)
+        ticket = await self._acquire_model_slot(
+            user_id, estimate_call_tokens(self.system_prompt, session, message), priority
+        )
+        call_start = time.perf_counter()
+        try:
+            run_async = getattr(session, 'run_async', None)
+            if run_async is not None:
+                response = await run_async(message)
+            else:
+                response = await asyncio.to_thread(session.run, message)
+        except BaseException as e:
+            self._release_model_slot(user_id, ticket, call_start, error=e)
+            raise
+        self._release_model_slot(user_id, ticket, call_start,
+                                 tokens_used=prompt_tokens + estimate_tokens(self._response_text(response)))
+        return response
+    
+    @staticmethod
+    def _response_text(response: Any) -> str:
+        """Extract the text of an SDK response"""
+        if hasattr(response, 'content'):
+            return response.content
+        elif isinstance(response, str):
+            return response
+        else:
+            return str(response)
     
     async def handle_message(self, message_content: str, user_id: str = "default") -> str:
         """
@@ -153,24 +264,105 @@ class ExecutiveAgent:
         self.logger.info(f"Processing message for user {user_id}: {message_content[:100]}...")
         
         try:
-            # Get or create session for the user
-            session = self.get_or_create_session(user_id)
-            
-            # Process message through the agent
-            response = session.run(message_content)
-            
-            # Extract text from response
-            if hasattr(response, 'content'):
-                return response.content
-            elif isinstance(response, str):
-                return response
-            else:
-                return str(response)
+            response = await self._run_session(user_id, message_content)
+            return self._response_text(response)
                 
         except Exception as e:
             self.logger.error(f"Error processing message: {str(e)}")
             return "I apologize, but I encountered an error processing your request. Please try again."
     
+    def _tool_names(self) -> List[str]:
+        """Names of the tools the agent can call"""
+        return [getattr(tool, '__name__', str(tool)) for tool in getattr(self.agent, 'tools', None) or []]
+    
+    async def ask(self, message_content: str, ttl: Optional[float] = None) -> str:
+        """
+        Answer a standalone prompt without conversation history.
+        
+        Unlike handle_message, the answer depends on the prompt alone, so it is
+        served from the response cache when the same (normalized) prompt was
+        answered recently.
+        
+        Args:
+            message_content: The prompt to answer
+            ttl: Seconds to cache the answer (the cache default if None)
+            
+        Returns:
+            str: The generated response
+        """
+        async def call_model() -> str:
+            return self._response_text(await self._run_session(None, message_content))
+        
+        try:
+            return await self.response_cache.get_or_call(
+                getattr(self.agent, 'model', ''),
+                self.system_prompt,
+                message_content,
+                call_model,
+                tools=self._tool_names(),
+                ttl=ttl
+            )
+        except Exception as e:
+            self.logger.error(f"Error answering prompt: {str(e)}")
+            return "I apologize, but I encountered an error processing your request. Please try again."
+    
+    async def stream_message(self, message_content: str, user_id: str = "default") -> AsyncIterator[str]:
+        """
+        Handle a message, yielding the response text as it is generated.
+        
+        Uses the SDK's streaming runner when the session has one; otherwise the
+        complete response is yielded as a single chunk.
+        
+        Args:
+            message_content: The input message to process
+            user_id: User identifier for session management
+            
+        Yields:
+            str: Response text chunks
+        """
+        self.logger.info(f"Streaming message for user {user_id}: {message_content[:100]}...")
+        
+        session = self.get_or_create_session(user_id)
+        if getattr(session, 'run_streamed', None) is None:
+            yield await self.handle_message(message_content, user_id)
+            return
+        
+        emitted = []
+        prompt_tokens = estimate_call_tokens(self.system_prompt, session, message_content, completion_tokens=0)
+        try:
+            ticket = await self._acquire_model_slot(
+                user_id, estimate_call_tokens(self.system_prompt, session, message_content)
+            )
+        except Exception as e:
+            self.logger.error(f"Error streaming message: {str(e)}")
+            yield "I apologize, but I encountered an error processing your request. Please try again."
+            return
+        
+        self.model_call_metrics['streamed_calls'] += 1
+        call_start = time.perf_counter()
+        error = None
+        try:
+            try:
+                # Re-fetch: the session may have been evicted while waiting for a slot
+                stream = self.get_or_create_session(user_id).run_streamed(message_content)
+                async for event in stream:
+                    text = stream_event_text(event)
+                    if text:
+                        emitted.append(text)
+                        yield text
+            except Exception as e:
+                error = e
+                self.logger.error(f"Error streaming message: {str(e)}")
+                if not emitted:
+                    yield "I apologize, but I encountered an error processing your request. Please try again."
+            except BaseException as e:
+                # The consumer closed the stream early or was cancelled
+                error = e
+                raise
+        finally:
+            self._release_model_slot(user_id, ticket, call_start, error=error,
+                                     tokens_used=prompt_tokens + estimate_tokens(''.join(emitted)))
+    
     async def execute_task(self, task: Dict[str, Any], user_id: str = "default") -> Dict[str, Any]:
         """
         Execute a task using OpenAI Agent SDK.
@@ -189,14 +381,11 @@ class ExecutiveAgent:
             if not isinstance(task, dict) or 'type' not in task:
                 raise ValueError("Invalid task format")
             
-            # Get or create session for the user
-            session = self.get_or_create_session(user_id)
-            
             # Format task as a message for the agent
             task_message = f"Execute task: {task['type']} - {task.get('description', 'No description provided')}"
             
             # Process through the agent
-            response = session.run(task_message)
+            response = await self._run_session(user_id, task_message)
             
             result = {
                 'status': 'completed',
@@ -212,16 +401,14 @@ class ExecutiveAgent:
             self.logger.error(f"Task execution failed: {str(e)}")
             return {
                 'status': 'failed',
-                'task_id': task.get('id'),
+                'task_id': task.get('id') if isinstance(task, dict) else None,
                 'error': str(e),
                 'timestamp': datetime.now().isoformat()
             }
     
     def close_session(self, user_id: str):
         """Close a user session"""
-        if user_id in self.sessions:
-            del self.sessions[user_id]
-            self.logger.info(f"Closed session for user: {user_id}")
+        self.sessions.close(user_id)
     
     def get_session_history(self, user_id: str) -> List[Dict[str, Any]]:
         """Get session history for a user"""
@@ -229,3 +416,21 @@ class ExecutiveAgent:
         if session and hasattr(session, 'messages'):
             return [{'role': msg.role, 'content': msg.content} for msg in session.messages]
         return []
+    
+    def get_session_stats(self) -> Dict[str, Any]:
+        """Get live session counts and eviction statistics"""
+        return self.sessions.get_stats()
+    
+    def get_model_call_stats(self) -> Dict[str, Any]:
+        """Get this agent's model call statistics and the shared governor's state"""
+        calls = self.model_call_metrics['calls']
+        return {
+            **self.model_call_metrics,
+            'governor': self.governor.get_stats(),
+            'avg_wait_time': self.model_call_metrics['total_wait_time'] / calls if calls else 0.0,
+            'avg_call_time': self.model_call_metrics['total_call_time'] / calls if calls else 0.0
+        }
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get response cache hit rates and estimated savings"""
+        return self.response_cache.get_stats()
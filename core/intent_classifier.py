@@ -0,0 +1,201 @@
+"""
+FreelanceX.AI Intent Classifier
+Hashed bag-of-words naive Bayes model that classifies batches of messages with one matrix multiply
+"""
+
+import logging
+import os
+import re
+import zlib
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL_PATH = 'data/intent_classifier.npz'
+MODEL_FORMAT_VERSION = 1
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+# Token -> bucket, per feature count; cleared when it grows past the limit
+_bucket_caches: Dict[int, Dict[str, int]] = {}
+BUCKET_CACHE_LIMIT = 200_000
+
+
+def hash_features(texts: Sequence[str], n_features: int = 4096) -> np.ndarray:
+    """
+    Hashed unigram + bigram features, log-scaled counts
+
+    Tokens are bucketed with crc32, which (unlike hash()) is stable across processes.
+
+    Returns:
+        float32 array of shape (len(texts), n_features)
+    """
+    buckets = _bucket_caches.setdefault(n_features, {})
+    if len(buckets) > BUCKET_CACHE_LIMIT:
+        buckets.clear()
+
+    rows: List[int] = []
+    cols: List[int] = []
+    for row, text in enumerate(texts):
+        tokens = TOKEN_PATTERN.findall((text or '').lower())
+        grams = tokens + [f"{first} {second}" for first, second in zip(tokens, tokens[1:])]
+        for gram in grams:
+            bucket = buckets.get(gram)
+            if bucket is None:
+                bucket = buckets[gram] = zlib.crc32(gram.encode('utf-8')) % n_features
+            cols.append(bucket)
+        rows.extend([row] * len(grams))
+
+    features = np.zeros((len(texts), n_features), dtype=np.float32)
+    if cols:
+        cells, counts = np.unique(np.asarray(rows) * n_features + np.asarray(cols), return_counts=True)
+        features.flat[cells] = np.log1p(counts)
+    return features
+
+
+class IntentClassifier:
+    """
+    Multinomial naive Bayes over hashed bag-of-words features
+    Scores are a single (messages x features) @ (features x labels) product, so a
+    batch costs little more than one message. Predictions below `min_confidence`,
+    and messages with no tokens, are left to the caller's keyword rules.
+    """
+
+    def __init__(self, labels: Sequence[str], weights: np.ndarray, bias: np.ndarray,
+                 n_features: int, min_confidence: float = 0.6):
+        self.labels = list(labels)
+        self.weights = np.ascontiguousarray(weights, dtype=np.float32)  # (n_features, n_labels)
+        self.bias = np.asarray(bias, dtype=np.float32)                  # (n_labels,)
+        self.n_features = n_features
+        self.min_confidence = min_confidence
+
+    @classmethod
+    def train(cls, texts: Sequence[str], labels: Sequence[str], n_features: int = 4096,
+              alpha: float = 0.1, chunk_size: int = 2048, **kwargs) -> 'IntentClassifier':
+        """
+        Fit the model in one pass over the data, featurizing `chunk_size` messages at a time
+
+        Raises:
+            ValueError: Fewer than two distinct labels, or texts and labels differ in length
+        """
+        if len(texts) != len(labels):
+            raise ValueError("texts and labels must have the same length")
+        label_names = sorted(set(labels))
+        if len(label_names) < 2:
+            raise ValueError("At least two distinct labels are needed to train a classifier")
+
+        index = {label: i for i, label in enumerate(label_names)}
+        targets = np.array([index[label] for label in labels])
+        feature_counts = np.zeros((len(label_names), n_features), dtype=np.float64)
+
+        for start in range(0, len(texts), chunk_size):
+            features = hash_features(texts[start:start + chunk_size], n_features)
+            onehot = np.eye(len(label_names), dtype=np.float32)[targets[start:start + chunk_size]]
+            feature_counts += onehot.T @ features
+
+        smoothed = feature_counts + alpha
+        weights = np.log(smoothed / smoothed.sum(axis=1, keepdims=True)).T
+        bias = np.log(np.bincount(targets, minlength=len(label_names)) / len(targets))
+        return cls(label_names, weights, bias, n_features, **kwargs)
+
+    def _probabilities(self, features: np.ndarray) -> np.ndarray:
+        scores = features @ self.weights + self.bias
+        scores -= scores.max(axis=1, keepdims=True)
+        np.exp(scores, out=scores)
+        scores /= scores.sum(axis=1, keepdims=True)
+        return scores
+
+    def predict_proba(self, texts: Sequence[str]) -> np.ndarray:
+        """Label probabilities, shape (len(texts), len(labels))"""
+        return self._probabilities(hash_features(texts, self.n_features))
+
+    def classify(self, texts: Sequence[str]) -> List[Tuple[Optional[str], float]]:
+        """(label, confidence) per message; label is None when the model is not confident"""
+        if not texts:
+            return []
+        features = hash_features(texts, self.n_features)
+        probabilities = self._probabilities(features)
+
+        best = probabilities.argmax(axis=1)
+        confidence = probabilities[np.arange(len(texts)), best]
+        has_tokens = features.any(axis=1)
+
+        return [
+            (self.labels[label] if known and conf >= self.min_confidence else None, float(conf))
+            for label, conf, known in zip(best, confidence, has_tokens)
+        ]
+
+    def classify_one(self, text: str) -> Tuple[Optional[str], float]:
+        """Classify a single message"""
+        return self.classify([text])[0]
+
+    def save(self, path: str = DEFAULT_MODEL_PATH):
+        """Write the model as a compressed .npz artifact"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        np.savez_compressed(
+            path,
+            format_version=np.array(MODEL_FORMAT_VERSION),
+            labels=np.array(self.labels),
+            weights=self.weights,
+            bias=self.bias,
+            n_features=np.array(self.n_features),
+            min_confidence=np.array(self.min_confidence)
+        )
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_MODEL_PATH) -> 'IntentClassifier':
+        """
+        Read a model written by save()
+
+        Raises:
+            FileNotFoundError: No artifact at the path
+            ValueError: The artifact has an unsupported format version
+        """
+        with np.load(path, allow_pickle=False) as artifact:
+            version = int(artifact['format_version'])
+            if version != MODEL_FORMAT_VERSION:
+                raise ValueError(f"Unsupported intent model format version: {version}")
+            return cls(
+                labels=[str(label) for label in artifact['labels']],
+                weights=artifact['weights'],
+                bias=artifact['bias'],
+                n_features=int(artifact['n_features']),
+                min_confidence=float(artifact['min_confidence'])
+            )
+
+    def get_info(self) -> Dict[str, Any]:
+        """Return the model's labels and size"""
+        return {
+            'labels': self.labels,
+            'n_features': self.n_features,
+            'min_confidence': self.min_confidence,
+            'size_bytes': self.weights.nbytes + self.bias.nbytes
+        }
+
+
+_classifiers: Dict[str, Optional[IntentClassifier]] = {}
+
+
+def get_intent_classifier(path: Optional[str] = None) -> Optional[IntentClassifier]:
+    """Load a model artifact once per process; None (keyword routing only) if it is missing or invalid"""
+    path = path or DEFAULT_MODEL_PATH
+    if path not in _classifiers:
+        try:
+            _classifiers[path] = IntentClassifier.load(path)
+            logger.info(f"✅ Loaded intent classifier from {path}")
+        except FileNotFoundError:
+            logger.info(f"📋 No intent classifier at {path}, using keyword routing")
+            _classifiers[path] = None
+        except Exception as e:
+            logger.error(f"❌ Failed to load intent classifier from {path}: {str(e)}")
+            _classifiers[path] = None
+    return _classifiers[path]
+
+
+def get_configured_intent_classifier(config=None) -> Optional[IntentClassifier]:
+    """Load the model at the config's system intent_model_path, or at the default path"""
+    path = config.get_system_setting('intent_model_path') if config else None
+    return get_intent_classifier(path)
@@ -0,0 +1,68 @@
+"""
+FreelanceX.AI Keyword Matcher
+Single-pass matching of many keyword groups with one compiled regex
+"""
+
+import re
+from typing import Dict, Iterable, List, Set
+
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """Regex alternation shaped like a trie, so shared prefixes are tested once"""
+    trie: Dict[str, dict] = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # A keyword ends here: the longer continuation is optional (and tried first)
+        return f'(?:{body})?' if '' in node else body
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """
+    Matches keyword groups against text in one pass
+    Keywords match case-insensitively at the start of a word ('plan' matches
+    'planning' but 'now' does not fire inside 'know'). When a keyword is a prefix
+    of a longer one ('time' / 'timeline'), both are reported for the longer match.
+    """
+
+    def __init__(self, groups: Dict[str, Iterable[str]]):
+        self.groups: Dict[str, List[str]] = {name: [kw.lower() for kw in kws] for name, kws in groups.items()}
+
+        self._keyword_groups: Dict[str, List[str]] = {}
+        for name, keywords in self.groups.items():
+            for keyword in keywords:
+                self._keyword_groups.setdefault(keyword, []).append(name)
+
+        keywords = sorted(self._keyword_groups)
+        self._implied = {
+            keyword: [other for other in keywords if keyword.startswith(other)]
+            for keyword in keywords
+        }
+        self.pattern = re.compile(r'(?<!\w)' + _trie_pattern(keywords)) if keywords else None
+
+    def matches(self, text: str) -> Set[str]:
+        """Distinct keywords found in the text"""
+        if self.pattern is None or not text:
+            return set()
+        found = set()
+        for keyword in set(self.pattern.findall(text.lower())):
+            found.update(self._implied[keyword])
+        return found
+
+    def scan(self, text: str) -> Dict[str, Set[str]]:
+        """Keywords found in the text, grouped by the groups they belong to"""
+        hits: Dict[str, Set[str]] = {}
+        for keyword in self.matches(text):
+            for name in self._keyword_groups[keyword]:
+                hits.setdefault(name, set()).add(keyword)
+        return hits
@@ -0,0 +1,143 @@
+"""
+FreelanceX.AI Latency Tracking
+Per-agent latency statistics: EWMA, streaming tail percentiles and in-flight counts
+"""
+
+import math
+from typing import Dict, Any, Optional
+
+
+class QuantileSketch:
+    """
+    Streaming quantile sketch with a relative-error guarantee
+    Values are counted in logarithmic buckets, so memory stays bounded and
+    quantile estimates are within `relative_accuracy` of the true value.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, min_value: float = 1e-4):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.min_value = min_value
+        self.buckets: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value: float):
+        """Add a value to the sketch"""
+        self.count += 1
+        if value <= self.min_value:
+            self.zero_count += 1
+            return
+        key = math.ceil(math.log(value) / self.log_gamma)
+        self.buckets[key] = self.buckets.get(key, 0) + 1
+
+    def merge(self, other: 'QuantileSketch'):
+        """Merge another sketch with the same accuracy into this one"""
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+
+    def quantile(self, q: float) -> float:
+        """Estimate the q-quantile (0 <= q <= 1)"""
+        if self.count == 0:
+            return 0.0
+
+        rank = q * (self.count - 1)
+        running = self.zero_count
+        if rank < running:
+            return 0.0
+
+        for key in sorted(self.buckets):
+            running += self.buckets[key]
+            if running > rank:
+                return 2 * self.gamma ** key / (self.gamma + 1)
+
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+
+class LatencyTracker:
+    """
+    Latency statistics for a single agent
+    Keeps an EWMA of latency, a windowed quantile sketch for tail percentiles
+    and the number of requests currently in flight.
+    """
+
+    def __init__(self, alpha: float = 0.2, window_size: int = 1000, relative_accuracy: float = 0.01):
+        self.alpha = alpha
+        self.window_size = window_size
+        self.relative_accuracy = relative_accuracy
+        self.ewma = 0.0
+        self.count = 0
+        self.in_flight = 0
+        self.last_latency = 0.0
+        self.max_latency = 0.0
+
+        # Two rotating windows so old samples age out of the percentiles
+        self._current = QuantileSketch(relative_accuracy)
+        self._previous: Optional[QuantileSketch] = None
+
+    def start(self):
+        """Mark a request as started"""
+        self.in_flight += 1
+
+    def finish(self, latency: Optional[float] = None):
+        """Mark a request as finished, recording its latency if given"""
+        self.in_flight = max(0, self.in_flight - 1)
+        if latency is not None:
+            self.record(latency)
+
+    def record(self, latency: float):
+        """Record a latency sample in seconds"""
+        if self.count == 0:
+            self.ewma = latency
+        else:
+            self.ewma = self.alpha * latency + (1 - self.alpha) * self.ewma
+
+        self.count += 1
+        self.last_latency = latency
+        self.max_latency = max(self.max_latency, latency)
+
+        if self._current.count >= self.window_size:
+            self._previous = self._current
+            self._current = QuantileSketch(self.relative_accuracy)
+        self._current.add(latency)
+
+    def percentile(self, q: float) -> float:
+        """Estimate a latency percentile over the recent window (q in 0..1)"""
+        if self._previous is None:
+            return self._current.quantile(q)
+
+        combined = QuantileSketch(self.relative_accuracy)
+        combined.merge(self._previous)
+        combined.merge(self._current)
+        return combined.quantile(q)
+
+    @property
+    def p95(self) -> float:
+        return self.percentile(0.95)
+
+    @property
+    def p99(self) -> float:
+        return self.percentile(0.99)
+
+    def expected_completion_time(self, default_latency: float = 1.0) -> float:
+        """
+        Expected time for a new request to complete on this agent
+        Queued work ahead of it (in-flight requests) plus its own service time.
+        """
+        service_time = self.ewma if self.count else default_latency
+        return service_time * (self.in_flight + 1)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the current statistics as a dict"""
+        return {
+            'count': self.count,
+            'in_flight': self.in_flight,
+            'ewma': self.ewma,
+            'p95': self.p95,
+            'p99': self.p99,
+            'last': self.last_latency,
+            'max': self.max_latency
+        }
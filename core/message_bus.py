@@ -0,0 +1,264 @@
+"""
+FreelanceX.AI Message Bus
+Agent-to-agent messaging with correlated replies, topics and broadcast
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Set
+
+from .deadline import time_remaining
+from .latency import LatencyTracker
+
+logger = logging.getLogger(__name__)
+
+
+class MessageTransport(ABC):
+    """
+    Delivers messages to agent mailboxes
+    Messages are plain JSON-serializable dicts, so a cross-process transport can
+    replace the in-process one; it hands inbound messages to MessageBus.receive().
+    """
+
+    @abstractmethod
+    def register(self, address: str, mailbox: asyncio.Queue):
+        """Attach a local mailbox to an address"""
+        pass
+
+    @abstractmethod
+    def unregister(self, address: str):
+        """Detach an address"""
+        pass
+
+    @abstractmethod
+    async def deliver(self, address: str, message: Dict[str, Any]) -> bool:
+        """Deliver a message to an address; False when the address is unknown"""
+        pass
+
+    @abstractmethod
+    def addresses(self) -> List[str]:
+        """Addresses messages can be delivered to"""
+        pass
+
+    @abstractmethod
+    def mailbox_depths(self) -> Dict[str, int]:
+        """Number of undelivered messages per local mailbox"""
+        pass
+
+
+class InProcessTransport(MessageTransport):
+    """Transport that puts messages straight onto asyncio.Queue mailboxes"""
+
+    def __init__(self):
+        self.mailboxes: Dict[str, asyncio.Queue] = {}
+
+    def register(self, address: str, mailbox: asyncio.Queue):
+        self.mailboxes[address] = mailbox
+
+    def unregister(self, address: str):
+        self.mailboxes.pop(address, None)
+
+    async def deliver(self, address: str, message: Dict[str, Any]) -> bool:
+        mailbox = self.mailboxes.get(address)
+        if mailbox is None:
+            return False
+        await mailbox.put(message)
+        return True
+
+    def addresses(self) -> List[str]:
+        return list(self.mailboxes)
+
+    def mailbox_depths(self) -> Dict[str, int]:
+        return {address: mailbox.qsize() for address, mailbox in self.mailboxes.items()}
+
+
+class MessageBus:
+    """
+    Message bus for FreelanceX.AI agents
+    Every message carries an id; replies carry the request's id as correlation_id
+    and resolve the requester's awaitable directly.
+    """
+
+    def __init__(self, transport: Optional[MessageTransport] = None, default_timeout: float = 30.0):
+        self.transport = transport or InProcessTransport()
+        self.default_timeout = default_timeout
+        self.pending: Dict[str, asyncio.Future] = {}
+        self.topics: Dict[str, Set[str]] = defaultdict(set)
+        self.route_metrics: Dict[str, Dict[str, Any]] = {}
+        self.metrics = {
+            'sent': 0,
+            'undeliverable': 0,
+            'replies': 0,
+            'late_replies': 0,
+            'timeouts': 0,
+            'published': 0,
+            'broadcasts': 0
+        }
+
+    def register(self, address: str, mailbox: asyncio.Queue):
+        """Register an agent mailbox"""
+        self.transport.register(address, mailbox)
+        logger.info(f"📬 Registered mailbox: {address}")
+
+    def unregister(self, address: str):
+        """Remove an agent mailbox and its topic subscriptions"""
+        self.transport.unregister(address)
+        for subscribers in self.topics.values():
+            subscribers.discard(address)
+
+    def is_registered(self, address: str) -> bool:
+        """Whether messages can be delivered to an address"""
+        return address in self.transport.addresses()
+
+    def subscribe(self, address: str, topic: str):
+        """Subscribe an address to a topic"""
+        self.topics[topic].add(address)
+
+    def unsubscribe(self, address: str, topic: str):
+        """Unsubscribe an address from a topic"""
+        self.topics[topic].discard(address)
+
+    def _new_message(self, sender: str, recipient: Optional[str], message_type: str,
+                     data: Any, correlation_id: Optional[str] = None,
+                     topic: Optional[str] = None) -> Dict[str, Any]:
+        return {
+            'id': uuid.uuid4().hex,
+            'correlation_id': correlation_id,
+            'from': sender,
+            'to': recipient,
+            'type': message_type,
+            'topic': topic,
+            'timestamp': datetime.now().isoformat(),
+            'data': data
+        }
+
+    def _route(self, route: str) -> Dict[str, Any]:
+        metrics = self.route_metrics.get(route)
+        if metrics is None:
+            metrics = {'sent': 0, 'replies': 0, 'timeouts': 0, 'latency': LatencyTracker()}
+            self.route_metrics[route] = metrics
+        return metrics
+
+    async def _deliver(self, route: str, address: str, message: Dict[str, Any]) -> bool:
+        delivered = await self.transport.deliver(address, message)
+        if delivered:
+            self.metrics['sent'] += 1
+            self._route(route)['sent'] += 1
+        else:
+            self.metrics['undeliverable'] += 1
+            logger.warning(f"⚠️ No mailbox for {address}, dropped {message['type']} message")
+        return delivered
+
+    async def send(self, sender: str, recipient: str, data: Any, message_type: str = 'request',
+                   correlation_id: Optional[str] = None) -> Optional[str]:
+        """Send a message without waiting for a reply; returns its id, or None if undeliverable"""
+        message = self._new_message(sender, recipient, message_type, data, correlation_id)
+        delivered = await self._deliver(f"{sender}->{recipient}", recipient, message)
+        return message['id'] if delivered else None
+
+    async def request(self, sender: str, recipient: str, data: Any, message_type: str = 'request',
+                      timeout: Optional[float] = None) -> Any:
+        """
+        Send a message and wait for its reply
+
+        Raises:
+            LookupError: The recipient has no mailbox
+            asyncio.TimeoutError: No reply within the timeout (or the current deadline)
+        """
+        message = self._new_message(sender, recipient, message_type, data)
+        route = f"{sender}->{recipient}"
+        future = asyncio.get_running_loop().create_future()
+        self.pending[message['id']] = future
+
+        start_time = time.perf_counter()
+        try:
+            if not await self._deliver(route, recipient, message):
+                raise LookupError(f"No mailbox registered for {recipient}")
+
+            reply = await asyncio.wait_for(future, time_remaining(timeout or self.default_timeout))
+
+            latency = time.perf_counter() - start_time
+            self._route(route)['replies'] += 1
+            self._route(route)['latency'].record(latency)
+            return reply
+
+        except asyncio.TimeoutError:
+            self.metrics['timeouts'] += 1
+            self._route(route)['timeouts'] += 1
+            raise
+
+        finally:
+            self.pending.pop(message['id'], None)
+
+    async def reply(self, message: Dict[str, Any], data: Any, sender: Optional[str] = None):
+        """Reply to a received message"""
+        response = self._new_message(
+            sender or message.get('to'), message.get('from'), 'response', data,
+            correlation_id=message.get('id')
+        )
+        await self.receive(response)
+
+    async def receive(self, message: Dict[str, Any]):
+        """
+        Route a message arriving at this bus
+        Replies resolve a waiting request; anything else goes to the recipient's mailbox.
+        """
+        correlation_id = message.get('correlation_id')
+        if message.get('type') == 'response' and correlation_id:
+            future = self.pending.get(correlation_id)
+            if future is not None and not future.done():
+                self.metrics['replies'] += 1
+                future.set_result(message.get('data'))
+            else:
+                # The requester gave up or the reply is unsolicited
+                self.metrics['late_replies'] += 1
+            return
+
+        recipient = message.get('to')
+        if recipient:
+            await self._deliver(f"{message.get('from')}->{recipient}", recipient, message)
+
+    async def publish(self, sender: str, topic: str, data: Any) -> int:
+        """Fan a message out to a topic's subscribers; returns the number reached"""
+        self.metrics['published'] += 1
+        delivered = 0
+        for address in list(self.topics.get(topic, ())):
+            if address == sender:
+                continue
+            message = self._new_message(sender, address, 'broadcast', data, topic=topic)
+            delivered += await self._deliver(f"{sender}->#{topic}", address, message)
+        return delivered
+
+    async def broadcast(self, sender: str, data: Any) -> int:
+        """Send a message to every other registered mailbox; returns the number reached"""
+        self.metrics['broadcasts'] += 1
+        delivered = 0
+        for address in self.transport.addresses():
+            if address == sender:
+                continue
+            message = self._new_message(sender, address, 'broadcast', data)
+            delivered += await self._deliver(f"{sender}->*", address, message)
+        return delivered
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return bus counters, per-route latency and mailbox depths"""
+        return {
+            **self.metrics,
+            'pending_requests': len(self.pending),
+            'mailbox_depths': self.transport.mailbox_depths(),
+            'topics': {topic: len(subscribers) for topic, subscribers in self.topics.items()},
+            'routes': {
+                route: {
+                    'sent': metrics['sent'],
+                    'replies': metrics['replies'],
+                    'timeouts': metrics['timeouts'],
+                    'latency': metrics['latency'].snapshot()
+                }
+                for route, metrics in self.route_metrics.items()
+            }
+        }
@@ -0,0 +1,287 @@
+"""
+FreelanceX.AI Model Call Governor
+Process-wide admission control for outbound model calls: adaptive concurrency, token budget and priorities
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, Callable, Awaitable, TypeVar
+
+from .latency import LatencyTracker
+from .session_manager import estimate_tokens, message_tokens
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+# Lower value is served first
+PRIORITIES = {
+    'interactive': 0,
+    'background': 1
+}
+
+
+def is_rate_limited(error: BaseException) -> bool:
+    """Whether an exception is a provider rate limit (HTTP 429)"""
+    status = getattr(error, 'status_code', None) or getattr(error, 'status', None)
+    return status == 429 or type(error).__name__ == 'RateLimitError'
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """Seconds the provider asked us to wait, from the error or its response headers"""
+    value = getattr(error, 'retry_after', None)
+    if value is None:
+        headers = getattr(getattr(error, 'response', None), 'headers', None) or {}
+        value = headers.get('retry-after') or headers.get('Retry-After')
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def estimate_call_tokens(system_prompt: str, session: Any, message: str,
+                         completion_tokens: int = 512) -> int:
+    """Rough tokens of a session turn: instructions, history, the new message and the expected reply"""
+    history = sum(message_tokens(item) for item in getattr(session, 'messages', None) or [])
+    return estimate_tokens(system_prompt) + history + estimate_tokens(message) + completion_tokens
+
+
+@dataclass
+class CallTicket:
+    """A granted model call; hand it back to release()"""
+    priority: str
+    tokens: int
+    queued_at: float
+    started_at: float = 0.0
+
+
+class ModelCallGovernor:
+    """
+    Shared gate in front of every outbound model call
+    Concurrency follows AIMD: the limit grows by one per `limit` calls that complete
+    near the baseline latency while the limit is in use, shrinks gently when latency
+    rises past `latency_tolerance` x baseline, and is cut by `backoff_factor` on a 429.
+    A 429 also pauses admissions for its Retry-After (or `rate_limit_cooldown`), and
+    the limit is cut at most once per pause, so a burst of 429s from calls that were
+    already in flight does not collapse it. With `tokens_per_minute` set, calls
+    also draw their estimated tokens from a bucket refilled continuously.
+    Waiting calls are admitted by priority class, then arrival order.
+    """
+
+    def __init__(self, initial_limit: int = 8, min_limit: int = 1, max_limit: int = 64,
+                 tokens_per_minute: Optional[int] = None, latency_tolerance: float = 2.0,
+                 backoff_factor: float = 0.5, latency_backoff_factor: float = 0.9,
+                 rate_limit_cooldown: float = 1.0):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit = float(max(min_limit, min(initial_limit, max_limit)))
+        self.tokens_per_minute = tokens_per_minute
+        self.latency_tolerance = latency_tolerance
+        self.backoff_factor = backoff_factor
+        self.latency_backoff_factor = latency_backoff_factor
+        self.rate_limit_cooldown = rate_limit_cooldown
+
+        self.in_flight = 0
+        self._waiters = []  # heap of (priority rank, sequence, ticket, future)
+        self._sequence = itertools.count()
+        self._tokens = float(tokens_per_minute or 0)
+        self._tokens_updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._last_decrease = 0.0
+        self._wakeup: Optional[asyncio.TimerHandle] = None
+
+        self.latency = LatencyTracker()
+        self.baseline_latency: Optional[float] = None
+        self.queue_times = {name: LatencyTracker() for name in PRIORITIES}
+        self.metrics = {
+            'granted': 0,
+            'completed': 0,
+            'failed': 0,
+            'rate_limited': 0,
+            'limit_increases': 0,
+            'limit_decreases': 0
+        }
+
+    async def acquire(self, priority: str = 'interactive', tokens: int = 0) -> CallTicket:
+        """
+        Wait until a call may start
+
+        Args:
+            priority: 'interactive' or 'background'
+            tokens: Estimated tokens the call will consume (prompt + completion)
+        """
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority class: {priority}")
+        if self.tokens_per_minute:
+            # A call larger than the whole budget would otherwise wait forever
+            tokens = min(tokens, self.tokens_per_minute)
+
+        ticket = CallTicket(priority, tokens, time.monotonic())
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (PRIORITIES[priority], next(self._sequence), ticket, future))
+        self._dispatch()
+
+        try:
+            return await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just as the caller gave up: hand the slot straight back
+                self._return_slot(ticket)
+            raise
+
+    def release(self, ticket: CallTicket, error: Optional[BaseException] = None,
+                tokens_used: Optional[int] = None):
+        """
+        Finish a call, feeding its outcome into the limit
+
+        Args:
+            ticket: Ticket returned by acquire()
+            error: The exception the call failed with, if any
+            tokens_used: Actual tokens consumed, to correct the reservation
+        """
+        now = time.monotonic()
+        self.in_flight -= 1
+
+        if self.tokens_per_minute and tokens_used is not None:
+            # May go negative: an underestimated call delays the calls after it
+            self._refill(now)
+            self._tokens = min(float(self.tokens_per_minute), self._tokens + ticket.tokens - tokens_used)
+
+        if error is None:
+            self.metrics['completed'] += 1
+            self._on_success(now - ticket.started_at, now)
+        elif not isinstance(error, Exception):
+            # Cancelled or abandoned by the caller: says nothing about the provider
+            pass
+        elif is_rate_limited(error):
+            self.metrics['rate_limited'] += 1
+            self._on_rate_limited(retry_after(error), now)
+        else:
+            self.metrics['failed'] += 1
+
+        self._dispatch()
+
+    async def run(self, call: Callable[[], Awaitable[T]], priority: str = 'interactive',
+                  tokens: int = 0) -> T:
+        """Run a model call once the governor admits it"""
+        ticket = await self.acquire(priority, tokens)
+        try:
+            result = await call()
+        except BaseException as e:
+            self.release(ticket, error=e)
+            raise
+        self.release(ticket)
+        return result
+
+    def _return_slot(self, ticket: CallTicket):
+        """Give back a slot whose call never produced an outcome"""
+        self.in_flight -= 1
+        if self.tokens_per_minute:
+            self._tokens = min(float(self.tokens_per_minute), self._tokens + ticket.tokens)
+        self._dispatch()
+
+    def _on_success(self, latency: float, now: float):
+        self.latency.record(latency)
+        if self.baseline_latency is None or latency < self.baseline_latency:
+            self.baseline_latency = latency
+        else:
+            # Drift up slowly so a permanently slower model becomes the new baseline
+            self.baseline_latency += 0.01 * (latency - self.baseline_latency)
+
+        if self.latency.ewma > self.baseline_latency * self.latency_tolerance:
+            # Once per observed round trip, so one slow burst counts once
+            if now - self._last_decrease >= self.latency.ewma:
+                self._decrease(self.latency_backoff_factor, now)
+        elif self.in_flight + 1 >= int(self.limit) and self.limit < self.max_limit:
+            # Only grow a limit that is actually being used
+            self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+            self.metrics['limit_increases'] += 1
+
+    def _on_rate_limited(self, wait: Optional[float], now: float):
+        wait = self.rate_limit_cooldown if wait is None else wait
+        if now >= self._blocked_until:
+            self._decrease(self.backoff_factor, now)
+            logger.warning(f"⚠️ Model provider rate limited, limit now {int(self.limit)}, pausing {wait:.1f}s")
+        self._blocked_until = max(self._blocked_until, now + wait)
+
+    def _decrease(self, factor: float, now: float):
+        self.limit = max(float(self.min_limit), self.limit * factor)
+        self._last_decrease = now
+        self.metrics['limit_decreases'] += 1
+
+    def _refill(self, now: float):
+        if self.tokens_per_minute:
+            elapsed = now - self._tokens_updated
+            self._tokens = min(float(self.tokens_per_minute), self._tokens + elapsed * self.tokens_per_minute / 60.0)
+        self._tokens_updated = now
+
+    def _dispatch(self):
+        """Admit waiting calls while concurrency, token budget and any rate-limit pause allow"""
+        if self._wakeup is not None:
+            self._wakeup.cancel()
+            self._wakeup = None
+
+        now = time.monotonic()
+        if now < self._blocked_until:
+            if self._waiters:
+                self._schedule(self._blocked_until - now)
+            return
+
+        self._refill(now)
+        while self._waiters and self.in_flight < int(self.limit):
+            _, _, ticket, future = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+
+            if self.tokens_per_minute and ticket.tokens > self._tokens:
+                # Head of the line waits for tokens; lower priorities must not overtake it
+                self._schedule((ticket.tokens - self._tokens) * 60.0 / self.tokens_per_minute)
+                return
+
+            heapq.heappop(self._waiters)
+            self._tokens -= ticket.tokens
+            self.in_flight += 1
+            ticket.started_at = now
+            self.queue_times[ticket.priority].record(now - ticket.queued_at)
+            self.metrics['granted'] += 1
+            future.set_result(ticket)
+
+    def _schedule(self, delay: float):
+        self._wakeup = asyncio.get_running_loop().call_later(max(delay, 0.001), self._dispatch)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return the current limit, queue depths, queue times and call latency"""
+        waiting = {name: 0 for name in PRIORITIES}
+        for _, _, ticket, future in self._waiters:
+            if not future.done():
+                waiting[ticket.priority] += 1
+
+        return {
+            **self.metrics,
+            'limit': int(self.limit),
+            'in_flight': self.in_flight,
+            'waiting': waiting,
+            'tokens_available': int(self._tokens) if self.tokens_per_minute else None,
+            'paused_for': max(0.0, self._blocked_until - time.monotonic()),
+            'baseline_latency': self.baseline_latency,
+            'latency': self.latency.snapshot(),
+            'queue_time': {name: tracker.snapshot() for name, tracker in self.queue_times.items()}
+        }
+
+
+_model_governor: Optional[ModelCallGovernor] = None
+
+
+def get_model_governor() -> ModelCallGovernor:
+    """Get the process-wide model call governor (token budget from MODEL_TOKENS_PER_MINUTE)"""
+    global _model_governor
+    if _model_governor is None:
+        tokens_per_minute = os.getenv('MODEL_TOKENS_PER_MINUTE')
+        _model_governor = ModelCallGovernor(tokens_per_minute=int(tokens_per_minute) if tokens_per_minute else None)
+    return _model_governor
@@ -0,0 +1,295 @@
+"""
+FreelanceX.AI Prompt Cache
+Response cache for stateless model calls with exact and near-duplicate prompt matching
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import random
+import re
+import time
+import unicodedata
+import zlib
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Callable, Awaitable, Iterable, Set, Tuple
+
+from .session_manager import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# Prime modulus of the MinHash permutations (larger than any crc32 value)
+MINHASH_PRIME = (1 << 61) - 1
+
+_QUOTES = str.maketrans({'‘': "'", '’': "'", '“': '"', '”': '"', '´': "'"})
+_WHITESPACE = re.compile(r'\s+')
+_TRAILING_PUNCTUATION = re.compile(r'[\s?!.]+$')
+
+
+def normalize_prompt(text: str) -> str:
+    """Canonical form of a user prompt: case, quotes, whitespace and trailing punctuation folded"""
+    text = unicodedata.normalize('NFKC', text or '').translate(_QUOTES).lower()
+    text = _WHITESPACE.sub(' ', text).strip()
+    return _TRAILING_PUNCTUATION.sub('', text)
+
+
+def _digest(value: str) -> str:
+    return hashlib.sha256(value.encode('utf-8')).hexdigest()
+
+
+def prompt_scope(model: str, system_prompt: str, tools: Iterable[str] = ()) -> str:
+    """Hash of everything besides the user text that determines a response"""
+    payload = json.dumps([model, _digest(system_prompt or ''), sorted(set(tools))], separators=(',', ':'))
+    return _digest(payload)
+
+
+def prompt_cache_key(scope: str, normalized_text: str) -> str:
+    """Exact-match cache key of a normalized prompt within a scope"""
+    return _digest(f"{scope}\n{normalized_text}")
+
+
+def shingles(text: str, size: int = 4) -> Set[int]:
+    """crc32 hashes of a text's character shingles"""
+    if len(text) <= size:
+        return {zlib.crc32(text.encode('utf-8'))}
+    return {zlib.crc32(text[i:i + size].encode('utf-8')) for i in range(len(text) - size + 1)}
+
+
+class MinHasher:
+    """
+    MinHash signatures over character shingles
+    The fraction of equal signature slots estimates the Jaccard similarity of two texts.
+    """
+
+    def __init__(self, num_perm: int = 64, shingle_size: int = 4, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.permutations = [
+            (rng.randrange(1, MINHASH_PRIME), rng.randrange(0, MINHASH_PRIME)) for _ in range(num_perm)
+        ]
+
+    def signature(self, text: str) -> Tuple[int, ...]:
+        hashes = shingles(text, self.shingle_size)
+        return tuple(
+            min((a * value + b) % MINHASH_PRIME for value in hashes)
+            for a, b in self.permutations
+        )
+
+    @staticmethod
+    def similarity(first: Tuple[int, ...], second: Tuple[int, ...]) -> float:
+        return sum(1 for x, y in zip(first, second) if x == y) / len(first)
+
+
+class PromptCache:
+    """
+    Two-tier cache of model responses to stateless prompts
+    Prompts are keyed by model, system prompt hash, tool set and normalized user text.
+    The in-memory tier is an LRU bounded by entry count; an optional persistent store
+    (MemoryManager's prompt_cache table) backs it with exact-match lookups. When
+    `near_duplicates` is on, a miss falls back to MinHash/LSH matching against
+    in-memory entries of the same scope whose estimated similarity reaches
+    `similarity_threshold`. Concurrent misses on the same key share one model call.
+
+    Only use this for calls whose response depends on the prompt alone - session
+    turns depend on the conversation history and must not be cached.
+    """
+
+    def __init__(self, max_entries: int = 2000, default_ttl: float = 3600.0,
+                 near_duplicates: bool = False, similarity_threshold: float = 0.9,
+                 num_perm: int = 64, bands: int = 16, store=None):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.near_duplicates = near_duplicates
+        self.similarity_threshold = similarity_threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.hasher = MinHasher(num_perm)
+        self.store = store
+        self.entries: OrderedDict = OrderedDict()  # key -> entry dict
+        self._band_index: Dict[Tuple[str, int, Tuple[int, ...]], Set[str]] = {}
+        self._flights: Dict[str, asyncio.Future] = {}
+        self.metrics = {
+            'hits': 0,
+            'near_hits': 0,
+            'persistent_hits': 0,
+            'misses': 0,
+            'coalesced': 0,
+            'stores': 0,
+            'evictions': 0,
+            'expirations': 0,
+            'saved_tokens': 0,
+            'saved_seconds': 0.0
+        }
+
+    def _band_keys(self, scope: str, signature: Tuple[int, ...]) -> List[Tuple[str, int, Tuple[int, ...]]]:
+        return [
+            (scope, band, signature[band * self.rows:(band + 1) * self.rows])
+            for band in range(self.bands)
+        ]
+
+    def _remove(self, key: str):
+        entry = self.entries.pop(key, None)
+        if entry is None or entry['signature'] is None:
+            return
+        for band_key in self._band_keys(entry['scope'], entry['signature']):
+            bucket = self._band_index.get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._band_index[band_key]
+
+    def _fresh(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return an unexpired in-memory entry, dropping it if it has expired"""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if entry['expires_at'] <= time.monotonic():
+            self._remove(key)
+            self.metrics['expirations'] += 1
+            return None
+        self.entries.move_to_end(key)
+        return entry
+
+    def _put(self, key: str, scope: str, text: str, response: str, ttl: float,
+             tokens: int, latency: float):
+        self._remove(key)
+        signature = self.hasher.signature(text) if self.near_duplicates else None
+        self.entries[key] = {
+            'scope': scope,
+            'response': response,
+            'expires_at': time.monotonic() + ttl,
+            'tokens': tokens,
+            'latency': latency,
+            'signature': signature
+        }
+        if signature is not None:
+            for band_key in self._band_keys(scope, signature):
+                self._band_index.setdefault(band_key, set()).add(key)
+
+        while len(self.entries) > self.max_entries:
+            self._remove(next(iter(self.entries)))
+            self.metrics['evictions'] += 1
+
+    def _find_near_duplicate(self, scope: str, text: str) -> Optional[Dict[str, Any]]:
+        """Most similar fresh in-memory entry of the scope above the similarity threshold"""
+        signature = self.hasher.signature(text)
+        candidates: Set[str] = set()
+        for band_key in self._band_keys(scope, signature):
+            candidates.update(self._band_index.get(band_key, ()))
+
+        best, best_similarity = None, self.similarity_threshold
+        for key in candidates:
+            entry = self._fresh(key)
+            if entry is None:
+                continue
+            similarity = MinHasher.similarity(signature, entry['signature'])
+            if similarity >= best_similarity:
+                best, best_similarity = entry, similarity
+        return best
+
+    def _record_hit(self, entry: Dict[str, Any], kind: str) -> str:
+        self.metrics[kind] += 1
+        self.metrics['saved_tokens'] += entry['tokens']
+        self.metrics['saved_seconds'] += entry['latency']
+        return entry['response']
+
+    async def lookup(self, scope: str, text: str) -> Optional[str]:
+        """Cached response for a prompt in a scope, or None"""
+        normalized = normalize_prompt(text)
+        key = prompt_cache_key(scope, normalized)
+
+        entry = self._fresh(key)
+        if entry is not None:
+            return self._record_hit(entry, 'hits')
+
+        if self.store is not None:
+            stored = await self.store.get_cached_response(key)
+            if stored is not None:
+                self._put(key, scope, normalized, stored['response'], stored['ttl'],
+                          stored['tokens'], stored['latency'])
+                return self._record_hit(self.entries[key], 'persistent_hits')
+
+        if self.near_duplicates:
+            entry = self._find_near_duplicate(scope, normalized)
+            if entry is not None:
+                return self._record_hit(entry, 'near_hits')
+
+        return None
+
+    async def store_response(self, scope: str, text: str, response: str,
+                             ttl: Optional[float] = None, tokens: Optional[int] = None,
+                             latency: float = 0.0):
+        """Cache a response in memory and, if configured, in the persistent store"""
+        normalized = normalize_prompt(text)
+        key = prompt_cache_key(scope, normalized)
+        ttl = self.default_ttl if ttl is None else ttl
+        tokens = estimate_tokens(text) + estimate_tokens(response) if tokens is None else tokens
+
+        self._put(key, scope, normalized, response, ttl, tokens, latency)
+        self.metrics['stores'] += 1
+        if self.store is not None:
+            await self.store.store_cached_response(key, scope, response, tokens, latency, ttl)
+
+    async def get_or_call(self, model: str, system_prompt: str, text: str,
+                          call: Callable[[], Awaitable[str]], tools: Iterable[str] = (),
+                          ttl: Optional[float] = None) -> str:
+        """
+        Return the cached response to a stateless prompt, calling the model on a miss
+
+        Args:
+            model: Model name
+            system_prompt: Instructions the model runs with
+            text: User prompt
+            call: Coroutine factory that performs the model call and returns its text
+            tools: Names of the tools available to the model
+            ttl: Seconds to keep the response (default_ttl if None)
+        """
+        scope = prompt_scope(model, system_prompt, tools)
+        cached = await self.lookup(scope, text)
+        if cached is not None:
+            return cached
+
+        key = prompt_cache_key(scope, normalize_prompt(text))
+        flight = self._flights.get(key)
+        if flight is not None:
+            self.metrics['coalesced'] += 1
+            return await asyncio.shield(flight)
+
+        self.metrics['misses'] += 1
+        flight = asyncio.ensure_future(self._call_and_store(key, scope, system_prompt, text, call, ttl))
+        self._flights[key] = flight
+        return await asyncio.shield(flight)
+
+    async def _call_and_store(self, key: str, scope: str, system_prompt: str, text: str,
+                              call: Callable[[], Awaitable[str]], ttl: Optional[float]) -> str:
+        """Make one model call for every caller waiting on the key and cache a non-empty response"""
+        try:
+            start_time = time.perf_counter()
+            response = await call()
+            if response:
+                tokens = estimate_tokens(system_prompt or '') + estimate_tokens(text) + estimate_tokens(response)
+                await self.store_response(scope, text, response, ttl, tokens, time.perf_counter() - start_time)
+            return response
+        finally:
+            self._flights.pop(key, None)
+
+    def invalidate(self):
+        """Drop every in-memory entry"""
+        self.entries.clear()
+        self._band_index.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return cache size, hit rates and estimated savings"""
+        hits = (self.metrics['hits'] + self.metrics['near_hits']
+                + self.metrics['persistent_hits'] + self.metrics['coalesced'])
+        lookups = hits + self.metrics['misses']
+        return {
+            **self.metrics,
+            'entries': len(self.entries),
+            'in_flight': len(self._flights),
+            'hit_rate': hits / lookups if lookups else 0.0
+        }
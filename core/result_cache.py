@@ -0,0 +1,150 @@
+"""
+FreelanceX.AI Result Cache
+Per-agent task result cache with per-task-type TTLs and singleflight coalescing
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Callable, Awaitable
+
+from .deadline import time_remaining
+
+logger = logging.getLogger(__name__)
+
+# Task fields that vary between otherwise identical requests and never affect the result
+VOLATILE_TASK_FIELDS = frozenset({'timestamp', 'timeout', 'priority', 'request_id', 'deadline'})
+
+
+def task_cache_key(agent_id: str, task_data: Dict[str, Any]) -> str:
+    """Canonical hash of a task for an agent (key order and volatile fields ignored)"""
+    canonical = {key: value for key, value in task_data.items() if key not in VOLATILE_TASK_FIELDS}
+    payload = json.dumps([agent_id, canonical], sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class _Flight:
+    """An execution shared by every caller waiting on the same key"""
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class TaskResultCache:
+    """
+    LRU cache of successful task results
+    Concurrent identical tasks share one execution; the execution is only cancelled
+    once every caller waiting on it has gone away.
+    """
+
+    def __init__(self, max_entries: int = 1000):
+        self.max_entries = max_entries
+        self.entries: OrderedDict = OrderedDict()  # key -> (expires_at, result)
+        self.flights: Dict[str, _Flight] = {}
+        self.metrics = {
+            'hits': 0,
+            'misses': 0,
+            'coalesced': 0,
+            'stores': 0,
+            'expirations': 0,
+            'evictions': 0
+        }
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a fresh cached result, or None"""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, result = entry
+        if expires_at <= time.monotonic():
+            del self.entries[key]
+            self.metrics['expirations'] += 1
+            return None
+
+        self.entries.move_to_end(key)
+        return result
+
+    def put(self, key: str, result: Dict[str, Any], ttl: float):
+        """Store a result for `ttl` seconds, evicting the least recently used entries"""
+        self.entries[key] = (time.monotonic() + ttl, result)
+        self.entries.move_to_end(key)
+        self.metrics['stores'] += 1
+
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.metrics['evictions'] += 1
+
+    def invalidate(self, key: Optional[str] = None):
+        """Drop one entry, or everything when no key is given"""
+        if key is None:
+            self.entries.clear()
+        else:
+            self.entries.pop(key, None)
+
+    async def get_or_run(self, key: str, ttl: float,
+                         runner: Callable[[], Awaitable[Dict[str, Any]]],
+                         cacheable: Callable[[Dict[str, Any]], bool]) -> Dict[str, Any]:
+        """
+        Return the cached result for `key`, joining or starting its execution on a miss
+
+        Args:
+            key: Canonical task key
+            ttl: Seconds to keep the result
+            runner: Coroutine factory that executes the task
+            cacheable: Predicate deciding whether a finished result may be stored
+
+        Raises:
+            asyncio.TimeoutError: The caller's deadline passed while waiting on a shared execution
+        """
+        cached = self.get(key)
+        if cached is not None:
+            self.metrics['hits'] += 1
+            return {**cached, 'cached': True}
+
+        flight = self.flights.get(key)
+        if flight is None:
+            self.metrics['misses'] += 1
+            flight = _Flight(asyncio.ensure_future(self._run(key, ttl, runner, cacheable)))
+            self.flights[key] = flight
+            shared = False
+        else:
+            self.metrics['coalesced'] += 1
+            shared = True
+
+        flight.waiters += 1
+        try:
+            # Each caller waits only as long as its own deadline allows
+            result = await asyncio.wait_for(asyncio.shield(flight.task), time_remaining())
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                flight.task.cancel()
+
+        return {**result, 'coalesced': True} if shared else result
+
+    async def _run(self, key: str, ttl: float,
+                   runner: Callable[[], Awaitable[Dict[str, Any]]],
+                   cacheable: Callable[[Dict[str, Any]], bool]) -> Dict[str, Any]:
+        """Execute a task once for all its waiters and cache the result"""
+        try:
+            result = await runner()
+            if cacheable(result):
+                self.put(key, result, ttl)
+            return result
+        finally:
+            self.flights.pop(key, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return cache size and hit statistics"""
+        lookups = self.metrics['hits'] + self.metrics['misses'] + self.metrics['coalesced']
+        return {
+            **self.metrics,
+            'entries': len(self.entries),
+            'in_flight': len(self.flights),
+            'hit_rate': (self.metrics['hits'] + self.metrics['coalesced']) / lookups if lookups else 0.0
+        }
@@ -0,0 +1,260 @@
+"""
+FreelanceX.AI Session Manager
+Per-user SDK sessions with LRU/idle eviction and a per-session token budget
+"""
+
+import asyncio
+import copy
+import logging
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Dict, Any, List, Optional, Callable, Awaitable
+
+logger = logging.getLogger(__name__)
+
+# Async callable (user_id, session) that persists a session being evicted
+PersistHandler = Callable[[str, Any], Awaitable[None]]
+
+SUMMARY_PREFIX = "Summary of earlier conversation: "
+
+
+def estimate_tokens(text: Any) -> int:
+    """Rough token count (about four characters per token)"""
+    return len(str(text or '')) // 4 + 1
+
+
+def message_tokens(message: Any) -> int:
+    """Rough token count of one session message, including per-message overhead"""
+    return estimate_tokens(getattr(message, 'content', message)) + 4
+
+
+def stream_event_text(event: Any) -> Optional[str]:
+    """Text delta carried by a streamed SDK event, if any"""
+    if isinstance(event, str):
+        return event
+    delta = getattr(event, 'delta', None)
+    if delta is None:
+        delta = getattr(getattr(event, 'data', None), 'delta', None)
+    return delta if isinstance(delta, str) else None
+
+
+def summarize_turns(messages: List[Any], max_chars: int = 600) -> str:
+    """Cheap extractive summary of dropped turns: the opening of each one, oldest first"""
+    parts = []
+    for message in messages:
+        content = str(getattr(message, 'content', '') or '').strip().replace('\n', ' ')
+        if content:
+            parts.append(f"{getattr(message, 'role', 'user')}: {content[:120]}")
+    return ' | '.join(parts)[:max_chars]
+
+
+class SessionLocks:
+    """
+    Per-session locks that serialize turns on the same session
+    A session's lock exists only while a caller holds or waits on it. It is dropped
+    when the last of them is done, never while a woken waiter has yet to take it.
+    """
+
+    def __init__(self):
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._users: Dict[str, int] = {}  # callers holding or waiting on each lock
+
+    async def acquire(self, key: str):
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        self._users[key] = self._users.get(key, 0) + 1
+        try:
+            await lock.acquire()
+        except BaseException:
+            self._forget(key)
+            raise
+
+    def release(self, key: str):
+        self._locks[key].release()
+        self._forget(key)
+
+    @asynccontextmanager
+    async def hold(self, key: str):
+        await self.acquire(key)
+        try:
+            yield
+        finally:
+            self.release(key)
+
+    def _forget(self, key: str):
+        self._users[key] -= 1
+        if not self._users[key]:
+            del self._users[key]
+            del self._locks[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._locks
+
+    def __len__(self) -> int:
+        return len(self._locks)
+
+
+class SessionManager:
+    """
+    Bounded store of per-user SDK sessions
+    Sessions idle longer than `idle_timeout` or beyond `max_sessions` (least recently
+    used first) are evicted and handed to the optional persist handler. Each session's
+    history is trimmed to `token_budget` before use; dropped turns are folded into a
+    short summary message when `summarize` is on.
+    """
+
+    def __init__(self, session_factory: Callable[[], Any], max_sessions: int = 500,
+                 idle_timeout: float = 1800.0, token_budget: int = 4000, keep_recent: int = 6,
+                 summarize: bool = True, persist: Optional[PersistHandler] = None):
+        self.session_factory = session_factory
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.token_budget = token_budget
+        self.keep_recent = keep_recent
+        self.summarize = summarize
+        self.persist = persist
+        self._sessions: OrderedDict = OrderedDict()  # user_id -> (session, last_used)
+        self._pending_persists: set = set()
+        self.metrics = {
+            'created': 0,
+            'evicted_idle': 0,
+            'evicted_lru': 0,
+            'trimmed_messages': 0,
+            'summaries': 0,
+            'persisted': 0
+        }
+
+    def get(self, user_id: str) -> Optional[Any]:
+        """Return a user's live session without creating one"""
+        entry = self._sessions.get(user_id)
+        return entry[0] if entry else None
+
+    def get_or_create(self, user_id: str) -> Any:
+        """Return a user's session, trimmed to the token budget, creating it if needed"""
+        self.evict_idle()
+
+        entry = self._sessions.get(user_id)
+        if entry is None:
+            session = self.session_factory()
+            self.metrics['created'] += 1
+            logger.info(f"Created new session for user: {user_id}")
+        else:
+            session = entry[0]
+
+        self._sessions[user_id] = (session, time.monotonic())
+        self._sessions.move_to_end(user_id)
+
+        while len(self._sessions) > self.max_sessions:
+            oldest_user = next(iter(self._sessions))
+            self._evict(oldest_user)
+            self.metrics['evicted_lru'] += 1
+
+        self.trim(session)
+        return session
+
+    def close(self, user_id: str) -> bool:
+        """Persist and remove a user's session"""
+        if user_id not in self._sessions:
+            return False
+        self._evict(user_id)
+        logger.info(f"Closed session for user: {user_id}")
+        return True
+
+    def evict_idle(self) -> int:
+        """Evict sessions idle longer than idle_timeout; returns how many"""
+        cutoff = time.monotonic() - self.idle_timeout
+        idle = [user_id for user_id, (_, last_used) in self._sessions.items() if last_used < cutoff]
+        for user_id in idle:
+            self._evict(user_id)
+        self.metrics['evicted_idle'] += len(idle)
+        return len(idle)
+
+    def trim(self, session: Any) -> int:
+        """Drop the oldest turns until the session fits its token budget; returns how many"""
+        messages = getattr(session, 'messages', None)
+        if not isinstance(messages, list):
+            return 0
+
+        total = sum(message_tokens(message) for message in messages)
+        if total <= self.token_budget:
+            return 0
+
+        # Instructions stay and the newest turns are never dropped; an earlier
+        # summary is dropped too and folded into the new one
+        dropped = []
+        index = 0
+        while total > self.token_budget and len(messages) - index > self.keep_recent:
+            message = messages[index]
+            if self._is_instruction(message):
+                index += 1
+                continue
+            total -= message_tokens(messages.pop(index))
+            dropped.append(message)
+
+        if dropped and self.summarize:
+            summary = self._summary_message(dropped)
+            if summary is not None:
+                position = 0
+                while position < len(messages) and self._is_instruction(messages[position]):
+                    position += 1
+                messages.insert(position, summary)
+                self.metrics['summaries'] += 1
+
+        self.metrics['trimmed_messages'] += len(dropped)
+        return len(dropped)
+
+    @staticmethod
+    def _is_instruction(message: Any) -> bool:
+        return (getattr(message, 'role', None) == 'system'
+                and not str(getattr(message, 'content', '')).startswith(SUMMARY_PREFIX))
+
+    def _summary_message(self, dropped: List[Any]) -> Optional[Any]:
+        """Build a system message summarizing dropped turns, shaped like the session's messages"""
+        try:
+            summary = copy.copy(dropped[0])
+            summary.role = 'system'
+            summary.content = SUMMARY_PREFIX + summarize_turns(dropped)
+            return summary
+        except Exception:
+            return None
+
+    def _evict(self, user_id: str):
+        session, _ = self._sessions.pop(user_id)
+        if self.persist is None:
+            return
+        try:
+            task = asyncio.get_running_loop().create_task(self._persist(user_id, session))
+        except RuntimeError:
+            # No event loop to persist from; the session is simply dropped
+            return
+        self._pending_persists.add(task)
+        task.add_done_callback(self._pending_persists.discard)
+
+    async def flush(self):
+        """Wait for persist writes of evicted sessions to finish"""
+        if self._pending_persists:
+            await asyncio.gather(*self._pending_persists, return_exceptions=True)
+
+    async def _persist(self, user_id: str, session: Any):
+        try:
+            await self.persist(user_id, session)
+            self.metrics['persisted'] += 1
+        except Exception as e:
+            logger.error(f"❌ Failed to persist session for {user_id}: {str(e)}")
+
+    def __contains__(self, user_id: str) -> bool:
+        return user_id in self._sessions
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return session counts and eviction statistics"""
+        return {
+            'sessions': len(self._sessions),
+            'max_sessions': self.max_sessions,
+            'token_budget': self.token_budget,
+            **self.metrics
+        }
@@ -0,0 +1,237 @@
+"""
+FreelanceX.AI Workflow Executor
+Runs multi-step tasks as a dependency DAG, dispatching independent steps concurrently
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Callable, Awaitable, AsyncIterator
+
+from .deadline import report_partial_result
+
+logger = logging.getLogger(__name__)
+
+# Coroutine (step, inputs) run in place of dispatching, for steps the caller performs itself
+StepHandler = Callable[['WorkflowStep', Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+
+@dataclass
+class WorkflowStep:
+    """One step of a workflow and the steps whose outputs it needs"""
+    step_id: str
+    task_type: str
+    description: str
+    depends_on: List[str] = field(default_factory=list)
+    required_capabilities: List[str] = field(default_factory=list)
+    priority: int = 5
+    estimated_time: int = 5
+    timeout: Optional[float] = None
+    retries: Optional[int] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'step_id': self.step_id,
+            'task_type': self.task_type,
+            'description': self.description,
+            'depends_on': list(self.depends_on),
+            'estimated_time': self.estimated_time
+        }
+
+
+def order_steps(steps: List[WorkflowStep]) -> List[WorkflowStep]:
+    """
+    Topologically sort steps
+
+    Raises:
+        ValueError: Duplicate step ids, unknown dependencies or a dependency cycle
+    """
+    by_id = {step.step_id: step for step in steps}
+    if len(by_id) != len(steps):
+        raise ValueError("Duplicate step ids in workflow")
+    for step in steps:
+        missing = [dep for dep in step.depends_on if dep not in by_id]
+        if missing:
+            raise ValueError(f"Step {step.step_id} depends on unknown steps: {missing}")
+
+    ordered, done = [], set()
+    remaining = list(steps)
+    while remaining:
+        ready = [step for step in remaining if all(dep in done for dep in step.depends_on)]
+        if not ready:
+            raise ValueError(f"Dependency cycle among steps: {[step.step_id for step in remaining]}")
+        ordered.extend(ready)
+        done.update(step.step_id for step in ready)
+        remaining = [step for step in remaining if step.step_id not in done]
+    return ordered
+
+
+def critical_path_time(steps: List[WorkflowStep]) -> int:
+    """Estimated duration of a workflow whose independent steps run concurrently"""
+    finish: Dict[str, int] = {}
+    for step in order_steps(steps):
+        finish[step.step_id] = step.estimated_time + max((finish[dep] for dep in step.depends_on), default=0)
+    return max(finish.values(), default=0)
+
+
+class WorkflowExecutor:
+    """
+    Executes a DAG of workflow steps through the TaskDispatcher
+    A step starts as soon as every step it depends on has succeeded and receives their
+    results as `inputs`. Failed steps are retried; steps downstream of a step that still
+    fails are skipped while independent branches carry on.
+    """
+
+    def __init__(self, dispatcher, handlers: Optional[Dict[str, StepHandler]] = None,
+                 default_timeout: float = 120.0, default_retries: int = 1,
+                 retry_backoff: float = 0.5, max_concurrency: Optional[int] = None):
+        self.dispatcher = dispatcher
+        self.handlers = handlers or {}
+        self.default_timeout = default_timeout
+        self.default_retries = default_retries
+        self.retry_backoff = retry_backoff
+        self._slots = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+
+    async def run(self, steps: List[WorkflowStep], context: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Execute a workflow, yielding an event as each step finishes
+
+        Args:
+            steps: Workflow steps
+            context: Fields shared by every step's task (content, user_id, ...)
+
+        Yields:
+            'step_completed', 'step_failed' and 'step_skipped' events in completion
+            order, then one 'workflow_completed' event with every step's result
+        """
+        ordered = order_steps(steps)
+        start_time = time.perf_counter()
+        results: Dict[str, Dict[str, Any]] = {}
+        failed = set()
+        pending = {step.step_id: step for step in ordered}
+        running: Dict[asyncio.Task, WorkflowStep] = {}
+
+        try:
+            while pending or running:
+                # Skip steps whose dependencies failed; start steps whose dependencies all succeeded
+                for step_id, step in list(pending.items()):
+                    blocked_by = [dep for dep in step.depends_on if dep in failed]
+                    if blocked_by:
+                        del pending[step_id]
+                        failed.add(step_id)
+                        results[step_id] = {'success': False, 'skipped': True, 'blocked_by': blocked_by}
+                        yield {'event': 'step_skipped', 'step_id': step_id, 'blocked_by': blocked_by}
+                    elif all(dep in results for dep in step.depends_on):
+                        del pending[step_id]
+                        inputs = {dep: results[dep].get('result') for dep in step.depends_on}
+                        running[asyncio.create_task(self._run_step(step, inputs, context))] = step
+
+                if not running:
+                    continue
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    step = running.pop(task)
+                    outcome = task.result()
+                    results[step.step_id] = outcome
+                    if not outcome['success']:
+                        failed.add(step.step_id)
+                    # Steps finished so far are what a deadline-cancelled task returns
+                    report_partial_result({
+                        'completed_steps': {step_id: result.get('result') for step_id, result in results.items()
+                                            if result['success']},
+                        'failed_steps': sorted(failed)
+                    })
+                    yield {
+                        'event': 'step_completed' if outcome['success'] else 'step_failed',
+                        'step_id': step.step_id,
+                        'elapsed': time.perf_counter() - start_time,
+                        **outcome
+                    }
+
+            yield {
+                'event': 'workflow_completed',
+                'success': not failed,
+                'results': results,
+                'failed_steps': sorted(failed),
+                'elapsed': time.perf_counter() - start_time
+            }
+
+        finally:
+            # The consumer stopped early (or was cancelled): abandon the remaining steps
+            for task in running:
+                task.cancel()
+
+    async def execute(self, steps: List[WorkflowStep], context: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute a workflow and return its final 'workflow_completed' event"""
+        final = {}
+        async for event in self.run(steps, context):
+            final = event
+        return final
+
+    async def _run_step(self, step: WorkflowStep, inputs: Dict[str, Any],
+                        context: Dict[str, Any]) -> Dict[str, Any]:
+        """Run one step with its timeout and retries; never raises"""
+        timeout = step.timeout or self.default_timeout
+        retries = self.default_retries if step.retries is None else step.retries
+        error = None
+
+        for attempt in range(1, retries + 2):
+            attempt_start = time.perf_counter()
+            try:
+                if self._slots:
+                    async with self._slots:
+                        outcome = await asyncio.wait_for(self._call(step, inputs, context, timeout), timeout)
+                else:
+                    outcome = await asyncio.wait_for(self._call(step, inputs, context, timeout), timeout)
+
+                if self._succeeded(outcome):
+                    return {
+                        'success': True,
+                        'result': outcome,
+                        'attempts': attempt,
+                        'duration': time.perf_counter() - attempt_start
+                    }
+                error = outcome.get('error') or self._nested_error(outcome) or 'step failed'
+
+            except asyncio.TimeoutError:
+                error = f"timed out after {timeout}s"
+            except Exception as e:
+                error = str(e)
+
+            logger.warning(f"⚠️ Workflow step {step.step_id} attempt {attempt} failed: {error}")
+            if attempt <= retries:
+                await asyncio.sleep(self.retry_backoff * attempt)
+
+        return {'success': False, 'error': error, 'attempts': retries + 1}
+
+    async def _call(self, step: WorkflowStep, inputs: Dict[str, Any],
+                    context: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        handler = self.handlers.get(step.task_type)
+        if handler is not None:
+            return await handler(step, inputs)
+
+        return await self.dispatcher.dispatch_task({
+            **context,
+            'task_type': step.task_type,
+            'description': step.description,
+            'priority': step.priority,
+            'required_capabilities': step.required_capabilities,
+            'timeout': timeout,
+            'step_id': step.step_id,
+            'inputs': inputs
+        })
+
+    @staticmethod
+    def _succeeded(outcome: Dict[str, Any]) -> bool:
+        """A dispatch succeeds only if the agent's own result did too"""
+        if not outcome.get('success'):
+            return False
+        result = outcome.get('result')
+        return not isinstance(result, dict) or result.get('success', True)
+
+    @staticmethod
+    def _nested_error(outcome: Dict[str, Any]) -> Optional[str]:
+        result = outcome.get('result')
+        return result.get('error') if isinstance(result, dict) else None
@@ -428,13 +428,10 @@ class FreelanceXAI:
     async def _start_agents(self):
         """Start all registered agents"""
         try:
-            agent_tasks = []
-            for agent_name, agent in self.agent_manager.agents.items():
-                task = asyncio.create_task(agent.run())
-                agent_tasks.append(task)
-                self.logger.info(f"Started {agent_name}")
+            # Runs each agent's message loop and the workers that drain its task queue
+            await self.agent_manager.start()
             
-            self.logger.info(f"All {len(agent_tasks)} agents started successfully")
+            self.logger.info(f"All {len(self.agent_manager.agents)} agents started successfully")
             
         except Exception as e:
             self.logger.error(f"Error starting agents: {e}")
@@ -448,9 +445,6 @@ class FreelanceXAI:
                 # Update session metrics
                 await self._update_session_metrics()
                 
-                # Process any pending tasks
-                await self._process_pending_tasks()
-                
                 # Periodic agent coordination
                 await self._coordinate_agents()
                 
@@ -483,18 +477,6 @@ class FreelanceXAI:
         except Exception as e:
             self.logger.error(f"Error updating session metrics: {e}")
 
-    async def _process_pending_tasks(self):
-        """Process any pending system tasks"""
-        try:
-            # Check for high-priority agent tasks
-            if self.agent_manager.task_queue.qsize() > 0:
-                pending_task = await self.agent_manager.task_queue.get()
-                result = await self.agent_manager.distribute_task(pending_task)
-                self.logger.info(f"Processed pending task: {pending_task.get('type', 'unknown')}")
-            
-        except Exception as e:
-            self.logger.error(f"Error processing pending tasks: {e}")
-
     async def _coordinate_agents(self):
         """Coordinate activities between agents"""
         try:
@@ -902,8 +884,8 @@ class FreelanceXAI:
                 }
                 await self._store_daily_summary(summary)
             
-            # Shutdown agent manager
-            await self.agent_manager.shutdown()
+            # Stop the agent manager, finishing queued tasks first
+            await self.agent_manager.stop()
             
             # Close database connections
             # Database will auto-close with context managers
@@ -7,7 +7,7 @@ import asyncio
 import sqlite3
 import json
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timedelta
 from pathlib import Path
 import aiosqlite
@@ -16,8 +16,34 @@ import hashlib
 from openai_agents import Session
 from openai import OpenAI
 
+from core.deadline import check_deadline
+
 logger = logging.getLogger(__name__)
 
+# Version 1 was a full json.dumps of the analysis (including user context) in `content`
+TASK_ANALYSIS_SCHEMA_VERSION = 2
+
+# Database migrations are tracked in PRAGMA user_version
+DB_SCHEMA_VERSION = 1
+
+
+def compact_task_analysis(analysis: Dict[str, Any], context_ids: List[int]) -> Dict[str, Any]:
+    """
+    Compact task_analysis record stored in an interaction's metadata
+    The user's text goes in the interaction content; earlier interactions the
+    analysis drew on are referenced by id instead of being copied.
+    """
+    return {
+        'schema_version': TASK_ANALYSIS_SCHEMA_VERSION,
+        'task_type': analysis.get('task_type', 'general'),
+        'confidence': round(analysis.get('confidence', 0.0), 4),
+        'priority': analysis.get('priority', 5),
+        'urgency': analysis.get('urgency', 'normal'),
+        'required_capabilities': sorted(analysis.get('required_capabilities', [])),
+        'input_type': analysis.get('input_type', 'text'),
+        'context_interaction_ids': [interaction_id for interaction_id in context_ids if interaction_id is not None]
+    }
+
 class MemoryManager:
     """
     SQLite-based memory manager for FreelanceX.AI with OpenAI Agent SDK integration
@@ -39,6 +65,7 @@ class MemoryManager:
         try:
             self.connection = await aiosqlite.connect(self.db_path)
             await self._create_tables()
+            await self._run_migrations()
             logger.info("✅ Memory system initialized with OpenAI Agent SDK integration")
         except Exception as e:
             logger.error(f"❌ Memory initialization failed: {str(e)}")
@@ -114,6 +141,31 @@ class MemoryManager:
                 )
             """)
             
+            # Agent memory entries spilled out of the in-process store
+            await cursor.execute("""
+                CREATE TABLE IF NOT EXISTS agent_memory (
+                    agent_name TEXT NOT NULL,
+                    memory_key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    expires_at TEXT,
+                    updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (agent_name, memory_key)
+                )
+            """)
+            
+            # Model responses to stateless prompts (persistent tier of the prompt cache)
+            await cursor.execute("""
+                CREATE TABLE IF NOT EXISTS prompt_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    scope TEXT NOT NULL,
+                    response TEXT NOT NULL,
+                    tokens INTEGER DEFAULT 0,
+                    latency REAL DEFAULT 0,
+                    expires_at TEXT NOT NULL,
+                    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            
             # Create indexes for better performance
             await cursor.execute("CREATE INDEX IF NOT EXISTS idx_interactions_user_id ON interactions(user_id)")
             await cursor.execute("CREATE INDEX IF NOT EXISTS idx_interactions_timestamp ON interactions(timestamp)")
@@ -125,6 +177,113 @@ class MemoryManager:
         await self.connection.commit()
         logger.info("📊 Database tables created successfully")
     
+    async def _run_migrations(self):
+        """Apply data migrations newer than the database's recorded schema version"""
+        async with self.connection.execute("PRAGMA user_version") as cursor:
+            version = (await cursor.fetchone())[0]
+        
+        if version < 1:
+            try:
+                # The rewrite and the version bump commit together, so a failed run is retried on next start
+                compacted = await self.compact_task_analysis_rows(commit=False)
+                await self.connection.execute("PRAGMA user_version = 1")
+                await self.connection.commit()
+            except Exception as e:
+                await self.connection.rollback()
+                logger.error(f"❌ Task analysis compaction failed, will retry on next start: {str(e)}")
+                return
+            if compacted:
+                # Hand the space freed by the rewritten rows back to the filesystem
+                await self.connection.execute("VACUUM")
+        
+        if version < DB_SCHEMA_VERSION:
+            logger.info(f"📊 Migrated memory database from schema {version} to {DB_SCHEMA_VERSION}")
+    
+    async def compact_task_analysis_rows(self, batch_size: int = 500, commit: bool = True) -> int:
+        """
+        Rewrite task_analysis interactions stored as full analysis dumps into compact records
+        
+        Args:
+            batch_size: Rows read and rewritten per batch
+            commit: Commit after each batch; pass False to leave the transaction to the caller
+            
+        Returns:
+            Number of rows rewritten
+            
+        Raises:
+            Any database error, after which the caller should roll back
+        """
+        compacted = 0
+        last_id = 0
+        while True:
+            async with self.connection.cursor() as cursor:
+                await cursor.execute("""
+                    SELECT id, user_id, content FROM interactions
+                    WHERE input_type = 'task_analysis' AND metadata IS NULL AND id > ?
+                    ORDER BY id
+                    LIMIT ?
+                """, (last_id, batch_size))
+                rows = await cursor.fetchall()
+            
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            
+            analyses = []
+            for interaction_id, user_id, content in rows:
+                try:
+                    analysis = json.loads(content)
+                except (TypeError, ValueError):
+                    continue
+                if isinstance(analysis, dict):
+                    recent = (analysis.get('user_context') or {}).get('recent_interactions') or []
+                    analyses.append((interaction_id, user_id, analysis, recent))
+            
+            # Old dumps embed earlier interactions by value; resolve them to ids by (user, timestamp)
+            ids_by_time = await self._interaction_ids_at({
+                (user_id, item.get('timestamp'))
+                for _, user_id, _, recent in analyses
+                for item in recent
+            })
+            
+            updates = []
+            for interaction_id, user_id, analysis, recent in analyses:
+                context_ids = [ids_by_time.get((user_id, item.get('timestamp'))) for item in recent]
+                record = compact_task_analysis(analysis, context_ids)
+                updates.append((analysis.get('content', ''), json.dumps(record), interaction_id))
+            
+            if updates:
+                async with self.connection.cursor() as cursor:
+                    await cursor.executemany(
+                        "UPDATE interactions SET content = ?, metadata = ? WHERE id = ?", updates
+                    )
+                if commit:
+                    await self.connection.commit()
+                compacted += len(updates)
+        
+        if compacted:
+            logger.info(f"🧹 Compacted {compacted} task analysis records")
+        
+        return compacted
+    
+    async def _interaction_ids_at(self, keys: set, chunk_size: int = 500) -> Dict[Tuple[str, str], int]:
+        """Look up interaction ids by (user_id, timestamp), keeping the latest id for duplicates"""
+        timestamps = sorted({timestamp for _, timestamp in keys if timestamp is not None})
+        ids_by_time = {}
+        for start in range(0, len(timestamps), chunk_size):
+            chunk = timestamps[start:start + chunk_size]
+            placeholders = ", ".join("?" for _ in chunk)
+            async with self.connection.cursor() as cursor:
+                await cursor.execute(f"""
+                    SELECT user_id, timestamp, MAX(id) FROM interactions
+                    WHERE timestamp IN ({placeholders})
+                    GROUP BY user_id, timestamp
+                """, chunk)
+                for user_id, timestamp, interaction_id in await cursor.fetchall():
+                    if (user_id, timestamp) in keys:
+                        ids_by_time[(user_id, timestamp)] = interaction_id
+        return ids_by_time
+    
     async def log_interaction(self, user_id: str, input_type: str, content: str, 
                             timestamp: str = None, metadata: Dict[str, Any] = None,
                             importance_score: float = 0.5):
@@ -150,9 +309,12 @@ class MemoryManager:
     async def get_recent_interactions(self, user_id: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Get recent interactions for a user"""
         try:
+            # Skip reads once the caller's deadline has passed
+            check_deadline()
+            
             async with self.connection.cursor() as cursor:
                 await cursor.execute("""
-                    SELECT input_type, content, timestamp, metadata, importance_score
+                    SELECT input_type, content, timestamp, metadata, importance_score, id
                     FROM interactions
                     WHERE user_id = ?
                     ORDER BY timestamp DESC
@@ -168,7 +330,8 @@ class MemoryManager:
                         'content': row[1],
                         'timestamp': row[2],
                         'metadata': json.loads(row[3]) if row[3] else None,
-                        'importance_score': row[4]
+                        'importance_score': row[4],
+                        'id': row[5]
                     })
                 
                 return interactions
@@ -180,11 +343,14 @@ class MemoryManager:
     async def search_interactions(self, user_id: str, query: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Search interactions by content"""
         try:
+            # Skip reads once the caller's deadline has passed
+            check_deadline()
+            
             search_pattern = f"%{query}%"
             
             async with self.connection.cursor() as cursor:
                 await cursor.execute("""
-                    SELECT input_type, content, timestamp, metadata, importance_score
+                    SELECT input_type, content, timestamp, metadata, importance_score, id
                     FROM interactions
                     WHERE user_id = ? AND content LIKE ?
                     ORDER BY importance_score DESC, timestamp DESC
@@ -200,7 +366,8 @@ class MemoryManager:
                         'content': row[1],
                         'timestamp': row[2],
                         'metadata': json.loads(row[3]) if row[3] else None,
-                        'importance_score': row[4]
+                        'importance_score': row[4],
+                        'id': row[5]
                     })
                 
                 return interactions
@@ -209,9 +376,36 @@ class MemoryManager:
             logger.error(f"❌ Failed to search interactions: {str(e)}")
             return []
     
+    async def get_task_analysis_samples(self, limit: int = 50000,
+                                        exclude_types: tuple = ('general',)) -> List[Tuple[str, str]]:
+        """(text, task_type) pairs from the most recent compact task_analysis records, for training"""
+        try:
+            async with self.connection.cursor() as cursor:
+                await cursor.execute("""
+                    SELECT content, metadata FROM interactions
+                    WHERE input_type = 'task_analysis' AND metadata IS NOT NULL
+                    ORDER BY id DESC
+                    LIMIT ?
+                """, (limit,))
+                rows = await cursor.fetchall()
+            
+            samples = []
+            for content, metadata in rows:
+                task_type = json.loads(metadata).get('task_type')
+                if content and task_type and task_type not in exclude_types:
+                    samples.append((content, task_type))
+            return samples
+            
+        except Exception as e:
+            logger.error(f"❌ Failed to get task analysis samples: {str(e)}")
+            return []
+    
     async def get_user_profile(self, user_id: str) -> Optional[Dict[str, Any]]:
         """Get user profile"""
         try:
+            # Skip reads once the caller's deadline has passed
+            check_deadline()
+            
             async with self.connection.cursor() as cursor:
                 await cursor.execute("""
                     SELECT name, skills, preferences, created_at, updated_at
@@ -536,6 +730,148 @@ class MemoryManager:
             
         except Exception as e:
             logger.error(f"❌ Failed to close session: {str(e)}")
+
+    async def archive_session(self, session_id: str, user_id: str, agent_name: str, session: Session):
+        """Persist an evicted session's transcript as an inactive row, without keeping the session object"""
+        try:
+            self.active_sessions.pop(session_id, None)
+            self.session_metadata.pop(session_id, None)
+
+            messages = getattr(session, 'messages', None) or []
+            session_data = json.dumps({
+                'messages_count': len(messages),
+                'last_message': messages[-1].content if messages else None,
+                'messages': [
+                    {'role': getattr(msg, 'role', None), 'content': getattr(msg, 'content', None)}
+                    for msg in messages
+                ]
+            }, default=str)
+
+            async with self.connection.cursor() as cursor:
+                await cursor.execute("""
+                    INSERT OR REPLACE INTO agent_sessions
+                    (session_id, user_id, agent_name, session_data, last_accessed, is_active)
+                    VALUES (?, ?, ?, ?, ?, FALSE)
+                """, (session_id, user_id, agent_name, session_data, datetime.now().isoformat()))
+
+            await self.connection.commit()
+            logger.debug(f"💾 Archived session {session_id} for user {user_id}")
+
+        except Exception as e:
+            logger.error(f"❌ Failed to archive session: {str(e)}")
+
+    async def store_agent_memory(self, agent_name: str, key: str, value: Any, ttl: Optional[float] = None):
+        """Persist an agent memory entry, expiring after `ttl` seconds if given"""
+        try:
+            expires_at = (datetime.now() + timedelta(seconds=ttl)).isoformat() if ttl is not None else None
+            
+            async with self.connection.cursor() as cursor:
+                await cursor.execute("""
+                    INSERT OR REPLACE INTO agent_memory 
+                    (agent_name, memory_key, value, expires_at, updated_at)
+                    VALUES (?, ?, ?, ?, ?)
+                """, (agent_name, key, json.dumps(value, default=str), expires_at, datetime.now().isoformat()))
+            
+            await self.connection.commit()
+            
+        except Exception as e:
+            logger.error(f"❌ Failed to store agent memory: {str(e)}")
+    
+    async def get_agent_memory(self, agent_name: str, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a persisted agent memory entry
+        
+        Returns:
+            {'value': ..., 'ttl': seconds left or None}, or None when missing or expired
+        """
+        try:
+            async with self.connection.cursor() as cursor:
+                await cursor.execute("""
+                    SELECT value, expires_at FROM agent_memory
+                    WHERE agent_name = ? AND memory_key = ?
+                """, (agent_name, key))
+                row = await cursor.fetchone()
+            
+            if not row:
+                return None
+            
+            ttl = None
+            if row[1]:
+                ttl = (datetime.fromisoformat(row[1]) - datetime.now()).total_seconds()
+                if ttl <= 0:
+                    await self.delete_agent_memory(agent_name, key)
+                    return None
+            
+            return {'value': json.loads(row[0]), 'ttl': ttl}
+            
+        except Exception as e:
+            logger.error(f"❌ Failed to get agent memory: {str(e)}")
+            return None
+    
+    async def delete_agent_memory(self, agent_name: str, key: str = None):
+        """Delete one persisted agent memory entry, or all of an agent's entries"""
+        try:
+            async with self.connection.cursor() as cursor:
+                if key is None:
+                    await cursor.execute("DELETE FROM agent_memory WHERE agent_name = ?", (agent_name,))
+                else:
+                    await cursor.execute(
+                        "DELETE FROM agent_memory WHERE agent_name = ? AND memory_key = ?",
+                        (agent_name, key)
+                    )
+            
+            await self.connection.commit()
+            
+        except Exception as e:
+            logger.error(f"❌ Failed to delete agent memory: {str(e)}")
+    
+    async def store_cached_response(self, cache_key: str, scope: str, response: str,
+                                    tokens: int, latency: float, ttl: float):
+        """Persist a cached model response for `ttl` seconds"""
+        try:
+            expires_at = (datetime.now() + timedelta(seconds=ttl)).isoformat()
+            
+            async with self.connection.cursor() as cursor:
+                await cursor.execute("""
+                    INSERT OR REPLACE INTO prompt_cache 
+                    (cache_key, scope, response, tokens, latency, expires_at, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, (cache_key, scope, response, tokens, latency, expires_at, datetime.now().isoformat()))
+            
+            await self.connection.commit()
+            
+        except Exception as e:
+            logger.error(f"❌ Failed to store cached response: {str(e)}")
+    
+    async def get_cached_response(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a persisted model response
+        
+        Returns:
+            {'response', 'tokens', 'latency', 'ttl': seconds left}, or None when missing or expired
+        """
+        try:
+            async with self.connection.cursor() as cursor:
+                await cursor.execute("""
+                    SELECT response, tokens, latency, expires_at FROM prompt_cache
+                    WHERE cache_key = ?
+                """, (cache_key,))
+                row = await cursor.fetchone()
+            
+            if not row:
+                return None
+            
+            ttl = (datetime.fromisoformat(row[3]) - datetime.now()).total_seconds()
+            if ttl <= 0:
+                await self.connection.execute("DELETE FROM prompt_cache WHERE cache_key = ?", (cache_key,))
+                await self.connection.commit()
+                return None
+            
+            return {'response': row[0], 'tokens': row[1], 'latency': row[2], 'ttl': ttl}
+            
+        except Exception as e:
+            logger.error(f"❌ Failed to get cached response: {str(e)}")
+            return None
     
     async def cleanup_old_data(self, days: int = 365):
         """Clean up old data to prevent database bloat"""
@@ -561,6 +897,18 @@ class MemoryManager:
                     WHERE usage_count < 3 AND updated_at < ?
                 """, (cutoff_date,))
                 
+                # Clean up expired agent memory
+                await cursor.execute("""
+                    DELETE FROM agent_memory
+                    WHERE expires_at IS NOT NULL AND expires_at < ?
+                """, (datetime.now().isoformat(),))
+                
+                # Clean up expired cached model responses
+                await cursor.execute("""
+                    DELETE FROM prompt_cache
+                    WHERE expires_at < ?
+                """, (datetime.now().isoformat(),))
+                
                 # Clean up old inactive sessions
                 await cursor.execute("""
                     DELETE FROM agent_sessions
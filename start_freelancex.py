@@ -20,7 +20,7 @@ sys.path.append(str(project_root))
 
 # Import FreelanceX.AI components
 from config.settings import get_config, FreelanceXConfig
-from core.agent_manager import AgentManager
+from core.agent_manager import AgentManager, as_managed_agent
 from core.executive_agent import ExecutiveAgent
 from memory.sqlite_memory import MemoryManager
 from backend.database import DatabaseManager
@@ -36,6 +36,15 @@ from agents.job_search_agent import JobSearchAgent
 from agents.web_search_agent import WebSearchAgent
 from agents.math_agent import MathAgent
 
+# Specialized agents by config name: class, the agent ID the dispatcher's routing rules
+# use, and the task types used to route to them before they are built
+AGENT_SPECS = {
+    "proposal_writer": (ProposalWriterAgent, "proposal_writer_agent", ["proposal_writing", "content_creation"]),
+    "job_search": (JobSearchAgent, "job_search_agent", ["job_search", "market_research"]),
+    "web_search": (WebSearchAgent, "web_search", ["web_search", "market_research"]),
+    "math": (MathAgent, "math_agent", ["financial_analysis", "statistical_analysis", "income_forecasting"])
+}
+
 # Configure logging
 def setup_logging(log_level: str = "INFO"):
     """Setup logging configuration"""
@@ -111,46 +120,91 @@ class FreelanceXOrchestrator:
         logger.info("Initializing agents with OpenAI Agent SDK...")
         
         try:
-            # Initialize OpenAI client
-            self.openai_client = OpenAI()
+            start_time = time.perf_counter()
+            timings: Dict[str, Dict[str, float]] = {}
+            eager_names = [name for name in AGENT_SPECS if name in self.config.agents.eager_agents]
             
-            # Initialize memory manager
+            # Independent setup runs concurrently; constructors read config files and
+            # build SDK agents, so they run in worker threads
             self.memory_manager = MemoryManager()
-            await self.memory_manager.initialize()
+            results = await asyncio.gather(
+                asyncio.to_thread(OpenAI),
+                self.memory_manager.initialize(),
+                self._construct_agent("executive", ExecutiveAgent, timings),
+                *(self._construct_agent(name, AGENT_SPECS[name][0], timings) for name in eager_names),
+                return_exceptions=True
+            )
+            # Core services are required; a specialized agent that fails to build is reported and skipped
+            for result in results[:3]:
+                if isinstance(result, BaseException):
+                    raise result
+            self.openai_client = results[0]
+            self.executive_agent = results[2]
+            self.executive_agent.attach_memory_backend(self.memory_manager)
+            for name, agent in zip(eager_names, results[3:]):
+                if isinstance(agent, BaseException):
+                    logger.error(f"Failed to construct agent {name}: {agent}")
+                else:
+                    self.agents[name] = agent
             
             # Initialize agent manager with OpenAI Agent SDK support
             self.agent_manager = AgentManager()
             self.agent_manager.memory_manager = self.memory_manager
             self.agent_manager.session_registry = {}
             
-            # Initialize executive agent
-            self.executive_agent = ExecutiveAgent()
-            
-            # Initialize specialized agents
-            self.agents["proposal_writer"] = ProposalWriterAgent()
-            self.agents["job_search"] = JobSearchAgent()
-            self.agents["web_search"] = WebSearchAgent()
-            self.agents["math"] = MathAgent()
-            
-            # Register agents with manager
-            for name, agent in self.agents.items():
-                success = self.agent_manager.register_agent(agent)
+            # Register eager agents concurrently; registration awaits each agent's initialize()
+            registered = await asyncio.gather(
+                *(self._register_agent(name, agent, timings) for name, agent in self.agents.items())
+            )
+            for name, success in zip(self.agents, registered):
                 if success:
                     logger.info(f"Registered agent: {name}")
                 else:
                     logger.warning(f"Failed to register agent: {name}")
             
+            # Everything else is built on first dispatch
+            for name, (agent_class, agent_id, task_types) in AGENT_SPECS.items():
+                if name not in eager_names:
+                    self.agent_manager.register_lazy_agent(agent_id, agent_class, task_types=task_types)
+            
             self.services["agent_manager"] = self.agent_manager
             self.services["agents"] = self.agents
             self.services["memory_manager"] = self.memory_manager
             self.services["executive_agent"] = self.executive_agent
             
-            logger.info(f"Initialized {len(self.agents)} agents successfully with OpenAI Agent SDK")
+            self._log_agent_timings(timings, time.perf_counter() - start_time)
+            logger.info(f"Initialized {len(self.agents)} agents successfully with OpenAI Agent SDK "
+                        f"({len(self.agent_manager.lazy_agents)} deferred)")
             
         except Exception as e:
             logger.error(f"Agent initialization failed: {str(e)}")
             raise
     
+    async def _construct_agent(self, name: str, factory, timings: Dict[str, Dict[str, float]]):
+        """Construct an agent in a worker thread and time it"""
+        start_time = time.perf_counter()
+        agent = await asyncio.to_thread(factory)
+        timings.setdefault(name, {})["construct"] = time.perf_counter() - start_time
+        return agent
+    
+    async def _register_agent(self, name: str, agent, timings: Dict[str, Dict[str, float]]) -> bool:
+        """Register an agent with the manager and time its initialization"""
+        start_time = time.perf_counter()
+        try:
+            # Registered under the ID the dispatcher's routing rules use
+            return await self.agent_manager.register_agent(as_managed_agent(agent, AGENT_SPECS[name][1]))
+        finally:
+            timings.setdefault(name, {})["initialize"] = time.perf_counter() - start_time
+    
+    def _log_agent_timings(self, timings: Dict[str, Dict[str, float]], total: float):
+        """Log the per-agent startup time breakdown"""
+        logger.info(f"Agent startup took {total:.2f}s (steps overlap, so per-agent times may sum to more)")
+        for name, timing in sorted(timings.items(), key=lambda item: -sum(item[1].values())):
+            construct = timing.get("construct", 0.0)
+            initialize = timing.get("initialize", 0.0)
+            logger.info(f"  {name:<16} construct {construct:.2f}s  initialize {initialize:.2f}s  "
+                        f"total {construct + initialize:.2f}s")
+    
     async def initialize_external_integrations(self):
         """Initialize external service integrations"""
         logger.info("Initializing external integrations...")
@@ -0,0 +1,210 @@
+"""
+Tests for core.agent_manager
+"""
+
+import asyncio
+
+import pytest
+import pytest_asyncio
+
+from core.agent_manager import AgentManager, AdmissionRejected, BaseAgent
+from core.deadline import report_partial_result
+from core.workflow import WorkflowExecutor, WorkflowStep
+
+
+class BatchAgent(BaseAgent):
+    """Agent that handles a batch in one call taking `per_task` seconds per task"""
+
+    supports_batch = True
+    max_batch_size = 10
+
+    def __init__(self, per_task=0.01):
+        super().__init__('batch_agent', 'BatchAgent', 'Batching agent for tests')
+        self.per_task = per_task
+
+    def get_capabilities(self):
+        return ['batching']
+
+    async def process_task(self, task_data):
+        await asyncio.sleep(self.per_task)
+        return {'success': True}
+
+    async def process_batch(self, tasks):
+        await asyncio.sleep(self.per_task * len(tasks))
+        return [{'success': True} for _ in tasks]
+
+
+@pytest_asyncio.fixture
+async def manager():
+    return AgentManager()
+
+
+@pytest.mark.asyncio
+async def test_batch_latency_is_recorded_per_task(manager):
+    agent = BatchAgent(per_task=0.01)
+    await manager.register_agent(agent)
+
+    results = await manager.execute_batch(agent.agent_id, [{'content': str(i)} for i in range(8)])
+
+    assert all(result['success'] for result in results)
+    assert agent.latency.count == 8
+    # One task's worth of time, not the whole batch's
+    assert agent.latency.ewma < 0.04
+
+
+class SimpleAgent(BaseAgent):
+    def __init__(self, agent_id='built_id'):
+        super().__init__(agent_id, 'SimpleAgent', 'Plain agent for tests')
+
+    def get_capabilities(self):
+        return ['simple']
+
+    async def process_task(self, task_data):
+        return {'success': True}
+
+
+@pytest.mark.asyncio
+async def test_lazy_agent_is_registered_under_its_declared_id(manager):
+    manager.register_lazy_agent('simple_agent', SimpleAgent, task_types=['simple_work'])
+
+    loaded = await manager.load_lazy_agents('simple_work')
+
+    assert [agent.agent_id for agent in loaded] == ['simple_agent']
+    assert await manager.get_agent('simple_agent') is loaded[0]
+    assert 'built_id' not in manager.agents
+    assert (await manager.execute_task('simple_agent', {'content': 'x'}))['success']
+
+
+@pytest.mark.asyncio
+async def test_run_admitted_work_counts_toward_admission(manager):
+    agent = SimpleAgent('simple_agent')
+    agent.max_concurrency = 1
+    await manager.register_agent(agent)
+    manager.admission_limits['normal']['max_queued'] = 1
+    bulkhead = manager.bulkheads['simple_agent']
+    release = asyncio.Event()
+
+    async def action():
+        await release.wait()
+        return 'done'
+
+    running = asyncio.create_task(manager.run_admitted('simple_agent', action))
+    await asyncio.sleep(0.01)
+    queued = asyncio.create_task(manager.run_admitted('simple_agent', action))
+    await asyncio.sleep(0.01)
+    assert bulkhead.in_flight == 1
+    assert bulkhead.depth == 1
+
+    # The queue is full, so a third request is shed
+    with pytest.raises(AdmissionRejected) as rejected:
+        await manager.run_admitted('simple_agent', action)
+    assert rejected.value.rejection['reason'] == 'queue_full'
+
+    release.set()
+    assert await asyncio.gather(running, queued) == ['done', 'done']
+    assert bulkhead.in_flight == 0 and bulkhead.depth == 0
+
+
+@pytest.mark.asyncio
+async def test_run_admitted_releases_its_queue_entry_on_timeout(manager):
+    agent = SimpleAgent('simple_agent')
+    agent.max_concurrency = 1
+    await manager.register_agent(agent)
+    manager.default_service_time = 0.01
+    bulkhead = manager.bulkheads['simple_agent']
+
+    holder = asyncio.create_task(manager.run_admitted('simple_agent', lambda: asyncio.sleep(0.2)))
+    await asyncio.sleep(0.01)
+    with pytest.raises(asyncio.TimeoutError):
+        await manager.run_admitted('simple_agent', lambda: asyncio.sleep(0), timeout=0.05)
+
+    assert bulkhead.depth == 0
+    await holder
+
+
+@pytest.mark.asyncio
+async def test_negotiations_are_tracked_until_done(manager):
+    await manager.register_agent(SimpleAgent('buyer'))
+    await manager.register_agent(SimpleAgent('seller'))
+    manager.message_bus.register('seller', asyncio.Queue())  # nobody answers
+
+    negotiation_id = await manager.initiate_negotiation('buyer', 'seller', {'rate': 50}, timeout=0.05)
+    assert len(manager._negotiation_tasks) == 1
+
+    await asyncio.gather(*manager._negotiation_tasks)
+    assert not manager._negotiation_tasks
+    assert (await manager.get_negotiation(negotiation_id))['status'] == 'timed_out'
+
+
+@pytest.mark.asyncio
+async def test_stop_cancels_running_negotiations(manager):
+    await manager.register_agent(SimpleAgent('buyer'))
+    await manager.register_agent(SimpleAgent('seller'))
+    manager.message_bus.register('seller', asyncio.Queue())
+
+    negotiation_id = await manager.initiate_negotiation('buyer', 'seller', {'rate': 50}, timeout=60)
+    await asyncio.sleep(0)
+    await manager.stop(drain=False)
+
+    negotiation = await manager.get_negotiation(negotiation_id)
+    assert negotiation['status'] == 'cancelled'
+    assert 'finished_at' in negotiation
+    assert not manager._negotiation_tasks
+
+
+class WorkflowAgent(BaseAgent):
+    """Agent running a two-step workflow whose second step hangs"""
+
+    def __init__(self):
+        super().__init__('workflow_agent', 'WorkflowAgent', 'Workflow agent for tests')
+
+    def get_capabilities(self):
+        return ['workflow']
+
+    async def process_task(self, task_data):
+        async def outline(step, inputs):
+            return {'success': True, 'result': 'outline'}
+
+        async def draft(step, inputs):
+            await asyncio.sleep(10)
+
+        executor = WorkflowExecutor(None, handlers={'outline': outline, 'draft': draft})
+        return await executor.execute([WorkflowStep('outline', 'outline', 'Outline'),
+                                       WorkflowStep('draft', 'draft', 'Draft', depends_on=['outline'])],
+                                      task_data)
+
+
+@pytest.mark.asyncio
+async def test_timeout_returns_the_last_reported_partial_result(manager):
+    class ReportingAgent(SimpleAgent):
+        async def process_task(self, task_data):
+            report_partial_result({'pages': 1})
+            report_partial_result({'pages': 2})
+            await asyncio.sleep(10)
+
+    await manager.register_agent(ReportingAgent('reporting_agent'))
+
+    result = await manager.execute_task('reporting_agent', {'content': 'research'}, timeout=0.05)
+
+    assert result['timed_out']
+    assert result['partial_result'] == {'pages': 2}
+
+
+@pytest.mark.asyncio
+async def test_timeout_returns_the_completed_workflow_steps(manager):
+    await manager.register_agent(WorkflowAgent())
+
+    result = await manager.execute_task('workflow_agent', {'content': 'write'}, timeout=0.1)
+
+    assert result['timed_out']
+    assert result['partial_result'] == {
+        'completed_steps': {'outline': {'success': True, 'result': 'outline'}},
+        'failed_steps': []
+    }
+
+
+def test_default_cache_ttls_are_shared_read_only():
+    with pytest.raises(TypeError):
+        SimpleAgent.cache_ttls['general'] = 60
+
+    assert not SimpleAgent().cache_ttls
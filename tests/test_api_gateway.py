@@ -0,0 +1,344 @@
+"""
+Tests for backend.api_gateway
+"""
+
+import asyncio
+import json
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import backend.api_gateway as api_gateway
+from backend.api_gateway import APIConfig, APIGateway, StreamTaskRequest
+from core.agent_manager import AdmissionRejected, BaseAgent
+
+
+class EchoAgent(BaseAgent):
+    """Agent whose actions echo their parameters"""
+
+    def __init__(self, agent_id='echo'):
+        super().__init__(agent_id, 'Echo', 'Echoes its input')
+
+    def get_capabilities(self):
+        return []
+
+    async def process_task(self, task):
+        return {'success': True, 'echo': task.get('content')}
+
+    async def echo(self, text='', **kwargs):
+        return {'text': text}
+
+
+class StreamingAgent(BaseAgent):
+    """Agent that streams one token per step; content is the number of tokens"""
+
+    def __init__(self, delay=0.01):
+        super().__init__('streamer', 'Streamer', 'Streams tokens')
+        self.delay = delay
+        self.produced = 0
+        self.closed = 0
+
+    def get_capabilities(self):
+        return []
+
+    async def process_task(self, task):
+        return {'success': True}
+
+    async def stream_task(self, task):
+        try:
+            for index in range(int(task['content'] or 1)):
+                await asyncio.sleep(self.delay)
+                self.produced += 1
+                yield {'event': 'token', 'text': f't{index}'}
+            yield {'event': 'result', 'result': {'success': True}}
+        finally:
+            self.closed += 1
+
+
+def sse_events(body):
+    """Event names of an SSE body, with keep-alive comments as 'keep-alive'"""
+    names = []
+    for block in body.split('\n\n'):
+        if block.startswith(': keep-alive'):
+            names.append('keep-alive')
+        elif block.startswith('event: '):
+            names.append(block.split('\n')[0][len('event: '):])
+    return names
+
+
+def receive_until(websocket, final_events):
+    """Event names received over a WebSocket up to and including one of final_events"""
+    names = []
+    while True:
+        event = websocket.receive_json()
+        names.append(event['event'])
+        if event['event'] in final_events:
+            return names
+
+
+def wait_for(condition, timeout=1.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+@pytest.fixture
+def gateway():
+    api_gateway.limiter.reset()
+    gateway = APIGateway(APIConfig(stream_heartbeat_interval=0.05))
+
+    async def current_user():
+        return {'username': 'tester'}
+
+    async def user_from_token(token):
+        return {'username': 'tester'}
+
+    gateway.app.dependency_overrides[gateway._get_current_user] = current_user
+    gateway._user_from_token = user_from_token
+    return gateway
+
+
+@pytest.fixture
+def client(gateway):
+    with TestClient(gateway.app) as client:
+        yield client
+
+
+def register(client, gateway, agent):
+    client.portal.call(gateway.agent_manager.register_agent, agent)
+    return agent
+
+
+def test_execute_runs_the_action(client, gateway):
+    register(client, gateway, EchoAgent())
+
+    response = client.post('/agents/echo/execute', json={'agent_name': 'echo', 'action': 'echo',
+                                                         'parameters': {'text': 'hi'}})
+
+    assert response.status_code == 200
+    assert response.json()['data'] == {'text': 'hi'}
+
+
+@pytest.mark.parametrize('priority, status_code', [(2, 429), (5, 503)])
+def test_shed_requests_carry_retry_after(client, gateway, monkeypatch, priority, status_code):
+    register(client, gateway, EchoAgent())
+    # Past the low and normal wait limits (5s and 20s)
+    monkeypatch.setattr(gateway.agent_manager, 'estimate_wait', lambda agent_id: 30.0)
+
+    response = client.post('/agents/echo/execute', json={'agent_name': 'echo', 'action': 'echo',
+                                                         'priority': priority})
+
+    assert response.status_code == status_code
+    assert response.headers['retry-after'] == '30'
+    assert 'overloaded' in response.json()['detail']
+    assert gateway.system_metrics['shed_requests'] == 1
+
+
+def test_sse_streams_the_agent_events(client, gateway):
+    register(client, gateway, StreamingAgent())
+
+    response = client.get('/agents/streamer/stream', params={'content': '3'})
+
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('text/event-stream')
+    events = [name for name in sse_events(response.text) if name != 'keep-alive']
+    assert events == ['started', 'token', 'token', 'token', 'result', 'completed']
+    assert gateway.system_metrics['successful_requests'] == 1
+
+
+def test_sse_sends_keep_alives_while_the_agent_is_quiet(client, gateway):
+    register(client, gateway, StreamingAgent(delay=0.2))
+
+    response = client.get('/agents/streamer/stream', params={'content': '1'})
+
+    assert 'keep-alive' in sse_events(response.text)
+    assert sse_events(response.text)[-1] == 'completed'
+
+
+def test_sse_rejects_invalid_parameters(client, gateway):
+    register(client, gateway, StreamingAgent())
+
+    assert client.get('/agents/streamer/stream', params={'priority': 11}).status_code == 422
+    assert client.get('/agents/missing/stream').status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_sse_client_disconnect_stops_the_agent(gateway):
+    agent = StreamingAgent(delay=0.02)
+    await gateway.agent_manager.register_agent(agent)
+    body = gateway._sse_stream(gateway._agent_events('streamer', StreamTaskRequest(content='100'),
+                                                     {'username': 'tester'}))
+
+    async for chunk in body:
+        if chunk.startswith('event: token'):
+            break
+    # Starlette closes the body iterator when the client goes away
+    await body.aclose()
+
+    assert agent.closed == 1
+    assert agent.produced < 5
+    assert gateway.agent_manager.bulkheads['streamer'].in_flight == 0
+
+
+def test_websocket_runs_tasks_and_sends_heartbeats(client, gateway):
+    register(client, gateway, StreamingAgent(delay=0.1))
+
+    with client.websocket_connect('/agents/streamer/ws?token=test') as websocket:
+        websocket.send_json({'content': '2'})
+        events = receive_until(websocket, {'completed', 'error'})
+
+    assert [name for name in events if name != 'heartbeat'] == ['started', 'token', 'token', 'result', 'completed']
+    assert 'heartbeat' in events
+
+
+def test_websocket_reports_malformed_messages_and_keeps_the_connection(client, gateway):
+    register(client, gateway, StreamingAgent())
+
+    with client.websocket_connect('/agents/streamer/ws?token=test') as websocket:
+        for message in ([1, 2], 'cancel', 5):
+            websocket.send_json(message)
+            assert websocket.receive_json() == {'event': 'error', 'error': 'Messages must be JSON objects'}
+
+        websocket.send_json({'content': '1', 'priority': 11, 'timeout': -1})
+        error = websocket.receive_json()
+        assert error['event'] == 'error'
+        assert sorted(item['loc'][0] for item in error['errors']) == ['priority', 'timeout']
+
+        websocket.send_json({'content': '1'})
+        assert receive_until(websocket, {'completed', 'error'})[-1] == 'completed'
+
+
+def test_websocket_cancel_stops_the_running_task(client, gateway):
+    agent = register(client, gateway, StreamingAgent(delay=0.02))
+
+    with client.websocket_connect('/agents/streamer/ws?token=test') as websocket:
+        websocket.send_json({'content': '100'})
+        receive_until(websocket, {'token'})
+        websocket.send_json({'action': 'cancel'})
+        assert receive_until(websocket, {'cancelled'})[-1] == 'cancelled'
+
+    assert wait_for(lambda: agent.closed == 1)
+    assert agent.produced < 100
+    assert wait_for(lambda: gateway.agent_manager.bulkheads['streamer'].in_flight == 0)
+
+
+class BatchAgent(EchoAgent):
+    """Agent whose actions sleep or fail, for batch requests"""
+
+    async def sleep(self, seconds=0.0, **kwargs):
+        await asyncio.sleep(seconds)
+        return {'slept': seconds}
+
+    async def fail(self, **kwargs):
+        raise RuntimeError('action failed')
+
+
+class StubAgentManager:
+    """AgentManager stand-in that admits work directly and records how much runs at once"""
+
+    def __init__(self, agents, shed=()):
+        self.agents = agents
+        self.shed = set(shed)
+        self.active = 0
+        self.peak = 0
+        self.calls = []
+
+    async def run_admitted(self, agent_id, call, priority=5, timeout=None):
+        self.calls.append((agent_id, priority))
+        if agent_id in self.shed:
+            raise AdmissionRejected({'success': False, 'error': f'Agent {agent_id} is overloaded'})
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            return await asyncio.wait_for(call(), timeout)
+        finally:
+            self.active -= 1
+
+
+@pytest.fixture
+def batch_manager(gateway, monkeypatch):
+    # Every gateway built in this session re-registers its limits on the shared limiter
+    monkeypatch.setattr(api_gateway.limiter, 'enabled', False)
+    gateway.agent_manager = StubAgentManager({'echo': BatchAgent(), 'busy': BatchAgent('busy')}, shed={'busy'})
+    return gateway.agent_manager
+
+
+def batch_item(action, agent_name='echo', **parameters):
+    return {'agent_name': agent_name, 'action': action, 'parameters': parameters}
+
+
+def test_batch_returns_a_result_per_item_in_request_order(client, gateway, batch_manager):
+    response = client.post('/agents/batch', json={'items': [
+        batch_item('echo', text='hi'),
+        batch_item('fail'),
+        batch_item('echo', agent_name='missing'),
+        batch_item('unknown_action'),
+        batch_item('echo', agent_name='busy'),
+        batch_item('sleep', seconds=0.01),
+    ]})
+
+    assert response.status_code == 200
+    body = response.json()
+    results = body['results']
+    assert [result['index'] for result in results] == list(range(6))
+    assert [result['success'] for result in results] == [True, False, False, False, False, True]
+    assert results[0]['data'] == {'text': 'hi'}
+    assert results[1]['error'] == 'action failed'
+    assert results[2]['error'] == 'Agent missing not found'
+    assert 'not supported' in results[3]['error']
+    assert 'overloaded' in results[4]['error']
+    assert results[5]['data'] == {'slept': 0.01}
+    assert (body['success'], body['succeeded'], body['failed']) == (False, 2, 4)
+    assert gateway.system_metrics['shed_requests'] == 1
+
+
+def test_batch_runs_at_most_max_concurrency_items_at_once(client, gateway, batch_manager):
+    items = [batch_item('sleep', seconds=0.05) for _ in range(6)]
+
+    response = client.post('/agents/batch', json={'items': items, 'max_concurrency': 2})
+
+    assert response.json()['succeeded'] == 6
+    assert batch_manager.peak == 2
+
+    # The gateway's own limit caps what a client may ask for
+    gateway.config.batch_concurrency = 3
+    batch_manager.peak = 0
+    client.post('/agents/batch', json={'items': items, 'max_concurrency': 50})
+    assert batch_manager.peak == 3
+
+
+def test_batch_items_past_the_batch_deadline_fail_individually(client, gateway, batch_manager):
+    response = client.post('/agents/batch', json={'items': [
+        batch_item('sleep', seconds=0.01), batch_item('sleep', seconds=5)
+    ], 'timeout': 0.2})
+
+    results = response.json()['results']
+    assert results[0]['success']
+    assert not results[1]['success'] and 'timed out' in results[1]['error']
+
+
+def test_batch_streams_ndjson_in_completion_order(client, gateway, batch_manager):
+    response = client.post('/agents/batch', json={'stream': True, 'items': [
+        batch_item('sleep', seconds=0.15),
+        batch_item('fail'),
+        batch_item('sleep', seconds=0.05),
+    ]})
+
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('application/x-ndjson')
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line['index'] for line in lines[:-1]] == [1, 2, 0]
+    assert [line['success'] for line in lines[:-1]] == [False, True, True]
+    summary = lines[-1]
+    assert summary['summary'] and not summary['success']
+    assert (summary['succeeded'], summary['failed']) == (2, 1)
+
+
+def test_batch_rejects_oversized_and_empty_requests(client, gateway, batch_manager):
+    gateway.config.max_batch_items = 2
+
+    assert client.post('/agents/batch', json={'items': [batch_item('echo')] * 3}).status_code == 413
+    assert client.post('/agents/batch', json={'items': []}).status_code == 422
+    assert batch_manager.calls == []
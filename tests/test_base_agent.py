@@ -0,0 +1,149 @@
+"""
+Tests for core.base_agent
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from core.base_agent import BaseAgent
+from core.session_manager import SessionManager
+
+
+class ThreadedSession:
+    """Blocking session that records how many turns run at once"""
+
+    def __init__(self, tracker):
+        self.messages = []
+        self.tracker = tracker
+
+    def run(self, message):
+        with self.tracker['lock']:
+            self.tracker['active'] += 1
+            self.tracker['peak'] = max(self.tracker['peak'], self.tracker['active'])
+        time.sleep(0.01)
+        with self.tracker['lock']:
+            self.tracker['active'] -= 1
+        self.messages.append(message)
+        return f"reply to {message}"
+
+    async def run_streamed(self, message):
+        with self.tracker['lock']:
+            self.tracker['active'] += 1
+            self.tracker['peak'] = max(self.tracker['peak'], self.tracker['active'])
+        try:
+            for word in message.split():
+                await asyncio.sleep(0.005)
+                yield word
+        finally:
+            with self.tracker['lock']:
+                self.tracker['active'] -= 1
+
+
+class EchoAgent(BaseAgent):
+    async def execute_task(self, task):
+        return {'success': True}
+
+    async def self_diagnose(self):
+        return {'healthy': True}
+
+
+@pytest.fixture
+def agent(monkeypatch):
+    monkeypatch.setenv('OPENAI_API_KEY', 'test-key')
+    agent = EchoAgent('echo', 'test')
+    assert agent.openai_agent is not None
+    agent.tracker = {'lock': threading.Lock(), 'active': 0, 'peak': 0}
+    agent.sessions = SessionManager(lambda: ThreadedSession(agent.tracker))
+    return agent
+
+
+@pytest.mark.asyncio
+async def test_run_model_serializes_turns_on_one_session(agent):
+    first = asyncio.create_task(agent.run_model('alice', 'one'))
+    second = asyncio.create_task(agent.run_model('alice', 'two'))
+    await asyncio.sleep(0.015)
+    third = asyncio.create_task(agent.run_model('alice', 'three'))
+
+    assert await asyncio.gather(first, second, third) == ['reply to one', 'reply to two', 'reply to three']
+    assert agent.tracker['peak'] == 1
+    assert len(agent._session_locks) == 0
+
+
+@pytest.mark.asyncio
+async def test_stream_model_holds_the_session_until_the_stream_ends(agent):
+    async def collect(text):
+        return [chunk async for chunk in agent.stream_model('alice', text)]
+
+    results = await asyncio.gather(collect('a b c'), collect('d e'), agent.run_model('alice', 'f'))
+
+    assert results == [['a', 'b', 'c'], ['d', 'e'], 'reply to f']
+    assert agent.tracker['peak'] == 1
+    assert len(agent._session_locks) == 0
+
+
+class RecordingAgent(BaseAgent):
+    """Agent that records the tasks and diagnoses it runs"""
+
+    diagnosis_interval = 0.02
+
+    def __init__(self):
+        super().__init__('recorder', 'test')
+        self.handled = asyncio.Queue()
+        self.diagnoses = 0
+
+    async def execute_task(self, task):
+        await self.handled.put((task, time.perf_counter()))
+        return {'success': True}
+
+    async def self_diagnose(self):
+        self.diagnoses += 1
+        return {'needs_repair': False}
+
+
+@pytest.mark.asyncio
+async def test_run_handles_a_queued_message_without_polling():
+    agent = RecordingAgent()
+    loop_task = asyncio.create_task(agent.run())
+    try:
+        await asyncio.sleep(0.01)
+        sent_at = time.perf_counter()
+        await agent.message_queue.put({'type': 'request', 'data': {'content': 'hello'}})
+
+        task, handled_at = await asyncio.wait_for(agent.handled.get(), 1.0)
+        assert task == {'content': 'hello'}
+        assert handled_at - sent_at < 0.05
+    finally:
+        loop_task.cancel()
+
+
+@pytest.mark.asyncio
+async def test_run_exits_promptly_when_cancelled():
+    agent = RecordingAgent()
+    loop_task = asyncio.create_task(agent.run())
+    await asyncio.sleep(0.01)
+
+    loop_task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await asyncio.wait_for(loop_task, 0.1)
+    await asyncio.sleep(0)
+
+    # The diagnosis timer stops with the loop
+    diagnoses = agent.diagnoses
+    await asyncio.sleep(agent.diagnosis_interval * 3)
+    assert agent.diagnoses == diagnoses
+
+
+@pytest.mark.asyncio
+async def test_diagnosis_runs_on_its_interval():
+    agent = RecordingAgent()
+    loop_task = asyncio.create_task(agent.run())
+    try:
+        await asyncio.sleep(agent.diagnosis_interval * 5.5)
+    finally:
+        loop_task.cancel()
+
+    # No messages arrived, yet diagnosis kept running on its own timer
+    assert 3 <= agent.diagnoses <= 6
@@ -0,0 +1,112 @@
+"""
+Tests for core.bounded_memory
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from core.bounded_memory import BoundedMemoryStore, estimate_size
+
+VALUE = b'x' * 100
+SIZE = estimate_size(VALUE)
+
+
+def test_least_recently_used_entries_are_evicted_first():
+    store = BoundedMemoryStore(max_bytes=SIZE * 3)
+    for key in ('a', 'b', 'c'):
+        store.set(key, VALUE)
+    store.get('a')
+
+    store.set('d', VALUE)
+    assert list(store.keys()) == ['c', 'a', 'd']
+
+    store.set('e', VALUE)
+    assert list(store.keys()) == ['a', 'd', 'e']
+    assert store.get_stats()['evictions'] == 2
+    assert store.bytes == SIZE * 3
+
+
+def test_overwriting_a_key_replaces_its_byte_count():
+    store = BoundedMemoryStore(max_bytes=SIZE * 10)
+    store.set('a', VALUE)
+    store.set('a', VALUE)
+    assert store.bytes == SIZE
+
+    bigger = b'x' * 300
+    store.set('a', bigger)
+    assert store.bytes == estimate_size(bigger)
+
+    store.set('a', 'small')
+    assert store.bytes == estimate_size('small')
+    assert len(store) == 1
+
+    store.delete('a')
+    assert store.bytes == 0
+
+
+def test_overwriting_moves_the_key_to_most_recently_used():
+    store = BoundedMemoryStore(max_bytes=SIZE * 2)
+    store.set('a', VALUE)
+    store.set('b', VALUE)
+    store.set('a', VALUE)
+
+    store.set('c', VALUE)
+
+    assert list(store.keys()) == ['a', 'c']
+
+
+def test_values_over_the_budget_are_rejected():
+    store = BoundedMemoryStore(max_bytes=SIZE)
+    store.set('a', VALUE)
+
+    assert not store.set('b', b'x' * 500)
+    assert list(store.keys()) == ['a']
+    assert store.get_stats()['rejected'] == 1
+
+
+def test_entries_expire_after_their_ttl():
+    store = BoundedMemoryStore(max_bytes=SIZE * 10, default_ttl=60)
+    store.set('short', VALUE, ttl=0.05)
+    store.set('long', VALUE)
+    assert 'short' in store
+
+    time.sleep(0.1)
+
+    assert 'short' not in store
+    assert store.get('short', 'gone') == 'gone'
+    assert store.get('long') == VALUE
+    stats = store.get_stats()
+    assert stats['expirations'] == 1
+    assert stats['bytes'] == SIZE
+
+
+def test_expired_entries_are_reclaimed_before_live_ones_are_evicted():
+    store = BoundedMemoryStore(max_bytes=SIZE * 2)
+    store.set('expiring', VALUE, ttl=0.05)
+    store.set('live', VALUE)
+    time.sleep(0.1)
+
+    store.set('new', VALUE)
+
+    assert list(store.keys()) == ['live', 'new']
+    assert store.get_stats()['evictions'] == 0
+    assert store.get_stats()['expirations'] == 1
+
+
+@pytest.mark.asyncio
+async def test_evicted_entries_are_spilled_with_their_remaining_ttl():
+    spilled = []
+
+    async def spill(key, value, ttl_remaining):
+        spilled.append((key, value, ttl_remaining))
+
+    store = BoundedMemoryStore(max_bytes=SIZE, spill=spill)
+    store.set('a', VALUE, ttl=60)
+    store.set('b', VALUE)
+    await asyncio.sleep(0)
+
+    assert [(key, value) for key, value, _ in spilled] == [('a', VALUE)]
+    assert 59 < spilled[0][2] <= 60
+    assert store.get_stats()['spilled'] == 1
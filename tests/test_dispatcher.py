@@ -0,0 +1,178 @@
+"""
+Tests for core.dispatcher
+"""
+
+import asyncio
+import time
+
+import pytest
+import pytest_asyncio
+
+from core.agent_manager import AgentManager, BaseAgent
+from core.dispatcher import TaskDispatcher
+
+
+class StubAgent(BaseAgent):
+    """Agent that records the tasks it runs"""
+
+    def __init__(self, agent_id, name, capabilities=(), fail=False, delay=0.0):
+        super().__init__(agent_id, name, f"{name} for tests")
+        self.capabilities = list(capabilities)
+        self.fail = fail
+        self.delay = delay
+        self.tasks = []
+
+    def get_capabilities(self):
+        return self.capabilities
+
+    async def process_task(self, task_data):
+        self.tasks.append(task_data)
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            return {'success': False, 'error': f'{self.name} failed'}
+        return {'success': True, 'agent': self.name}
+
+
+@pytest_asyncio.fixture
+async def dispatcher():
+    manager = AgentManager()
+    agents = {
+        'job_search_agent': StubAgent('job_search_agent', 'JobSearchAgent', ['job_search']),
+        'web_search': StubAgent('web_search', 'WebSearchAgent', ['web_search']),
+        'math_agent': StubAgent('math_agent', 'MathAgent', ['calculation']),
+        'invoice_agent': StubAgent('invoice_agent', 'InvoiceAgent', ['invoicing'], fail=True),
+        'planning_agent': StubAgent('planning_agent', 'PlanningAgent', ['planning'])
+    }
+    for agent in agents.values():
+        await manager.register_agent(agent)
+
+    dispatcher = TaskDispatcher()
+    dispatcher.set_agent_manager(manager)
+    dispatcher.agents = agents
+    return dispatcher
+
+
+@pytest.mark.asyncio
+async def test_fanout_runs_only_routing_rule_agents(dispatcher):
+    result = await dispatcher.dispatch_task({'task_type': 'market_research', 'content': 'rates for react work'})
+
+    assert result['strategy'] == 'fanout'
+    assert sorted(result['agents_used']) == ['JobSearchAgent', 'WebSearchAgent']
+    assert not dispatcher.agents['math_agent'].tasks
+    assert not dispatcher.agents['planning_agent'].tasks
+
+
+@pytest.mark.asyncio
+async def test_first_success_without_rule_uses_capability_matches(dispatcher):
+    result = await dispatcher.dispatch_task(
+        {'task_type': 'unrouted', 'content': 'sum these', 'required_capabilities': ['calculation']},
+        strategy='first_success'
+    )
+
+    assert result['agents_used'] == ['MathAgent']
+    assert sum(len(agent.tasks) for agent in dispatcher.agents.values()) == 1
+
+
+@pytest.mark.asyncio
+async def test_fanout_width_is_capped(dispatcher):
+    dispatcher.routing_rules['everything'] = list(dispatcher.agents)
+    dispatcher.max_fanout = 2
+
+    result = await dispatcher.dispatch_task({'task_type': 'everything', 'content': 'all hands'}, strategy='fanout')
+
+    assert len(result['agents_used']) == 2
+
+
+@pytest.mark.asyncio
+async def test_dispatch_many_reports_agent_failures(dispatcher):
+    tasks = [
+        {'task_type': 'job_search', 'content': 'react gigs', 'required_capabilities': ['job_search']},
+        {'task_type': 'invoicing', 'content': 'bill the client', 'required_capabilities': ['invoicing']}
+    ]
+
+    results = {result['index']: result async for result in dispatcher.dispatch_many(tasks)}
+
+    assert results[0]['success'] is True
+    assert results[1]['success'] is False
+    assert results[1]['error'] == 'InvoiceAgent failed'
+
+
+@pytest.mark.asyncio
+async def test_fanout_merges_only_results_whose_agents_succeeded(dispatcher):
+    # financial_analysis fans out to the failing InvoiceAgent and MathAgent
+    result = await dispatcher.dispatch_task({'task_type': 'financial_analysis', 'content': 'margins'})
+
+    merged = result['result']
+    assert merged['success'] is True
+    assert merged['result'] == {'MathAgent': {'success': True, 'agent': 'MathAgent'}}
+    assert merged['agent_id'] == 'math_agent'
+    assert sorted(merged['results']) == ['InvoiceAgent', 'MathAgent']
+
+
+@pytest.mark.asyncio
+async def test_fanout_fails_when_every_agent_reports_failure(dispatcher):
+    dispatcher.agents['math_agent'].fail = True
+
+    result = await dispatcher.dispatch_task({'task_type': 'financial_analysis', 'content': 'margins'})
+
+    merged = result['result']
+    assert merged['success'] is False
+    assert merged['result'] == {}
+    assert 'InvoiceAgent: InvoiceAgent failed' in merged['error']
+    assert 'MathAgent: MathAgent failed' in merged['error']
+    assert dispatcher.strategy_metrics['fanout']['failures'] == 1
+
+
+@pytest.mark.asyncio
+async def test_hedge_starts_at_once_when_the_primary_fails_fast(dispatcher):
+    dispatcher.hedge_default_delay = 5.0
+    primary, backup = dispatcher.agents['invoice_agent'], dispatcher.agents['math_agent']
+
+    start = time.perf_counter()
+    result, executions = await dispatcher._dispatch_hedged([primary, backup], {'content': 'totals'})
+
+    assert time.perf_counter() - start < 1.0
+    assert result['agent_id'] == 'math_agent'
+    assert result['result'] == {'success': True, 'agent': 'MathAgent'}
+    assert [agent.name for agent, _ in executions] == ['InvoiceAgent', 'MathAgent']
+    metrics = dispatcher.strategy_metrics['hedged']
+    assert (metrics['hedges_fired'], metrics['hedge_wins']) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_hedge_reports_the_primary_failure_when_the_backup_also_fails(dispatcher):
+    dispatcher.hedge_default_delay = 5.0
+    dispatcher.agents['math_agent'].fail = True
+    primary, backup = dispatcher.agents['invoice_agent'], dispatcher.agents['math_agent']
+
+    result, executions = await dispatcher._dispatch_hedged([primary, backup], {'content': 'totals'})
+
+    assert result['agent_id'] == 'invoice_agent'
+    assert len(executions) == 2
+    assert dispatcher.strategy_metrics['hedged']['hedge_wins'] == 0
+
+
+@pytest.mark.asyncio
+async def test_hedge_is_not_fired_when_the_primary_succeeds_in_time(dispatcher):
+    primary, backup = dispatcher.agents['math_agent'], dispatcher.agents['planning_agent']
+
+    result, executions = await dispatcher._dispatch_hedged([primary, backup], {'content': 'totals'})
+
+    assert result['agent_id'] == 'math_agent'
+    assert not backup.tasks
+    assert dispatcher.strategy_metrics['hedged']['hedges_fired'] == 0
+
+
+@pytest.mark.asyncio
+async def test_hedge_fires_after_the_delay_for_a_slow_primary(dispatcher):
+    dispatcher.hedge_default_delay = 0.05
+    primary, backup = dispatcher.agents['math_agent'], dispatcher.agents['planning_agent']
+    primary.delay = 1.0
+
+    start = time.perf_counter()
+    result, _ = await dispatcher._dispatch_hedged([primary, backup], {'content': 'totals'})
+
+    assert time.perf_counter() - start < 0.5
+    assert result['agent_id'] == 'planning_agent'
+    metrics = dispatcher.strategy_metrics['hedged']
+    assert (metrics['hedges_fired'], metrics['hedge_wins'], metrics['cancelled']) == (1, 1, 1)
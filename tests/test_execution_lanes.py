@@ -0,0 +1,81 @@
+"""
+Tests for core.execution_lanes
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from core.agent_manager import AgentManager, as_managed_agent
+from core.execution_lanes import ExecutionLane, ProcessLane
+
+
+class ExecuteOnlyAgent:
+    """Agent in the core.base_agent style, with execute_task but no process_task"""
+
+    async def execute_task(self, task):
+        return {'success': True, 'echo': task['content']}
+
+
+class SlowAgent:
+    """CPU-bound agent that blocks its worker"""
+
+    async def process_task(self, task):
+        time.sleep(task['seconds'])
+        return {'success': True}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('lane_class', [ExecutionLane, ProcessLane])
+async def test_lanes_run_execute_task_only_agents(lane_class):
+    lane = lane_class() if lane_class is ExecutionLane else lane_class(max_workers=1, preload_modules=())
+    try:
+        result = await lane.run_task(ExecuteOnlyAgent(), {'content': 'hello'})
+    finally:
+        await lane.stop()
+
+    assert result == {'success': True, 'echo': 'hello'}
+    assert lane.get_stats()['completed'] == 1
+
+
+@pytest.mark.asyncio
+async def test_process_lane_reports_workers_orphaned_by_cancelled_tasks():
+    lane = ProcessLane(max_workers=1, preload_modules=())
+    await lane.start()
+    try:
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(lane.run_task(SlowAgent(), {'seconds': 0.5}), 0.1)
+
+        stats = lane.get_stats()
+        assert stats['orphaned'] == 1
+        assert stats['failed'] == 1
+        assert stats['pending'] == 0
+
+        # The worker finishes the abandoned task, then serves new ones
+        assert await lane.run_task(SlowAgent(), {'seconds': 0}) == {'success': True}
+        assert lane.get_stats()['orphaned'] == 0
+    finally:
+        await lane.stop()
+
+
+@pytest.mark.asyncio
+async def test_process_lane_runs_a_managed_math_agent_task():
+    from agents.math_agent import MathAgent
+
+    manager = AgentManager()
+    manager.lanes['cpu'] = ProcessLane(max_workers=1, preload_modules=())
+    await manager.register_agent(as_managed_agent(MathAgent(), 'math_agent'))
+    await manager.lanes['cpu'].start()
+    try:
+        # task_type as the dispatcher sends it
+        result = await manager.execute_task('math_agent', {
+            'task_type': 'statistical_analysis', 'data': [1, 2, 3, 4], 'analysis_type': 'descriptive'
+        })
+    finally:
+        await manager.lanes['cpu'].stop()
+
+    assert result['success']
+    assert result['result']['status'] == 'success'
+    assert result['result']['statistical_analysis']['metrics']['mean'] == 2.5
+    assert manager.lanes['cpu'].get_stats()['completed'] == 1
@@ -0,0 +1,68 @@
+"""
+Tests for core.executive_agent
+"""
+
+import asyncio
+
+import pytest
+
+from core.executive_agent import ExecutiveAgent
+from core.model_governor import ModelCallGovernor
+from core.session_manager import SessionManager
+
+
+class FakeSession:
+    """Session whose turns record how many run at once"""
+
+    def __init__(self, tracker):
+        self.messages = []
+        self.tracker = tracker
+
+    async def run_async(self, message):
+        self.tracker['active'] += 1
+        self.tracker['peak'] = max(self.tracker['peak'], self.tracker['active'])
+        await asyncio.sleep(0.01)
+        self.tracker['active'] -= 1
+        self.messages.append(message)
+        return f"reply to {message}"
+
+
+@pytest.fixture
+def executive(monkeypatch):
+    monkeypatch.setenv('OPENAI_API_KEY', 'test-key')
+    agent = ExecutiveAgent(governor=ModelCallGovernor(initial_limit=8))
+    agent.tracker = {'active': 0, 'peak': 0}
+    agent.sessions = SessionManager(lambda: FakeSession(agent.tracker))
+    return agent
+
+
+@pytest.mark.asyncio
+async def test_concurrent_messages_for_one_user_never_overlap(executive):
+    first = asyncio.create_task(executive.handle_message('one', user_id='alice'))
+    second = asyncio.create_task(executive.handle_message('two', user_id='alice'))
+    # Arrive while the first turn is releasing its lock to the second
+    await asyncio.sleep(0.015)
+    third = asyncio.create_task(executive.handle_message('three', user_id='alice'))
+
+    replies = await asyncio.gather(first, second, third)
+
+    assert replies == ['reply to one', 'reply to two', 'reply to three']
+    assert executive.tracker['peak'] == 1
+    assert len(executive.sessions.get('alice').messages) == 3
+    assert len(executive._session_locks) == 0
+
+
+@pytest.mark.asyncio
+async def test_messages_for_different_users_run_concurrently(executive):
+    await asyncio.gather(*(executive.handle_message('hi', user_id=f'user{i}') for i in range(3)))
+    assert executive.tracker['peak'] == 3
+
+
+@pytest.mark.asyncio
+async def test_ask_answers_repeated_prompts_from_the_cache(executive):
+    first = await executive.ask('What is a good hourly rate for a React developer?')
+    second = await executive.ask('what is a good hourly rate for a react developer')
+
+    assert first == second == 'reply to What is a good hourly rate for a React developer?'
+    assert executive.model_call_metrics['calls'] == 1
+    assert executive.get_cache_stats()['hits'] == 1
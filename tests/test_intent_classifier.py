@@ -0,0 +1,123 @@
+"""
+Tests for core.intent_classifier
+"""
+
+import types
+
+import numpy as np
+import pytest
+
+from agents.executive_agent import ExecutiveAgent
+from core.intent_classifier import IntentClassifier, get_configured_intent_classifier, get_intent_classifier
+
+TRAINING = [
+    ("find me a remote react job", 'job_search'),
+    ("any freelance gigs for python developers", 'job_search'),
+    ("looking for new contract work in design", 'job_search'),
+    ("search job listings for data engineers", 'job_search'),
+    ("write a proposal for this client", 'proposal_writing'),
+    ("draft a cover letter for the application", 'proposal_writing'),
+    ("help me pitch my services in a proposal", 'proposal_writing'),
+    ("improve my bid proposal text", 'proposal_writing'),
+    ("send an invoice to the client for last month", 'invoicing'),
+    ("create an invoice for 20 hours of work", 'invoicing'),
+    ("the client has not paid my invoice yet", 'invoicing'),
+    ("track invoice payments and overdue bills", 'invoicing'),
+]
+
+MESSAGES = ["find a python job", "write a proposal", "invoice the client", "hello there", "", "job proposal invoice"]
+
+
+def config_with(path):
+    settings = {'intent_model_path': path}
+    return types.SimpleNamespace(get_system_setting=lambda key, default=None: settings.get(key, default))
+
+
+@pytest.fixture
+def classifier():
+    texts, labels = zip(*TRAINING)
+    return IntentClassifier.train(texts, labels, n_features=1024, min_confidence=0.5)
+
+
+def test_training_learns_the_labels(classifier):
+    assert classifier.labels == ['invoicing', 'job_search', 'proposal_writing']
+    assert [label for label, _ in classifier.classify(MESSAGES[:3])] == ['job_search', 'proposal_writing',
+                                                                        'invoicing']
+
+
+def test_save_and_load_round_trip(classifier, tmp_path):
+    path = str(tmp_path / 'models' / 'intent.npz')
+    classifier.save(path)
+
+    loaded = IntentClassifier.load(path)
+
+    assert loaded.get_info() == classifier.get_info()
+    np.testing.assert_allclose(loaded.predict_proba(MESSAGES), classifier.predict_proba(MESSAGES))
+    assert loaded.classify(MESSAGES) == classifier.classify(MESSAGES)
+
+
+def test_missing_or_invalid_models_leave_routing_to_keywords(tmp_path):
+    assert get_intent_classifier(str(tmp_path / 'missing.npz')) is None
+
+    invalid = tmp_path / 'invalid.npz'
+    invalid.write_bytes(b'not a model')
+    assert get_intent_classifier(str(invalid)) is None
+
+    with pytest.raises(FileNotFoundError):
+        IntentClassifier.load(str(tmp_path / 'missing.npz'))
+
+
+def test_batch_and_single_classification_agree(classifier):
+    batch = classifier.classify(MESSAGES)
+
+    for message, (label, confidence) in zip(MESSAGES, batch):
+        single_label, single_confidence = classifier.classify_one(message)
+        assert single_label == label
+        assert single_confidence == pytest.approx(confidence, rel=1e-5)
+    assert classifier.classify([]) == []
+
+
+def test_unconfident_and_empty_messages_get_no_label(classifier):
+    classifier.min_confidence = 1.0
+    assert all(label is None for label, _ in classifier.classify(MESSAGES))
+
+    classifier.min_confidence = 0.0
+    assert classifier.classify_one('')[0] is None
+    assert classifier.classify_one('!!!')[0] is None
+
+
+def test_configured_model_path_is_used(classifier, tmp_path):
+    path = str(tmp_path / 'configured.npz')
+    classifier.save(path)
+
+    loaded = get_configured_intent_classifier(config_with(path))
+    assert loaded is not None and loaded.labels == classifier.labels
+
+    agent = ExecutiveAgent(agent_manager=None, memory_manager=None, config=config_with(path))
+    assert agent.intent_classifier is loaded
+
+
+def test_executive_agent_falls_back_to_keywords_below_min_confidence(classifier, tmp_path):
+    path = str(tmp_path / 'strict.npz')
+    IntentClassifier(classifier.labels, classifier.weights, classifier.bias, classifier.n_features,
+                     min_confidence=1.0).save(path)
+    agent = ExecutiveAgent(agent_manager=None, memory_manager=None, config=config_with(path))
+    content = 'plan the project timeline and schedule'
+
+    task_type, confidence = agent._detect_task_type(agent.keyword_matcher.scan(content), content)
+
+    assert (task_type, confidence) == agent._detect_task_type_by_keywords(agent.keyword_matcher.scan(content))
+    assert task_type == 'project_planning'
+    assert agent.classify_batch([content]) == [(task_type, confidence)]
+
+
+def test_executive_agent_uses_confident_predictions(classifier, tmp_path):
+    path = str(tmp_path / 'confident.npz')
+    classifier.save(path)
+    agent = ExecutiveAgent(agent_manager=None, memory_manager=None, config=config_with(path))
+    contents = ['find me a remote react job', 'plan the project timeline and schedule']
+
+    single = [agent._detect_task_type(agent.keyword_matcher.scan(content), content) for content in contents]
+
+    assert single[0][0] == 'job_search'
+    assert [label for label, _ in agent.classify_batch(contents)] == [label for label, _ in single]
@@ -0,0 +1,137 @@
+"""
+Tests for core.keyword_matcher and the ExecutiveAgent analysis built on it
+"""
+
+import random
+import re
+
+import pytest
+
+from agents.executive_agent import ExecutiveAgent, SIGNAL_KEYWORDS
+from core.keyword_matcher import KeywordMatcher
+
+CORPUS = [
+    "I need a job as a freelance react developer, urgent!",
+    "Write a proposal and cover letter for this bid, then check the quote",
+    "Plan the project timeline with milestones before the deadline",
+    "What time works for a call? The timeline is flexible",
+    "I know the separate context of this project is important",
+    "Research the market rates and pricing, also draft an invoice",
+    "First find clients, next write the pitch, finally review it. Step 1 is research",
+    "ASAP: financial analysis of my money, it's critical and essential",
+    "Emergency! Immediately schedule the work; priority is high",
+    "Planning and scheduling a gig; the applications were quick and fast",
+    "Nothing relevant here at all",
+    "",
+    "JOB, Proposal; DEADLINE... now-now (urgent)",
+    "jobless unworkable rewrite prepaid overdraft",
+    "step-by-step phases: first, second, and then after that",
+]
+
+
+def legacy_contains(keyword, content):
+    """The old per-method substring check, restricted to word starts as KeywordMatcher documents"""
+    return re.search(r'(?<!\w)' + re.escape(keyword), content) is not None
+
+
+def legacy_task_type(agent, content):
+    best_match, best_confidence = 'general', 0.0
+    for task_type, pattern in agent.task_patterns.items():
+        keywords = pattern['keywords']
+        matches = sum(1 for keyword in keywords if legacy_contains(keyword, content))
+        if matches > 0 and matches / len(keywords) > best_confidence:
+            best_match, best_confidence = task_type, matches / len(keywords)
+    return best_match, best_confidence
+
+
+def legacy_priority(agent, content, task_type):
+    priority = agent.task_patterns.get(task_type, {}).get('priority', 5)
+    if any(legacy_contains(word, content) for word in ['urgent', 'asap', 'immediately', 'now', 'quick', 'fast']):
+        priority += 2
+    if any(legacy_contains(word, content) for word in ['important', 'critical', 'essential', 'must', 'need']):
+        priority += 1
+    return min(priority, 10)
+
+
+def legacy_urgency(content):
+    if any(legacy_contains(word, content) for word in ['urgent', 'asap', 'immediately', 'now', 'emergency']):
+        return 'urgent'
+    if any(legacy_contains(word, content) for word in ['important', 'critical', 'priority', 'deadline']):
+        return 'high'
+    return 'normal'
+
+
+def legacy_capabilities(agent, content, task_type):
+    capabilities = list(agent.task_patterns.get(task_type, {}).get('capabilities', []))
+    if legacy_contains('research', content) or legacy_contains('analysis', content):
+        capabilities.append('research')
+    if legacy_contains('writing', content) or legacy_contains('content', content):
+        capabilities.append('content_creation')
+    if legacy_contains('money', content) or legacy_contains('financial', content):
+        capabilities.append('financial_analysis')
+    return set(capabilities)
+
+
+def random_corpus(agent, count=200, seed=7):
+    rng = random.Random(seed)
+    keywords = [kw for kws in SIGNAL_KEYWORDS.values() for kw in kws]
+    keywords += [kw for pattern in agent.task_patterns.values() for kw in pattern['keywords']]
+    filler = "the client know separate context overtime a un re pre - , . ! ? planning".split()
+    words = keywords + filler
+    return [' '.join(rng.choice(words) for _ in range(rng.randint(1, 30))) for _ in range(count)]
+
+
+@pytest.fixture(scope='module')
+def agent():
+    return ExecutiveAgent(agent_manager=None, memory_manager=None, config=None)
+
+
+def test_scan_matches_a_per_keyword_scan_for_every_group(agent):
+    matcher = agent.keyword_matcher
+    for text in CORPUS + random_corpus(agent):
+        lowered = text.lower()
+        expected = {}
+        for group, keywords in matcher.groups.items():
+            found = {keyword for keyword in keywords if legacy_contains(keyword, lowered)}
+            if found:
+                expected[group] = found
+        assert matcher.scan(text) == expected, text
+
+
+def test_analysis_matches_the_old_per_method_scans(agent):
+    for text in CORPUS + random_corpus(agent):
+        content = text.lower()
+        hits = agent.keyword_matcher.scan(text)
+        task_type, confidence = agent._detect_task_type_by_keywords(hits)
+
+        assert (task_type, confidence) == legacy_task_type(agent, content), text
+        assert agent._determine_priority(hits, task_type) == legacy_priority(agent, content, task_type), text
+        assert agent._analyze_urgency(hits) == legacy_urgency(content), text
+        assert set(agent._extract_required_capabilities(hits, task_type)) == \
+            legacy_capabilities(agent, content, task_type), text
+
+
+def test_keywords_match_only_at_word_starts():
+    matcher = KeywordMatcher({'urgent': ['now'], 'rates': ['rate'], 'content': ['text']})
+
+    assert matcher.scan('I know the separate context') == {}
+    assert matcher.scan('now, rates and text') == {'urgent': {'now'}, 'rates': {'rate'}, 'content': {'text'}}
+    assert matcher.scan('(now)') == {'urgent': {'now'}}
+    assert matcher.scan('snow-now') == {'urgent': {'now'}}
+
+
+def test_a_longer_keyword_also_reports_its_prefixes():
+    matcher = KeywordMatcher({'time': ['time'], 'planning': ['timeline', 'plan'], 'steps': ['step', 'step 1']})
+
+    assert matcher.scan('the timeline') == {'time': {'time'}, 'planning': {'timeline'}}
+    assert matcher.scan('what time?') == {'time': {'time'}}
+    assert matcher.scan('step 1, then planning') == {'steps': {'step', 'step 1'}, 'planning': {'plan'}}
+    assert matcher.matches('Timelines') == {'time', 'timeline'}
+
+
+def test_matching_is_case_insensitive_and_handles_empty_input():
+    matcher = KeywordMatcher({'proposal': ['Cover Letter', 'bid']})
+
+    assert matcher.scan('A COVER LETTER and a Bid') == {'proposal': {'cover letter', 'bid'}}
+    assert matcher.scan('') == {}
+    assert KeywordMatcher({}).scan('anything') == {}
@@ -0,0 +1,119 @@
+"""
+Tests for core.model_governor
+"""
+
+import asyncio
+
+import pytest
+
+from core.model_governor import ModelCallGovernor
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+    def __init__(self, retry_after=None):
+        super().__init__("rate limited")
+        self.retry_after = retry_after
+
+
+@pytest.mark.asyncio
+async def test_interactive_calls_are_admitted_before_background():
+    governor = ModelCallGovernor(initial_limit=1, max_limit=1)
+    running = await governor.acquire()
+    order = []
+
+    async def call(priority, name):
+        ticket = await governor.acquire(priority)
+        order.append(name)
+        governor.release(ticket)
+
+    waiters = [asyncio.create_task(call('background', f'background{i}')) for i in range(3)]
+    await asyncio.sleep(0)
+    waiters.append(asyncio.create_task(call('interactive', 'interactive')))
+    await asyncio.sleep(0)
+
+    governor.release(running)
+    await asyncio.gather(*waiters)
+
+    assert order == ['interactive', 'background0', 'background1', 'background2']
+
+
+@pytest.mark.asyncio
+async def test_limit_grows_additively_while_fully_used():
+    governor = ModelCallGovernor(initial_limit=2, max_limit=10)
+    for _ in range(10):
+        await asyncio.gather(*(governor.run(lambda: asyncio.sleep(0.005)) for _ in range(2)))
+
+    assert 2 < governor.limit <= 4
+    assert governor.metrics['limit_increases'] > 0
+
+
+@pytest.mark.asyncio
+async def test_unused_limit_does_not_grow():
+    governor = ModelCallGovernor(initial_limit=4, max_limit=10)
+    for _ in range(20):
+        await governor.run(lambda: asyncio.sleep(0.005))
+
+    assert governor.limit == 4
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_halves_the_limit_once_and_pauses_admissions():
+    governor = ModelCallGovernor(initial_limit=8)
+    tickets = [await governor.acquire() for _ in range(3)]
+
+    # A burst of 429s from calls already in flight counts as one decrease
+    for ticket in tickets:
+        governor.release(ticket, error=RateLimitError(retry_after=0.05))
+
+    assert governor.limit == 4
+    assert governor.metrics['rate_limited'] == 3
+    assert governor.get_stats()['paused_for'] > 0
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    governor.release(await governor.acquire())
+    assert loop.time() - start >= 0.04
+
+
+@pytest.mark.asyncio
+async def test_latency_above_tolerance_shrinks_the_limit():
+    governor = ModelCallGovernor(initial_limit=8, latency_tolerance=2.0)
+    governor.release(await governor.acquire())
+    governor.baseline_latency = 0.001
+
+    ticket = await governor.acquire()
+    await asyncio.sleep(0.02)
+    governor.release(ticket)
+
+    assert governor.limit < 8
+    assert governor.metrics['limit_decreases'] == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_calls_do_not_count_as_failures():
+    governor = ModelCallGovernor(initial_limit=2)
+    governor.release(await governor.acquire(), error=asyncio.CancelledError())
+
+    assert governor.metrics['failed'] == 0
+    assert governor.limit == 2
+    assert governor.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_token_budget_delays_calls_past_it():
+    governor = ModelCallGovernor(tokens_per_minute=6000)
+    await governor.acquire(tokens=6000)
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    await governor.acquire(tokens=50)
+    # 50 tokens refill in half a second at 100 tokens/s
+    assert loop.time() - start >= 0.4
+
+
+def test_unknown_priority_is_rejected():
+    governor = ModelCallGovernor()
+    with pytest.raises(ValueError):
+        asyncio.run(governor.acquire('urgent'))
@@ -0,0 +1,139 @@
+"""
+Tests for core.result_cache
+"""
+
+import asyncio
+
+import pytest
+
+from core.agent_manager import AgentManager, BaseAgent
+from core.result_cache import VOLATILE_TASK_FIELDS, TaskResultCache, task_cache_key
+
+
+class CountingAgent(BaseAgent):
+    """Cacheable agent that counts its executions"""
+
+    cache_ttls = {'lookup': 60.0}
+
+    def __init__(self, delay=0.05):
+        super().__init__('counting_agent', 'CountingAgent', 'Counts executions')
+        self.delay = delay
+        self.calls = 0
+
+    def get_capabilities(self):
+        return []
+
+    async def process_task(self, task_data):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return {'success': True, 'answer': task_data['content'].upper()}
+
+
+def runner_counting(calls, result=None, delay=0.05):
+    async def run():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        return result or {'success': True, 'value': len(calls)}
+    return run
+
+
+def always(result):
+    return True
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_tasks_share_one_execution():
+    cache = TaskResultCache()
+    calls = []
+
+    results = await asyncio.gather(*(cache.get_or_run('key', 60, runner_counting(calls), always)
+                                     for _ in range(5)))
+
+    assert len(calls) == 1
+    assert all(result['value'] == 1 for result in results)
+    assert sum(1 for result in results if result.get('coalesced')) == 4
+    assert cache.get_stats()['coalesced'] == 4
+    assert cache.get_stats()['in_flight'] == 0
+
+    # Later callers are served from the cache
+    assert (await cache.get_or_run('key', 60, runner_counting(calls), always))['cached']
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_uncacheable_results_are_shared_but_not_stored():
+    cache = TaskResultCache()
+    calls = []
+    failure = {'success': False, 'error': 'boom'}
+
+    results = await asyncio.gather(*(cache.get_or_run('key', 60, runner_counting(calls, failure),
+                                                      lambda result: result['success'])
+                                     for _ in range(3)))
+
+    assert len(calls) == 1
+    assert all(result['error'] == 'boom' for result in results)
+    assert cache.get('key') is None
+
+
+@pytest.mark.asyncio
+async def test_entries_expire_after_their_ttl():
+    cache = TaskResultCache()
+    calls = []
+
+    await cache.get_or_run('key', 0.05, runner_counting(calls, delay=0), always)
+    assert cache.get('key') is not None
+
+    await asyncio.sleep(0.1)
+
+    assert cache.get('key') is None
+    assert cache.get_stats()['expirations'] == 1
+    result = await cache.get_or_run('key', 0.05, runner_counting(calls, delay=0), always)
+    assert 'cached' not in result
+    assert len(calls) == 2
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = TaskResultCache(max_entries=2)
+    cache.put('a', {'success': True}, 60)
+    cache.put('b', {'success': True}, 60)
+    cache.get('a')
+    cache.put('c', {'success': True}, 60)
+
+    assert list(cache.entries) == ['a', 'c']
+    assert cache.get_stats()['evictions'] == 1
+
+
+def test_cache_key_ignores_volatile_fields_and_key_order():
+    task = {'content': 'rates', 'task_type': 'lookup'}
+    volatile = {'timestamp': '2026-01-01T00:00:00', 'timeout': 5, 'priority': 9,
+                'request_id': 'r-1', 'deadline': 123.0}
+    assert set(volatile) == VOLATILE_TASK_FIELDS
+
+    key = task_cache_key('agent', task)
+    assert task_cache_key('agent', {**volatile, 'task_type': 'lookup', 'content': 'rates'}) == key
+    for field, value in volatile.items():
+        assert task_cache_key('agent', {**task, field: value}) == key
+
+    assert task_cache_key('agent', {**task, 'content': 'fees'}) != key
+    assert task_cache_key('other_agent', task) != key
+
+
+@pytest.mark.asyncio
+async def test_manager_coalesces_tasks_differing_only_in_volatile_fields():
+    manager = AgentManager()
+    agent = CountingAgent()
+    await manager.register_agent(agent)
+
+    results = await asyncio.gather(*(
+        manager.execute_task('counting_agent', {'content': 'rates', 'task_type': 'lookup',
+                                                'request_id': f'r-{index}', 'priority': index + 1})
+        for index in range(4)
+    ))
+
+    assert agent.calls == 1
+    assert all(result['success'] and result['result']['answer'] == 'RATES' for result in results)
+
+    # Other task types are not cached
+    await manager.execute_task('counting_agent', {'content': 'rates', 'task_type': 'search'})
+    await manager.execute_task('counting_agent', {'content': 'rates', 'task_type': 'search'})
+    assert agent.calls == 3
@@ -0,0 +1,172 @@
+"""
+Tests for core.session_manager
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import List
+
+import pytest
+
+from core.session_manager import SUMMARY_PREFIX, SessionLocks, SessionManager, message_tokens
+
+
+@dataclass
+class Message:
+    role: str
+    content: str
+
+
+@dataclass
+class Session:
+    messages: List[Message] = field(default_factory=list)
+
+
+def turn(index):
+    # 15 tokens each with the per-message overhead
+    return Message('user' if index % 2 == 0 else 'assistant', f'turn {index} '.ljust(40, '.'))
+
+
+@pytest.mark.asyncio
+async def test_session_locks_serialize_callers_on_one_key():
+    locks = SessionLocks()
+    active = 0
+    peak = 0
+
+    async def turn():
+        nonlocal active, peak
+        async with locks.hold('user'):
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+    # The third caller arrives just as the first releases and wakes the second
+    first = asyncio.create_task(turn())
+    second = asyncio.create_task(turn())
+    await asyncio.sleep(0.015)
+    third = asyncio.create_task(turn())
+    await asyncio.gather(first, second, third)
+
+    assert peak == 1
+    assert 'user' not in locks
+
+
+@pytest.mark.asyncio
+async def test_session_locks_drop_cancelled_waiters():
+    locks = SessionLocks()
+    await locks.acquire('user')
+    waiter = asyncio.create_task(locks.acquire('user'))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    locks.release('user')
+    assert len(locks) == 0
+
+
+def test_trim_keeps_instructions_and_summarizes_dropped_turns():
+    manager = SessionManager(Session, token_budget=100, keep_recent=2)
+    instructions = Message('system', 'You are a freelancing assistant')
+    session = Session([instructions] + [turn(index) for index in range(8)])
+
+    dropped = manager.trim(session)
+
+    assert session.messages[0] == instructions
+    summary = session.messages[1]
+    assert summary.role == 'system' and summary.content.startswith(SUMMARY_PREFIX)
+    assert 'user: turn 0' in summary.content
+    assert session.messages[2:] == [turn(index) for index in range(dropped, 8)]
+    assert sum(message_tokens(message) for message in session.messages) - message_tokens(summary) <= 100
+    assert manager.get_stats()['trimmed_messages'] == dropped
+    assert manager.get_stats()['summaries'] == 1
+
+
+def test_trim_never_drops_the_most_recent_turns():
+    manager = SessionManager(Session, token_budget=10, keep_recent=3, summarize=False)
+    session = Session([turn(index) for index in range(6)])
+
+    assert manager.trim(session) == 3
+    assert session.messages == [turn(3), turn(4), turn(5)]
+
+
+def test_trim_folds_an_earlier_summary_into_the_new_one():
+    manager = SessionManager(Session, token_budget=100, keep_recent=2)
+    session = Session([turn(index) for index in range(8)])
+    manager.trim(session)
+    session.messages.extend(turn(index) for index in range(8, 12))
+
+    manager.trim(session)
+
+    summaries = [message for message in session.messages if message.content.startswith(SUMMARY_PREFIX)]
+    assert len(summaries) == 1 and session.messages[0] is summaries[0]
+    assert session.messages[-2:] == [turn(10), turn(11)]
+
+
+def test_sessions_within_budget_are_untouched():
+    manager = SessionManager(Session, token_budget=1000)
+    session = Session([turn(index) for index in range(4)])
+
+    assert manager.trim(session) == 0
+    assert session.messages == [turn(index) for index in range(4)]
+
+
+@pytest.mark.asyncio
+async def test_evicted_sessions_are_persisted():
+    persisted = []
+
+    async def persist(user_id, session):
+        await asyncio.sleep(0.01)
+        persisted.append((user_id, session))
+
+    manager = SessionManager(Session, max_sessions=2, persist=persist)
+    sessions = {user_id: manager.get_or_create(user_id) for user_id in ('a', 'b')}
+    manager.get_or_create('a')
+    sessions['c'] = manager.get_or_create('c')
+    manager.close('c')
+
+    await manager.flush()
+
+    assert persisted == [('b', sessions['b']), ('c', sessions['c'])]
+    assert 'b' not in manager and 'c' not in manager and 'a' in manager
+    stats = manager.get_stats()
+    assert stats['evicted_lru'] == 1
+    assert stats['persisted'] == 2
+
+
+@pytest.mark.asyncio
+async def test_idle_sessions_are_evicted_and_persisted():
+    persisted = []
+
+    async def persist(user_id, session):
+        persisted.append(user_id)
+
+    manager = SessionManager(Session, idle_timeout=0.05, persist=persist)
+    manager.get_or_create('idle')
+    await asyncio.sleep(0.1)
+    manager.get_or_create('active')
+
+    await manager.flush()
+
+    assert persisted == ['idle']
+    assert 'idle' not in manager
+    assert manager.get_stats()['evicted_idle'] == 1
+
+
+@pytest.mark.asyncio
+async def test_pending_persists_are_kept_until_they_finish():
+    release = asyncio.Event()
+
+    async def persist(user_id, session):
+        await release.wait()
+
+    manager = SessionManager(Session, persist=persist)
+    manager.get_or_create('user')
+    manager.close('user')
+
+    assert len(manager._pending_persists) == 1
+    release.set()
+    await manager.flush()
+    assert not manager._pending_persists
+    assert manager.get_stats()['persisted'] == 1
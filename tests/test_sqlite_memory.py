@@ -0,0 +1,86 @@
+"""
+Tests for memory.sqlite_memory
+"""
+
+import json
+
+import aiosqlite
+import pytest
+
+import memory.sqlite_memory as sqlite_memory
+from memory.sqlite_memory import MemoryManager
+
+
+async def _seed_legacy_database(db_path):
+    """Database with version 1 task analysis dumps and user_version still at 0"""
+    manager = MemoryManager(str(db_path))
+    await manager.initialize()
+    await manager.log_interaction('alice', 'text', 'earlier message', timestamp='2024-01-01T00:00:00')
+    for index in range(3):
+        dump = {
+            'content': f'write proposal {index}',
+            'task_type': 'proposal_writing',
+            'confidence': 0.9,
+            'user_context': {'recent_interactions': [{'timestamp': '2024-01-01T00:00:00'}]}
+        }
+        await manager.log_interaction('alice', 'task_analysis', json.dumps(dump),
+                                      timestamp=f'2024-01-02T00:00:0{index}')
+    await manager.connection.execute("PRAGMA user_version = 0")
+    await manager.connection.commit()
+    await manager.close()
+
+
+async def _read_state(db_path):
+    async with aiosqlite.connect(db_path) as connection:
+        async with connection.execute("PRAGMA user_version") as cursor:
+            version = (await cursor.fetchone())[0]
+        async with connection.execute(
+            "SELECT content, metadata FROM interactions WHERE input_type = 'task_analysis' ORDER BY id"
+        ) as cursor:
+            rows = await cursor.fetchall()
+    return version, rows
+
+
+@pytest.mark.asyncio
+async def test_failed_compaction_keeps_schema_version_and_retries(tmp_path, monkeypatch):
+    db_path = tmp_path / 'memory.db'
+    await _seed_legacy_database(db_path)
+
+    # Fail partway through, after the first batch has already been rewritten
+    original_compact = sqlite_memory.compact_task_analysis
+    calls = 0
+
+    def failing_compact(analysis, context_ids):
+        nonlocal calls
+        calls += 1
+        if calls == 2:
+            raise RuntimeError('disk full')
+        return original_compact(analysis, context_ids)
+
+    original_rows = MemoryManager.compact_task_analysis_rows
+
+    async def one_row_batches(self, batch_size=500, commit=True):
+        return await original_rows(self, batch_size=1, commit=commit)
+
+    monkeypatch.setattr(sqlite_memory, 'compact_task_analysis', failing_compact)
+    monkeypatch.setattr(MemoryManager, 'compact_task_analysis_rows', one_row_batches)
+
+    manager = MemoryManager(str(db_path))
+    await manager.initialize()
+    await manager.close()
+
+    version, rows = await _read_state(db_path)
+    assert version == 0
+    assert all(metadata is None for _, metadata in rows)
+
+    monkeypatch.setattr(sqlite_memory, 'compact_task_analysis', original_compact)
+
+    manager = MemoryManager(str(db_path))
+    await manager.initialize()
+    await manager.close()
+
+    version, rows = await _read_state(db_path)
+    assert version == sqlite_memory.DB_SCHEMA_VERSION
+    assert [content for content, _ in rows] == [f'write proposal {index}' for index in range(3)]
+    records = [json.loads(metadata) for _, metadata in rows]
+    assert all(record['context_interaction_ids'] == [1] for record in records)
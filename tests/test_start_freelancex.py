@@ -0,0 +1,48 @@
+"""
+Tests for start_freelancex agent startup
+"""
+
+import functools
+import types
+
+import pytest
+
+import start_freelancex
+from core.agent_manager import ManagedAgent
+from memory.sqlite_memory import MemoryManager
+
+
+@pytest.mark.asyncio
+async def test_agents_start_eagerly_and_on_first_dispatch(tmp_path, monkeypatch):
+    monkeypatch.setenv('OPENAI_API_KEY', 'test-key')
+    monkeypatch.setattr(start_freelancex, 'MemoryManager',
+                        functools.partial(MemoryManager, str(tmp_path / 'memory.db')))
+    config = types.SimpleNamespace(agents=types.SimpleNamespace(eager_agents=['proposal_writer', 'job_search']))
+    orchestrator = start_freelancex.FreelanceXOrchestrator(config)
+
+    try:
+        await orchestrator.initialize_agents()
+        manager = orchestrator.agent_manager
+
+        assert sorted(manager.agents) == ['job_search_agent', 'proposal_writer_agent']
+        assert sorted(manager.lazy_agents) == ['math_agent', 'web_search']
+        assert isinstance(manager.agents['proposal_writer_agent'], ManagedAgent)
+
+        result = await manager.execute_task('proposal_writer_agent', {
+            'content': 'write a proposal for a react job', 'task_type': 'proposal_writing'
+        })
+        assert result['success'] and result['result']['agent'] == 'ProposalWriterAgent'
+
+        # Deferred agents are built and registered under their declared ID on first use
+        math_agent = await manager.get_agent('math_agent')
+        assert math_agent.agent_id == 'math_agent'
+        assert 'statistical_analysis' in math_agent.cpu_bound_task_types
+
+        result = await manager.execute_task('math_agent', {'type': 'basic_calculation', 'expression': '2+3'})
+        assert result['success']
+        assert result['result']['calculation']['result'] == 5
+        assert manager.agents['math_agent'].task_count == 1
+    finally:
+        if orchestrator.agent_manager is not None:
+            await orchestrator.agent_manager.stop()
+        await orchestrator.memory_manager.close()
@@ -0,0 +1,223 @@
+"""
+Tests for core.workflow and ExecutiveAgent task breakdown
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from agents.executive_agent import ExecutiveAgent
+from core.workflow import WorkflowExecutor, WorkflowStep, critical_path_time, order_steps
+
+
+class StubDispatcher:
+    """Dispatcher whose steps take a set delay and can fail a number of times first"""
+
+    def __init__(self, delays=None, failures=None, agent_failures=()):
+        self.delays = delays or {}
+        self.failures = dict(failures or {})
+        self.agent_failures = set(agent_failures)
+        self.calls = []
+        self.spans = {}
+
+    async def dispatch_task(self, task):
+        step_id = task['step_id']
+        self.calls.append(task)
+        started = time.perf_counter()
+        await asyncio.sleep(self.delays.get(step_id, 0.01))
+        self.spans[step_id] = (started, time.perf_counter())
+
+        if self.failures.get(step_id, 0) > 0:
+            self.failures[step_id] -= 1
+            return {'success': False, 'error': f'{step_id} failed'}
+        if step_id in self.agent_failures:
+            return {'success': True, 'result': {'success': False, 'error': f'{step_id} agent error'}}
+        return {'success': True, 'result': {'step': step_id, 'inputs': sorted(task['inputs'])}}
+
+
+def step(step_id, *depends_on, **kwargs):
+    return WorkflowStep(step_id=step_id, task_type='general', description=step_id,
+                        depends_on=list(depends_on), **kwargs)
+
+
+def executor(dispatcher, **kwargs):
+    return WorkflowExecutor(dispatcher, retry_backoff=0, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_steps_start_after_their_dependencies_with_their_results():
+    dispatcher = StubDispatcher()
+    steps = [step('review', 'write'), step('write', 'research', 'rates'), step('research', 'plan'),
+             step('rates', 'plan'), step('plan')]
+
+    final = await executor(dispatcher).execute(steps, {'content': 'job', 'user_id': 'u1'})
+
+    assert final['success']
+    spans = dispatcher.spans
+    assert spans['plan'][1] <= min(spans['research'][0], spans['rates'][0])
+    assert max(spans['research'][1], spans['rates'][1]) <= spans['write'][0]
+    assert spans['write'][1] <= spans['review'][0]
+
+    write_task = next(task for task in dispatcher.calls if task['step_id'] == 'write')
+    assert sorted(write_task['inputs']) == ['rates', 'research']
+    assert write_task['inputs']['research']['result']['step'] == 'research'
+    assert write_task['content'] == 'job' and write_task['user_id'] == 'u1'
+
+
+@pytest.mark.asyncio
+async def test_independent_branches_take_the_longest_branch_not_the_sum():
+    # Branch a -> b takes 0.1s, branch c takes 0.2s; run one after another they'd take 0.3s
+    dispatcher = StubDispatcher(delays={'a': 0.05, 'b': 0.05, 'c': 0.2, 'join': 0.01})
+    steps = [step('a'), step('b', 'a'), step('c'), step('join', 'b', 'c')]
+
+    start = time.perf_counter()
+    final = await executor(dispatcher).execute(steps, {})
+    elapsed = time.perf_counter() - start
+
+    assert final['success']
+    assert 0.2 <= elapsed < 0.3
+    assert dispatcher.spans['c'][0] < dispatcher.spans['a'][1]
+
+
+@pytest.mark.asyncio
+async def test_max_concurrency_limits_running_steps():
+    dispatcher = StubDispatcher(delays={name: 0.05 for name in 'abcd'})
+
+    start = time.perf_counter()
+    await executor(dispatcher, max_concurrency=2).execute([step(name) for name in 'abcd'], {})
+
+    assert time.perf_counter() - start >= 0.1
+
+
+@pytest.mark.asyncio
+async def test_failed_steps_are_retried():
+    dispatcher = StubDispatcher(failures={'flaky': 1})
+
+    final = await executor(dispatcher).execute([step('flaky')], {})
+
+    assert final['success']
+    assert final['results']['flaky']['attempts'] == 2
+    assert len(dispatcher.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_steps_fail_after_exhausting_their_retries():
+    dispatcher = StubDispatcher(failures={'broken': 5}, agent_failures={'nested'})
+
+    final = await executor(dispatcher).execute([step('broken', retries=2), step('nested', retries=0)], {})
+
+    assert not final['success']
+    assert final['results']['broken'] == {'success': False, 'error': 'broken failed', 'attempts': 3}
+    # A dispatch that succeeded but whose agent reported failure counts as failed
+    assert final['results']['nested']['error'] == 'nested agent error'
+    assert final['failed_steps'] == ['broken', 'nested']
+
+
+@pytest.mark.asyncio
+async def test_steps_that_run_past_their_timeout_fail():
+    dispatcher = StubDispatcher(delays={'slow': 10})
+
+    start = time.perf_counter()
+    final = await executor(dispatcher).execute([step('slow', timeout=0.05, retries=1)], {})
+
+    assert time.perf_counter() - start < 0.5
+    assert final['results']['slow'] == {'success': False, 'error': 'timed out after 0.05s', 'attempts': 2}
+    assert dispatcher.calls[0]['timeout'] == 0.05
+
+
+@pytest.mark.asyncio
+async def test_steps_downstream_of_a_failure_are_skipped_while_other_branches_run():
+    dispatcher = StubDispatcher(failures={'research': 5})
+    steps = [step('research', retries=0), step('write', 'research'), step('review', 'write'), step('rates')]
+
+    events = [event async for event in executor(dispatcher).run(steps, {})]
+
+    by_step = {event.get('step_id'): event['event'] for event in events if 'step_id' in event}
+    assert by_step == {'research': 'step_failed', 'write': 'step_skipped', 'review': 'step_skipped',
+                       'rates': 'step_completed'}
+    skipped = next(event for event in events if event.get('step_id') == 'review')
+    assert skipped['blocked_by'] == ['write']
+
+    final = events[-1]
+    assert final['event'] == 'workflow_completed' and not final['success']
+    assert final['failed_steps'] == ['research', 'review', 'write']
+    assert [task['step_id'] for task in dispatcher.calls] == ['research', 'rates']
+
+
+@pytest.mark.asyncio
+async def test_closing_the_event_stream_cancels_running_steps():
+    dispatcher = StubDispatcher(delays={'fast': 0.01, 'slow': 10})
+    events = executor(dispatcher).run([step('fast'), step('slow')], {})
+
+    assert (await events.__anext__())['step_id'] == 'fast'
+    await events.aclose()
+    await asyncio.sleep(0)
+
+    assert 'slow' not in dispatcher.spans
+
+
+@pytest.mark.asyncio
+async def test_handlers_run_their_step_types_instead_of_dispatching():
+    dispatcher = StubDispatcher()
+
+    async def review(step, inputs):
+        return {'success': True, 'reviewed': sorted(inputs)}
+
+    review_step = WorkflowStep('review', 'review', 'Review', depends_on=['write'])
+    final = await WorkflowExecutor(dispatcher, handlers={'review': review}).execute([step('write'), review_step], {})
+
+    assert final['results']['review']['result'] == {'success': True, 'reviewed': ['write']}
+    assert [task['step_id'] for task in dispatcher.calls] == ['write']
+
+
+def test_order_steps_sorts_dependencies_first():
+    ordered = order_steps([step('c', 'b'), step('b', 'a'), step('a'), step('d')])
+
+    assert [item.step_id for item in ordered] == ['a', 'd', 'b', 'c']
+
+
+@pytest.mark.parametrize('steps, message', [
+    ([step('a', 'b'), step('b', 'c'), step('c', 'a'), step('d')], 'Dependency cycle'),
+    ([step('a', 'a')], 'Dependency cycle'),
+    ([step('a', 'missing')], 'unknown steps'),
+    ([step('a'), step('a')], 'Duplicate step ids'),
+])
+def test_order_steps_rejects_invalid_graphs(steps, message):
+    with pytest.raises(ValueError, match=message):
+        order_steps(steps)
+
+
+def test_critical_path_time_counts_concurrent_steps_once():
+    steps = [step('plan', estimated_time=5), step('research', 'plan', estimated_time=10),
+             step('rates', 'plan', estimated_time=5), step('write', 'research', 'rates', estimated_time=15)]
+
+    assert critical_path_time(steps) == 30
+
+
+@pytest.mark.asyncio
+async def test_break_down_task_builds_the_dependency_graph():
+    agent = ExecutiveAgent(agent_manager=None, memory_manager=None, config=None)
+    analysis = {'task_type': 'proposal_writing', 'priority': 7,
+                'content': 'First research the client and the rates, then write a proposal and review it'}
+
+    steps = {item.step_id: item for item in await agent._break_down_task(analysis)}
+
+    assert {step_id: sorted(item.depends_on) for step_id, item in steps.items()} == {
+        'planning': [],
+        'research': ['planning'],
+        'rates': ['planning'],
+        'writing': ['rates', 'research'],
+        'review': ['planning', 'rates', 'research', 'writing']
+    }
+    assert all(item.priority == 7 for item in steps.values())
+    assert agent._estimate_duration(list(steps.values())) == 5 + 10 + 15 + 3
+
+
+@pytest.mark.asyncio
+async def test_break_down_task_defaults_to_one_step():
+    agent = ExecutiveAgent(agent_manager=None, memory_manager=None, config=None)
+
+    steps = await agent._break_down_task({'task_type': 'invoicing', 'content': 'send an invoice'})
+
+    assert [(item.step_id, item.task_type, item.depends_on) for item in steps] == [('execute', 'invoicing', [])]
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Train the FreelanceX.AI intent classifier
+Fits the hashed bag-of-words model on logged task_analysis interactions and writes the .npz artifact
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent
+sys.path.append(str(project_root))
+
+from core.intent_classifier import IntentClassifier, DEFAULT_MODEL_PATH
+from memory.sqlite_memory import MemoryManager
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+async def train(args) -> int:
+    """Train on the memory database and save the model; returns an exit code"""
+    memory_manager = MemoryManager(args.db)
+    await memory_manager.initialize()
+    try:
+        samples = await memory_manager.get_task_analysis_samples(limit=args.limit)
+    finally:
+        await memory_manager.close()
+
+    if len(samples) < args.min_samples:
+        logger.error(f"❌ Only {len(samples)} labelled task analyses found, need at least {args.min_samples}")
+        return 1
+
+    random.Random(0).shuffle(samples)
+    holdout_size = max(1, len(samples) // 10)
+    holdout, training = samples[:holdout_size], samples[holdout_size:]
+
+    model = IntentClassifier.train(
+        [text for text, _ in training],
+        [label for _, label in training],
+        n_features=args.features,
+        min_confidence=args.min_confidence
+    )
+
+    predictions = model.classify([text for text, _ in holdout])
+    correct = sum(1 for (predicted, _), (_, label) in zip(predictions, holdout) if predicted == label)
+    abstained = sum(1 for predicted, _ in predictions if predicted is None)
+    logger.info(
+        f"📊 Holdout: {correct}/{len(holdout)} correct, {abstained} left to keyword rules "
+        f"({len(training)} training samples, {len(model.labels)} labels)"
+    )
+
+    model.save(args.output)
+    logger.info(f"✅ Saved intent classifier to {args.output}")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the intent classifier from logged task analyses")
+    parser.add_argument('--db', default='data/freelancex_memory.db', help='Memory database path')
+    parser.add_argument('--output', default=DEFAULT_MODEL_PATH, help='Model artifact path')
+    parser.add_argument('--limit', type=int, default=50000, help='Most recent analyses to train on')
+    parser.add_argument('--features', type=int, default=4096, help='Hashed feature buckets')
+    parser.add_argument('--min-confidence', type=float, default=0.6, help='Below this, keyword rules decide')
+    parser.add_argument('--min-samples', type=int, default=50, help='Refuse to train on fewer samples')
+    sys.exit(asyncio.run(train(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()